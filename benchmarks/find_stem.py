@@ -0,0 +1,97 @@
+"""find_stem benchmark
+
+Compares the binary search based find_stem of omnibenchmark.utils.auto_input with the previous
+implementation, that tests every substring of the first name against all other names.
+Both are run on groups of generated single-cell like file names and must return identical results.
+
+Usage:
+    python benchmarks/find_stem.py [--sizes 2 10 50] [--name-length 80] [--repeat 3] [--seed 1]
+"""
+
+from typing import Callable, Dict, List, Optional
+import argparse
+import random
+import string
+import sys
+import time
+
+
+def find_stem_substrings(arr: List[str]) -> str:
+    """Previous find_stem: test every substring of the first name against all other names, O(L^3 * n)"""
+    n = len(arr)
+    s = arr[0]
+    len_s = len(s)
+    res = ""
+    for i in range(len_s):
+        for j in range(i + 1, len_s + 1):
+            stem = s[i:j]
+            for k in range(1, n):
+                if stem not in arr[k]:
+                    break
+                if k + 1 == n and len(res) < len(stem):
+                    res = stem
+    return res
+
+
+def make_names(size: int, name_length: int, rand: random.Random) -> List[str]:
+    """Generate a group of file names that share a common stem, like the files of one dataset
+
+    Args:
+        size (int): Number of names
+        name_length (int): Approximate length of each name
+        rand (random.Random): Random generator
+
+    Returns:
+        List[str]: File names
+    """
+    alphabet = string.ascii_lowercase + string.digits + "_-"
+    stem = "_" + "".join(rand.choice(alphabet) for _ in range(name_length // 3)) + "_"
+    names = []
+    for pos in range(size):
+        prefix = "".join(rand.choice(alphabet) for _ in range(rand.randint(1, name_length // 3)))
+        suffix = "".join(rand.choice(alphabet) for _ in range(rand.randint(1, name_length // 3)))
+        names.append(f"{prefix}_sample{pos}{stem}{suffix}.mtx.gz")
+    return names
+
+
+def timeit(function: Callable[[List[str]], str], names: List[str], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(names)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="find_stem benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[2, 10, 50, 200])
+    parser.add_argument("--name-length", type=int, default=80)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    from omnibenchmark.utils.auto_input import find_stem
+
+    rand = random.Random(args.seed)
+    mismatches = 0
+    for size in args.sizes:
+        names = make_names(size, args.name_length, rand)
+        results: Dict[str, str] = {
+            "substrings": find_stem_substrings(names),
+            "binary_search": find_stem(names),
+        }
+        if results["substrings"] != results["binary_search"]:
+            mismatches += 1
+            print(f"MISMATCH n={size}: {results}")
+        old_s = timeit(find_stem_substrings, names, args.repeat)
+        new_s = timeit(find_stem, names, args.repeat)
+        print(
+            f"n={size:4d} L~{len(names[0]):4d}: substrings {old_s * 1000:9.2f} ms, "
+            f"binary search {new_s * 1000:7.2f} ms, speedup {old_s / new_s:7.1f}x"
+        )
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
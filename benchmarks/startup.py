@@ -0,0 +1,269 @@
+"""Import-time and cold-start benchmarks
+
+Measures per module import times (as reported by `python -X importtime`), cold and warm construction
+times of OmniObject (from the config.yaml file including yaml loading and from the parsed config),
+OmniInput, OmniParameter and OmniOutput from a sample config.yaml and peak memory.
+Every measurement runs in a fresh interpreter. Results are written to a json file.
+
+Usage:
+    python benchmarks/startup.py [--config benchmarks/config.yaml] [--output benchmarks/results/startup.json]
+                                 [--repeat 20] [--baseline baseline.json] [--tolerance 0.25]
+
+With --baseline, the script exits with status 1 if a total import time, cold or warm construction time
+or peak memory got slower/larger than the baseline by more than the tolerance.
+"""
+
+from typing import Any, Dict, List, Mapping, Optional
+import argparse
+import datetime
+import platform
+import subprocess
+import json
+import sys
+import os
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+
+IMPORT_MODULES = [
+    "omnibenchmark",
+    "omnibenchmark.utils.local_cache.config",
+    "omnibenchmark.utils.auto_output",
+    "omnibenchmark.core.input_classes",
+    "omnibenchmark.core.output_classes",
+    "omnibenchmark.core.omni_object",
+    "omnibenchmark.utils.build_omni_object",
+]
+
+CONSTRUCT_TARGETS = ["OmniObjectFromYaml", "OmniObject", "OmniInput", "OmniParameter", "OmniOutput"]
+
+# Metrics compared against a baseline
+COMPARED_METRICS = ["total_us", "cold_s", "warm_median_s", "peak_memory_kb"]
+
+# Runs in a fresh interpreter: construct one target from the config once (cold) and repeatedly (warm)
+CONSTRUCT_WORKER = """
+import json, resource, statistics, sys, time, tracemalloc
+from collections import defaultdict
+import yaml
+
+target, config_file, repeat = sys.argv[1], sys.argv[2], int(sys.argv[3])
+start = time.perf_counter()
+from omnibenchmark.utils import build_omni_object as build
+import_s = time.perf_counter() - start
+
+with open(config_file) as f:
+    config = yaml.load(f, Loader=yaml.FullLoader)
+config_in = defaultdict(dict, config)
+
+
+def construct():
+    if target == "OmniObjectFromYaml":
+        return build.get_omni_object_from_yaml(config_file)
+    if target == "OmniObject":
+        return build.build_omni_object_from_config(config)
+    if target == "OmniInput":
+        return build.build_omni_input_from_config_inputs(config_in["inputs"])
+    if target == "OmniParameter":
+        return build.build_omni_parameter_from_config_params(config_in["parameter"])
+    omni_input = build.build_omni_input_from_config_inputs(config_in["inputs"])
+    omni_parameter = build.build_omni_parameter_from_config_params(config_in["parameter"])
+    return build.build_omni_output_from_config(config, omni_input=omni_input, omni_parameter=omni_parameter)
+
+
+tracemalloc.start()
+start = time.perf_counter()
+construct()
+cold_s = time.perf_counter() - start
+cold_peak = tracemalloc.get_traced_memory()[1]
+tracemalloc.stop()
+
+warm = []
+for _ in range(repeat):
+    start = time.perf_counter()
+    construct()
+    warm.append(time.perf_counter() - start)
+
+print(json.dumps({
+    "import_s": import_s,
+    "cold_s": cold_s,
+    "warm_median_s": statistics.median(warm),
+    "warm_min_s": min(warm),
+    "warm_max_s": max(warm),
+    "construct_peak_traced_kb": cold_peak / 1024,
+    "peak_memory_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+}))
+"""
+
+
+def parse_importtime(stderr: str) -> List[Dict[str, Any]]:
+    """Parse the output of `python -X importtime`
+
+    Args:
+        stderr (str): Standard error of the interpreter
+
+    Returns:
+        List[Dict[str, Any]]: Self and cumulative import time in microseconds per module
+    """
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules.append(
+            {
+                "module": name.strip(),
+                "self_us": int(self_us),
+                "cumulative_us": int(cumulative_us),
+            }
+        )
+    return modules
+
+
+def bench_import(module: str, cwd: str, top: int = 25) -> Dict[str, Any]:
+    """Import a module in a fresh interpreter and record its import times
+
+    Args:
+        module (str): Module to import
+        cwd (str): Working directory of the interpreter
+        top (int, optional): Number of slowest modules to keep. Defaults to 25.
+
+    Returns:
+        Dict[str, Any]: Total import time, peak memory and the slowest modules
+    """
+    code = (
+        "import resource, sys\n"
+        f"import {module}\n"
+        "print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)\n"
+    )
+    res = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=cwd,
+        capture_output=True,
+        text=True,
+    )
+    if res.returncode != 0:
+        return {"error": res.stderr.strip().splitlines()[-1] if res.stderr.strip() else "failed"}
+    modules = parse_importtime(res.stderr)
+    total = next((mod["cumulative_us"] for mod in reversed(modules) if mod["module"] == module), None)
+    return {
+        "total_us": total,
+        "n_modules": len(modules),
+        "peak_memory_kb": int(res.stdout.strip().splitlines()[-1]),
+        "slowest": sorted(modules, key=lambda mod: mod["self_us"], reverse=True)[:top],
+    }
+
+
+def bench_construct(target: str, config: str, cwd: str, repeat: int) -> Dict[str, Any]:
+    """Construct an object from a config in a fresh interpreter
+
+    Args:
+        target (str): OmniObjectFromYaml, OmniObject, OmniInput, OmniParameter or OmniOutput
+        config (str): Path to the config.yaml
+        cwd (str): Working directory of the interpreter
+        repeat (int): Number of warm constructions
+
+    Returns:
+        Dict[str, Any]: Cold and warm construction times and peak memory
+    """
+    res = subprocess.run(
+        [sys.executable, "-c", CONSTRUCT_WORKER, target, config, str(repeat)],
+        cwd=cwd,
+        capture_output=True,
+        text=True,
+    )
+    if res.returncode != 0:
+        return {"error": res.stderr.strip().splitlines()[-1] if res.stderr.strip() else "failed"}
+    return json.loads(res.stdout.strip().splitlines()[-1])
+
+
+def compare(results: Mapping[str, Any], baseline: Mapping[str, Any], tolerance: float) -> List[str]:
+    """Find metrics that regressed compared to a baseline
+
+    Args:
+        results (Mapping[str, Any]): Current results
+        baseline (Mapping[str, Any]): Baseline results
+        tolerance (float): Allowed relative increase
+
+    Returns:
+        List[str]: Descriptions of all regressions
+    """
+    regressions = []
+    for section in ["imports", "construction"]:
+        for name, current in results.get(section, {}).items():
+            base = baseline.get(section, {}).get(name, {})
+            for metric in COMPARED_METRICS:
+                if current.get(metric) is None or not base.get(metric):
+                    continue
+                if current[metric] > base[metric] * (1 + tolerance):
+                    regressions.append(
+                        f"{section}/{name}/{metric}: {current[metric]:.6g} > {base[metric]:.6g} (+{tolerance:.0%})"
+                    )
+    return regressions
+
+
+def run(config: str, cwd: str, repeat: int) -> Dict[str, Any]:
+    """Run all startup benchmarks
+
+    Args:
+        config (str): Path to the config.yaml
+        cwd (str): Working directory of the interpreters
+        repeat (int): Number of warm constructions
+
+    Returns:
+        Dict[str, Any]: Results of all benchmarks
+    """
+    from importlib.metadata import PackageNotFoundError, version
+
+    try:
+        omni_version: Optional[str] = version("omnibenchmark")
+    except PackageNotFoundError:
+        omni_version = None
+    return {
+        "date": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "omnibenchmark": omni_version,
+        "config": os.path.relpath(config, cwd),
+        "repeat": repeat,
+        "imports": {module: bench_import(module, cwd=cwd) for module in IMPORT_MODULES},
+        "construction": {
+            target: bench_construct(target, config=config, cwd=cwd, repeat=repeat)
+            for target in CONSTRUCT_TARGETS
+        },
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Import-time and cold-start benchmarks")
+    parser.add_argument("--config", default=os.path.join(BENCH_DIR, "config.yaml"))
+    parser.add_argument("--output", default=os.path.join(BENCH_DIR, "results", "startup.json"))
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--cwd", default=os.path.dirname(BENCH_DIR), help="Working directory, e.g. a renku project")
+    parser.add_argument("--baseline", default=None, help="Results file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args(argv)
+
+    results = run(config=os.path.abspath(args.config), cwd=os.path.abspath(args.cwd), repeat=args.repeat)
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+
+    for module, res in results["imports"].items():
+        print(f"import {module}: {res.get('total_us', res.get('error'))} us")
+    for target, res in results["construction"].items():
+        if "error" in res:
+            print(f"{target}: {res['error']}")
+        else:
+            print(f"{target}: cold {res['cold_s'] * 1000:.2f} ms, warm {res['warm_median_s'] * 1000:.2f} ms")
+    print(f"Results written to {args.output}")
+
+    if args.baseline is not None:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), tolerance=args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
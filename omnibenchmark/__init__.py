@@ -21,28 +21,37 @@
 __version__ = "0.0.48"
 
 
-from omnibenchmark import core, management, renku_commands, utils
-from omnibenchmark.core.omni_object import OmniObject
-from omnibenchmark.core.output_classes import OmniOutput, OmniCommand, OmniPlan
-from omnibenchmark.core.input_classes import OmniParameter, OmniInput
-from omnibenchmark.utils.build_omni_object import get_omni_object_from_yaml
-from omnibenchmark.renku_commands.general import renku_save
-from omnibenchmark.management.data_commands import update_dataset_files
-from omnibenchmark.management.data_commands import get_data_url_by_keyword
-
-__all__ = (
-    "core",
-    "management",
-    "renku_commands",
-    "utils",
-    "OmniObject",
-    "OmniPlan",
-    "OmniOutput",
-    "OmniCommand",
-    "OmniParameter",
-    "OmniInput",
-    "get_omni_object_from_yaml",
-    "renku_save",
-    "update_dataset_files",
-    "get_data_url_by_keyword",
-)
+import importlib
+
+# Public names and the modules they are loaded from on first access
+_LAZY_ATTRIBUTES = {
+    "core": "omnibenchmark.core",
+    "management": "omnibenchmark.management",
+    "renku_commands": "omnibenchmark.renku_commands",
+    "utils": "omnibenchmark.utils",
+    "OmniObject": "omnibenchmark.core.omni_object",
+    "OmniPlan": "omnibenchmark.core.output_classes",
+    "OmniOutput": "omnibenchmark.core.output_classes",
+    "OmniCommand": "omnibenchmark.core.output_classes",
+    "OmniParameter": "omnibenchmark.core.input_classes",
+    "OmniInput": "omnibenchmark.core.input_classes",
+    "get_omni_object_from_yaml": "omnibenchmark.utils.build_omni_object",
+    "renku_save": "omnibenchmark.renku_commands.general",
+    "update_dataset_files": "omnibenchmark.management.data_commands",
+    "get_data_url_by_keyword": "omnibenchmark.management.data_commands",
+}
+
+__all__ = tuple(_LAZY_ATTRIBUTES.keys())
+
+
+def __getattr__(name: str):
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module(_LAZY_ATTRIBUTES[name])
+    value = module if module.__name__ == f"{__name__}.{name}" else getattr(module, name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals().keys()) | set(__all__))
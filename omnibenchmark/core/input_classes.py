@@ -14,8 +14,9 @@ from omnibenchmark.utils.auto_input import (
     drop_none_elements,
 )
 from omnibenchmark.utils.exceptions import InputError
-from omnibenchmark.utils.default_global_vars import GIT_URL, DATA_QUERY_URL, DATA_URL
+from omnibenchmark.utils.default_global_vars import DATA_QUERY_URL, DATA_URL
 from omnibenchmark.management.data_commands import update_datasets_by_keyword
+from omnibenchmark.management.update_planner import UpdatePlan, run_update_plan
 from omnibenchmark.management.parameter_checks import (
     filter_parameter,
     get_all_parameter_combinations,
@@ -106,10 +107,11 @@ class OmniInput:
         orchestrator: str,
         query_url: str = DATA_QUERY_URL,
         data_url: str = DATA_URL,
-        gitlab_url: str = GIT_URL,
+        gitlab_url: Optional[str] = None,
         check_o_url: bool = True,
         n_latest: int = 9,
         all: bool = True,
+        plan: Optional[UpdatePlan] = None,
     ):
         """Update datasets and files that belong to this OmniInput object.
            This will also import new Datasets with the specified keyword..
@@ -119,8 +121,11 @@ class OmniInput:
             query_url (str): URL to the knowledgebase dataset query API.
             data_url (str): URL to the knowledgebase dataset API.
             gitlab_url (str): General Gitlab url.
+            plan (Optional[UpdatePlan]): Precomputed import/update plan to run instead of querying each keyword.
         """
-        if self.keyword is not None:
+        if self.keyword is not None and plan is not None:
+            run_update_plan(plan, keywords=self.keyword, all=all)
+        elif self.keyword is not None:
             for key in self.keyword:
                 update_datasets_by_keyword(
                     keyword=key,
@@ -133,6 +138,7 @@ class OmniInput:
                     n_latest=n_latest,
                     all=all,
                 )
+        if self.keyword is not None:
             if self.prefix is not None:
                 check_name_matching(self.names, self.prefix.keys())
                 self.input_files = get_input_files_from_prefix(
@@ -209,9 +215,10 @@ class OmniParameter:
         orchestrator: str,
         query_url: str = DATA_QUERY_URL,
         data_url: str = DATA_URL,
-        gitlab_url: str = GIT_URL,
+        gitlab_url: Optional[str] = None,
         check_o_url: bool = True,
         n_latest: int = 9,
+        plan: Optional[UpdatePlan] = None,
     ):
         """Update datasets and files that belong to this OmniParameter object.
            This will also import new Datasets with the specified keyword.
@@ -221,8 +228,11 @@ class OmniParameter:
             data_url (str): URL to the knowledgebase dataset API.
             gitlab_url (str): General Gitlab url.
             check_o_url (bool): If inclusion to an orchestrator should be checked.
+            plan (Optional[UpdatePlan]): Precomputed import/update plan to run instead of querying each keyword.
         """
-        if self.keyword is not None:
+        if self.keyword is not None and plan is not None:
+            run_update_plan(plan, keywords=self.keyword)
+        elif self.keyword is not None:
             for key in self.keyword:
                 update_datasets_by_keyword(
                     keyword=key,
@@ -233,6 +243,7 @@ class OmniParameter:
                     check_o_url=check_o_url,
                     n_latest=n_latest,
                 )
+        if self.keyword is not None:
             if self.values is None:
                 self.values = {}
             val = get_parameter_from_dataset(self.names, self.keyword)
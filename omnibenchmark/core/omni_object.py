@@ -16,16 +16,28 @@ from omnibenchmark.management.general_checks import find_orchestrator, is_renku_
 from omnibenchmark.management.data_checks import find_outputs_with_missing_inputs
 from omnibenchmark.management.data_commands import (
     update_dataset_files,
-    get_data_url_by_keyword,
 )
+from omnibenchmark.management.update_planner import (
+    UpdatePlan,
+    plan_dataset_updates,
+    merge_filter_slugs,
+)
+from omnibenchmark.management.module_planner import (
+    ModulePlan,
+    add_dataset_plan,
+    add_workflow_plan,
+)
+from omnibenchmark.renku_commands.general import save_session
 from omnibenchmark.utils.exceptions import InputError
+from omnibenchmark.utils.local_cache.response_cache import response_cache
+from omnibenchmark.management.project_snapshot import project_snapshot
 
 from omnibenchmark.utils.user_input_checks import flatten, rm_none_from_list
 from omnibenchmark.management.wflow_checks import (
     check_plan_exist,
     filter_activity_exist,
 )
-from omnibenchmark.utils.default_global_vars import KG_URL, GIT_URL, DATA_QUERY_URL, DATA_URL, BENCH_URL
+from omnibenchmark.utils.default_global_vars import KG_URL, DATA_QUERY_URL, DATA_URL, BENCH_URL, get_git_url
 from renku.domain_model.dataset import Dataset as RenkuDataSet
 from renku.command.view_model.plan import PlanViewModel
 from typing import List, Optional
@@ -56,7 +68,7 @@ class OmniObject():
         wflow_name: Optional[str] = None,
         dataset_slug: Optional[str] = None,
         kg_url: str = KG_URL,
-        git_url: str = GIT_URL,
+        git_url: Optional[str] = None,
         data_query_url: str = DATA_QUERY_URL,
         data_url: str = DATA_URL,
         bench_url: str = BENCH_URL
@@ -96,7 +108,7 @@ class OmniObject():
         self.dataset_slug = dataset_slug
         self.renku: bool = is_renku_project()
         self.kg_url = kg_url
-        self.git_url = git_url
+        self.git_url = get_git_url() if git_url is None else git_url
         self.data_query_url = data_query_url
         self.data_url = data_url
         self.bench_url = bench_url
@@ -167,56 +179,156 @@ class OmniObject():
                 out_files=out_no_input, dataset_slug=self.dataset_slug, remove=clean
             )
 
+    def update_session(self, push: bool = True):
+        """Context to save all dataset changes of one or several updates at once.
+           All renku_save calls within the context are coalesced into one commit and push at its end.
+
+        Args:
+            push (bool, optional): If the changes shall be pushed at the end.
+                                   If False they are only committed and pushed by the next save. Defaults to True.
+
+        Returns:
+            ContextManager[SaveSession]: Save session context
+        """
+        return save_session(push=push)
+
     def update_object(
-        self, check_o_url: bool = True, n_latest: int = 9, all: bool = True
+        self,
+        check_o_url: bool = True,
+        n_latest: int = 9,
+        all: bool = True,
+        refresh: bool = False,
+        push: bool = True,
     ):
         """Update the objects inputs, parameter and output definition. Does not run or update workflows/activities.
         Args:
             check_o_url (bool): If linking to an orchestrator shall be checked.
                                 WARNING: If False ALL existing datasets with that keyword will be imported!
             n_latest (int): Number of latest pipelines to include into orchestrator checks
+            refresh (bool): If cached knowledge graph responses shall be revalidated.
+            push (bool): If the dataset changes shall be pushed at the end of the update.
+                         If False they are only committed. Within an update_session the sessions setting is used.
         """
-        if not check_o_url:
-            self.orchestrator = "placeholder/string"
-        if self.orchestrator is None:
-            if self.benchmark_name is not None:
-                self.orchestrator = find_orchestrator(
-                    benchmark_name=self.benchmark_name, bench_url=self.bench_url
-                )
+        with self.update_session(push=push):
+            # Pick up dataset changes made outside of omnibenchmark since the last update
+            project_snapshot.invalidate()
+            if not check_o_url:
+                self.orchestrator = "placeholder/string"
             if self.orchestrator is None:
-                print(
-                    f"WARNING: No orchestrator specified! \n"
-                    f"No new datasets will be imported. Consider specifying an orchestrator by running:\n"
-                    f"OmniObject.orchestrator = find_orchestrator(BENCHMARK_NAME) \n"
-                    f"Look at {self.bench_url} to get a list of possible BENCHMARK_NAMEs."
-                )
-        if self.inputs is not None and self.orchestrator is not None:
-            self.inputs.update_inputs(
-                orchestrator=self.orchestrator,
-                query_url=self.data_query_url,
-                data_url=self.data_url,
-                gitlab_url=self.git_url,
-                check_o_url=check_o_url,
-                n_latest=n_latest,
-                all=all,
-            )
-        if self.parameter is not None and self.orchestrator is not None:
-            self.parameter.update_parameter(
-                orchestrator=self.orchestrator,
-                query_url=self.data_query_url,
-                data_url=self.data_url,
-                gitlab_url=self.git_url,
-                check_o_url=check_o_url,
-                n_latest=n_latest,
-            )
-        if self.outputs is not None:
-            self.outputs.inputs = self.inputs
-            self.outputs.parameter = self.parameter
-            self.outputs.update_outputs()
+                if self.benchmark_name is not None:
+                    self.orchestrator = find_orchestrator(
+                        benchmark_name=self.benchmark_name, bench_url=self.bench_url
+                    )
+                if self.orchestrator is None:
+                    print(
+                        f"WARNING: No orchestrator specified! \n"
+                        f"No new datasets will be imported. Consider specifying an orchestrator by running:\n"
+                        f"OmniObject.orchestrator = find_orchestrator(BENCHMARK_NAME) \n"
+                        f"Look at {self.bench_url} to get a list of possible BENCHMARK_NAMEs."
+                    )
+            with response_cache.refreshing(refresh):
+                plan = None
+                if self.orchestrator is not None:
+                    plan = self.plan_updates(check_o_url=check_o_url, n_latest=n_latest)
+                if self.inputs is not None and self.orchestrator is not None:
+                    self.inputs.update_inputs(
+                        orchestrator=self.orchestrator,
+                        query_url=self.data_query_url,
+                        data_url=self.data_url,
+                        gitlab_url=self.git_url,
+                        check_o_url=check_o_url,
+                        n_latest=n_latest,
+                        all=all,
+                        plan=plan,
+                    )
+                if self.parameter is not None and self.orchestrator is not None:
+                    self.parameter.update_parameter(
+                        orchestrator=self.orchestrator,
+                        query_url=self.data_query_url,
+                        data_url=self.data_url,
+                        gitlab_url=self.git_url,
+                        check_o_url=check_o_url,
+                        n_latest=n_latest,
+                        plan=plan,
+                    )
+            if self.outputs is not None:
+                self.outputs.inputs = self.inputs
+                self.outputs.parameter = self.parameter
+                self.outputs.update_outputs()
 
+            if self.command is not None:
+                self.command.outputs = self.outputs
+                self.command.update_command()
+
+    def plan_updates(
+        self, check_o_url: bool = True, n_latest: int = 9, o_url: Optional[str] = None
+    ) -> UpdatePlan:
+        """Find all datasets to import and update for the input and parameter keywords at once.
+           Keywords are queried concurrently and datasets shared between keywords are resolved once.
+
+        Args:
+            check_o_url (bool, optional): If the imported datasets have to be part of an orchestrator. Defaults to True.
+            n_latest (int, optional): Number of latest pipelines to check for the orchestrator check. Defaults to 9.
+            o_url (Optional[str], optional): Orchestrator url. Defaults to None (omni_obj.orchestrator).
+
+        Returns:
+            UpdatePlan: Datasets to import and update per keyword
+        """
+        filter_list: dict = {}
+        if self.inputs is not None and self.inputs.keyword is not None:
+            for key in self.inputs.keyword:
+                filter_list.setdefault(key, []).append(self.inputs.filter_slugs)
+        if self.parameter is not None and self.parameter.keyword is not None:
+            for key in self.parameter.keyword:
+                filter_list.setdefault(key, []).append(None)
+        return plan_dataset_updates(
+            keyword_filters={key: merge_filter_slugs(filt) for key, filt in filter_list.items()},
+            o_url=self.orchestrator if o_url is None else o_url,  # type:ignore
+            filter_ex=True,
+            query_url=self.data_query_url,
+            data_url=self.data_url,
+            gitlab_url=self.git_url,
+            check_o_url=check_o_url,
+            n_latest=n_latest,
+        )
+
+    def plan(self, offline: bool = True, check_o_url: bool = True, n_latest: int = 9) -> ModulePlan:
+        """Dry-run omni_obj.update_object() and omni_obj.run_renku() without changing anything.
+           Offline, knowledge graph data is taken from the local response cache only and nothing is requested,
+           requests that are not cached are listed in the plans missing field.
+           Plans, activities and datasets of the project are read from one local metadata snapshot.
+
+        Args:
+            offline (bool, optional): If only cached knowledge graph data shall be used. Defaults to True.
+            check_o_url (bool, optional): If the imported datasets have to be part of an orchestrator. Defaults to True.
+            n_latest (int, optional): Number of latest pipelines to check for the orchestrator check. Defaults to 9.
+
+        Returns:
+            ModulePlan: Datasets to import/update, plans and activities to create/update and outputs to link
+        """
+        plan = ModulePlan()
+        plan.offline = offline
+        o_url = self.orchestrator if check_o_url else "placeholder/string"
+        with response_cache.offline_mode(offline):
+            if o_url is None and self.benchmark_name is not None and not offline:
+                o_url = find_orchestrator(benchmark_name=self.benchmark_name, bench_url=self.bench_url)
+            if o_url is None:
+                plan.warnings.append("No orchestrator specified. No new datasets will be imported.")
+            else:
+                update_plan = self.plan_updates(check_o_url=check_o_url, n_latest=n_latest, o_url=o_url)
+                add_dataset_plan(plan, update_plan)
+            plan.missing = list(response_cache.misses) if offline else []
+
+        command_line = None
         if self.command is not None:
-            self.command.outputs = self.outputs
-            self.command.update_command()
+            command_line = self.command.command_line
+        elif self.script is not None:
+            command_line = OmniCommand(script=self.script, outputs=self.outputs).command_line
+        out_files = get_all_output_file_names(self.outputs) if self.outputs is not None else []
+        add_workflow_plan(
+            plan, out_files=out_files, command_line=command_line, dataset_slug=self.dataset_slug
+        )
+        return plan
 
     def clean_revert_run(self):
         """Unlink and delete all output files, and revert all activities related to this object and delete the corresponding plan.
@@ -228,17 +340,15 @@ class OmniObject():
         )
         revert_run(out_files=out_files, dataset_slug=self.dataset_slug)
 
-    def check_updates(self, n_latest: int = 9, check_o_url: bool = True):
+    def check_updates(self, n_latest: int = 9, check_o_url: bool = True, refresh: bool = False):
         """Shows what inputs are supposed to be updated- and imported upon omni_obj.update_object()
 
         Args:
             n_latest (int, optional): Number of latest pipelines to check for the orchestrator check. Defaults to 9.
             check_o_url (bool, optional): If the imported datasets have to be part of an orchestrator. Defaults to True.
+            refresh (bool, optional): If cached knowledge graph responses shall be revalidated. Defaults to False.
         """
 
-        imp_list: List = []
-        up_list: List = []
-
         if self.inputs is None:
             print(
                 "No inputs defined and no input keyword provided.\n"
@@ -269,34 +379,11 @@ class OmniObject():
                     f"Look at {self.bench_url} to get a list of possible BENCHMARK_NAMEs."
                 )
                 return
-        if self.parameter is None:
-            keys = self.inputs.keyword
-        else:
-            keys = flatten(
-                [
-                    k
-                    for k in [self.inputs.keyword, self.parameter.keyword]
-                    if k is not None
-                ]
-            )
-        for key in keys:
-            imp_ids, up_slugs = get_data_url_by_keyword(
-                keyword=key,
-                filter_slugs=self.inputs.filter_slugs,
-                o_url=self.orchestrator,
-                filter_ex=True,
-                query_url=self.data_query_url,
-                data_url= self.data_url,
-                gitlab_url=self.git_url,
-                check_o_url=check_o_url,
-                n_latest=n_latest,
-            )
-
-            imp_list.append(imp_ids)
-            up_list.append(up_slugs)
+        with response_cache.refreshing(refresh):
+            plan = self.plan_updates(check_o_url=check_o_url, n_latest=n_latest)
 
-        imp_list = flatten(imp_list)
-        up_list = flatten(up_list)
+        imp_list = plan.import_urls()
+        up_list = plan.update_slugs()
         nl = "\n"
         if len(imp_list) > 0:
             print(
@@ -332,7 +419,8 @@ class OmniObject():
         plan_view = PlanViewModel.from_plan(plan)
         activity_out = filter_activity_exist(out_files)
         activity_out = rm_none_from_list(activity_out)
-        no_activity = [out for out in out_files if out not in activity_out]
+        activity_set = set(activity_out)
+        no_activity = [out for out in out_files if out not in activity_set]
         print(
             "The following workflow is associated to this object:\n"
             f"Command:\n {plan_view.full_command}\n"
@@ -1,35 +1,139 @@
 """Checks concerning (usually renku) datasets"""
 
 from renku.api import Activity, Project, Dataset
-from renku.domain_model.project_context import project_context
 from omnibenchmark.utils.user_input_checks import flatten
-import requests
 from omnibenchmark.utils.default_global_vars import DATA_QUERY_URL
-from typing import Union, List, Mapping, Any
+from omnibenchmark.utils import http_client
+from omnibenchmark.management.project_snapshot import project_snapshot
+from concurrent.futures import Future, ThreadPoolExecutor
+from urllib.parse import parse_qs, urlparse
+from typing import Union, List, Mapping, Any, Optional, Iterator
+from datetime import datetime, timezone
+import requests
+import re
+import math
 import os
 
 
+def query_renku_page(
+    url: str, page_num: int, page_item: int = 100
+) -> requests.Response:
+    return http_client.get(url, params={"per_page": page_item, "page": page_num})
+
+
 def query_renku_api(
     url: str, page_num: int, page_item: int = 100
 ) -> List[Mapping[Any, Any]]:
-    response = requests.get(url, params={"per_page": page_item, "page": page_num})
+    response = query_renku_page(url, page_num=page_num, page_item=page_item)
     return response.json()
 
 
-def query_multipages(url: str, page_item: int = 100) -> List[Mapping[Any, Any]]:
-    multi_page = True
-    page_num = 1
-    response: List = []
-    while multi_page:
-        res = query_renku_api(url, page_num=page_num, page_item=page_item)
-        page_num += 1
-        if len(res) < page_item:
-            multi_page = False
-        if isinstance(res, list):
-            response.extend(res)
+def get_total_pages(response: requests.Response, page_item: int = 100) -> Optional[int]:
+    """Get the total number of result pages from the pagination hints of a knowledge base response.
+
+    Args:
+        response (requests.Response): Response to the first page of a query
+        page_item (int, optional): Number of items per page. Defaults to 100.
+
+    Returns:
+        Optional[int]: Number of pages, if the response provides any pagination hints.
+    """
+    headers = getattr(response, "headers", None) or {}
+    if headers.get("Total-Pages") is not None:
+        return int(headers["Total-Pages"])
+    if headers.get("Total") is not None:
+        return math.ceil(int(headers["Total"]) / page_item)
+    links = getattr(response, "links", None) or {}
+    if "last" in links:
+        last_page = parse_qs(urlparse(links["last"]["url"]).query).get("page")
+        if last_page is not None:
+            return int(last_page[0])
+    return None
+
+
+def query_multipages(
+    url: str, page_item: int = 100, max_workers: int = 8
+) -> List[Mapping[Any, Any]]:
+    """Query all result pages of a knowledge base url.
+       Remaining pages are fetched concurrently, if the first page reports the total number of pages.
+
+    Args:
+        url (str): Knowledge base url to query
+        page_item (int, optional): Number of items per page. Defaults to 100.
+        max_workers (int, optional): Maximal number of pages to fetch in parallel. Defaults to 8.
+
+    Returns:
+        List[Mapping[Any, Any]]: Results of all pages in page order
+    """
+    first_page = query_renku_page(url, page_num=1, page_item=page_item)
+    res = first_page.json()
+    response: List = res if isinstance(res, list) else []
+    if len(res) < page_item:
+        return response
+    n_pages = get_total_pages(first_page, page_item=page_item)
+    if n_pages is None:
+        multi_page = True
+        page_num = 2
+        while multi_page:
+            res = query_renku_api(url, page_num=page_num, page_item=page_item)
+            page_num += 1
+            if len(res) < page_item:
+                multi_page = False
+            if isinstance(res, list):
+                response.extend(res)
+        return response
+    if n_pages < 2:
+        return response
+    with ThreadPoolExecutor(max_workers=min(max_workers, n_pages - 1)) as pool:
+        pages = pool.map(
+            lambda page_num: query_renku_api(url, page_num=page_num, page_item=page_item),
+            range(2, n_pages + 1),
+        )
+        for res in pages:
+            if isinstance(res, list):
+                response.extend(res)
     return response
 
 
+def iter_entities(
+    url: str,
+    page_item: int = 100,
+    max_pages: Optional[int] = None,
+    entity: Optional[str] = None,
+) -> Iterator[Mapping[Any, Any]]:
+    """Iterate over the results of a knowledge base url page by page.
+       The next page is fetched while the current one is consumed, so at most two pages are held in memory.
+       Stopping the iteration early skips all remaining pages.
+
+    Args:
+        url (str): Knowledge base url to query
+        page_item (int, optional): Number of items per page. Defaults to 100.
+        max_pages (Optional[int], optional): Maximal number of pages to query. Defaults to None (all pages).
+        entity (Optional[str], optional): Only yield entities of this type (e.g. "dataset"). Defaults to None.
+
+    Yields:
+        Mapping[Any, Any]: Entities in page order
+    """
+    pool = ThreadPoolExecutor(max_workers=1)
+    page_num = 1
+    next_page: Optional[Future] = pool.submit(query_renku_api, url, page_num=page_num, page_item=page_item)
+    try:
+        while next_page is not None:
+            res = next_page.result()
+            res = res if isinstance(res, list) else []
+            next_page = None
+            if len(res) >= page_item and (max_pages is None or page_num < max_pages):
+                page_num += 1
+                next_page = pool.submit(query_renku_api, url, page_num=page_num, page_item=page_item)
+            for ent in res:
+                if entity is None or ent.get("type") == entity:
+                    yield ent
+    finally:
+        if next_page is not None:
+            next_page.cancel()
+        pool.shutdown(wait=False)
+
+
 def renku_dataset_exist(slug: str, path: Union[os.PathLike, str] = os.getcwd()) -> bool:
     """Check if a renku dataset with a specific slug already exist at a certain project path.
 
@@ -43,12 +147,63 @@ def renku_dataset_exist(slug: str, path: Union[os.PathLike, str] = os.getcwd())
 
     current_dir = os.getcwd()
     os.chdir(path)
-    project_context.clear()
     #datasets = renku_api.renku_dataset_list()
-    datasets = Dataset.list()
-    matches = [dataset.slug for dataset in datasets if dataset.slug == slug]
+    exists = slug in project_snapshot.index().by_slug.keys()
     os.chdir(current_dir)
-    return True if len(matches) >= 1 else False
+    return exists
+
+
+def parse_kg_date(value: Any) -> Optional[datetime]:
+    """Parse a knowledge base timestamp into a timezone aware datetime.
+       Accepts a trailing "Z" and any number of fractional digits, naive timestamps are taken as UTC.
+
+    Args:
+        value (Any): Timestamp string or datetime
+
+    Returns:
+        Optional[datetime]: Timezone aware datetime, None if the value can not be parsed
+    """
+    if isinstance(value, datetime):
+        date = value
+    elif isinstance(value, str):
+        date_str = re.sub(r"[zZ]$", "+00:00", value.strip())
+        date_str = re.sub(
+            r"\.(\d+)", lambda frac: "." + frac.group(1)[:6].ljust(6, "0"), date_str, count=1
+        )
+        try:
+            date = datetime.fromisoformat(date_str)
+        except ValueError:
+            return None
+    else:
+        return None
+    return date if date.tzinfo is not None else date.replace(tzinfo=timezone.utc)
+
+
+def dataset_is_outdated(dataset: Dataset, data: Mapping[Any, Any]) -> bool:
+    """Check if the knowledge base holds a newer version of an imported dataset than the local project.
+       Compares the source the local dataset was imported from with the current knowledge base dataset and its modification date.
+
+    Args:
+        dataset (Dataset): Local renku dataset
+        data (Mapping[Any, Any]): Knowledge base metadata of the dataset (e.g., from query_datasets_by_property)
+
+    Returns:
+        bool: True if the dataset changed upstream or its source or modification dates are unknown
+    """
+    local_dataset = getattr(dataset, "_dataset", None) or dataset
+    same_as = getattr(local_dataset, "same_as", None)
+    local_ref = getattr(same_as, "value", None)
+    links = data.get("_links") or []
+    if local_ref is None or len(links) < 1 or "href" not in links[0]:
+        return True
+    remote_ref = links[0]["href"]
+    if local_ref.rstrip("/").split("/")[-1] != remote_ref.rstrip("/").split("/")[-1]:
+        return True
+    local_date = parse_kg_date(getattr(local_dataset, "date_modified", None))
+    remote_date = parse_kg_date(data.get("dateModified"))
+    if local_date is None or remote_date is None:
+        return True
+    return remote_date > local_date
 
 
 def dataset_slug_exist(slug: str, data_query_url: str = DATA_QUERY_URL) -> bool:
@@ -63,24 +218,16 @@ def dataset_slug_exist(slug: str, data_query_url: str = DATA_QUERY_URL) -> bool:
     """
 
     url = data_query_url + slug
-    response = query_multipages(url)
     # Checks to ensure no complete name matching (Remove if file matching is moved to triplet store queries)
-    response_data = [res for res in response if res.get("type") == "dataset"]
-    if slug in [item.get("slug") for item in response_data] or any(
-        item.get("slug") in slug for item in response_data if item.get("slug") is not None  # type:ignore
-    ):
-        conflicting = [
-            item.get("slug")
-            for item in response_data
-            if item.get("slug") is not None and slug in item.get("slug") or item.get("slug") is not None and item.get("slug") in slug # type:ignore
-        ]
-        nl = "\n"
-        print(
-            f"A dataset with a complete match of {slug} already exist.\n" # type:ignore
-            f"Conflicting dataset name(s): {nl}{nl.join(conflicting)}.\n" # type:ignore
-        )
-        return True
-    return True if slug in [item.get("slug") for item in response_data] else False
+    for item in iter_entities(url, entity="dataset"):
+        item_slug = item.get("slug")
+        if item_slug is not None and item_slug in slug:
+            print(
+                f"A dataset with a complete match of {slug} already exist.\n"
+                f"Conflicting dataset name(s): \n{item_slug}.\n"
+            )
+            return True
+    return False
 
 
 def find_activities_with_missing_inputs() -> List[Activity]:
@@ -1,11 +1,9 @@
 """Commands related to import and update relevant datasets"""
-from typing import List, Mapping, Any, Optional, Tuple
-from renku.api import Dataset
+from typing import Dict, List, Mapping, Any, Optional, Set, Tuple
 from omnibenchmark.renku_commands import renku_api
-from omnibenchmark.utils.default_global_vars import GIT_URL, DATA_QUERY_URL, DATA_URL
-from renku.domain_model.project_context import project_context
+from omnibenchmark.utils.default_global_vars import DATA_QUERY_URL, DATA_URL
 from omnibenchmark.renku_commands.datasets import (
-    renku_dataset_import,
+    renku_dataset_import_bulk,
     renku_dataset_update,
     renku_add_to_dataset,
     renku_unlink_from_dataset,
@@ -13,14 +11,22 @@ from omnibenchmark.renku_commands.datasets import (
 )
 from omnibenchmark.utils.exceptions import InputError
 from omnibenchmark.utils.general import into_list
-from omnibenchmark.management.data_checks import query_multipages
-import requests
+from omnibenchmark.management.data_checks import (
+    query_multipages,
+    iter_entities,
+    dataset_is_outdated,
+)
+from omnibenchmark.management.orchestrator_index import OrchestratorIndex
+from omnibenchmark.management.project_snapshot import project_snapshot
+from omnibenchmark.utils import http_client
 import re
 import os
+import json
 import urllib
-import gitlab
-from omnibenchmark.renku_commands.general import renku_save
+import threading
+from omnibenchmark.renku_commands.general import renku_save, save_session
 from iteration_utilities import unique_everseen  # type: ignore
+from concurrent.futures import ThreadPoolExecutor
 
 
 # Find datasets by string
@@ -29,6 +35,7 @@ def query_entities_by_string(
     entity: str = "dataset",
     url: str = DATA_QUERY_URL,
     page_item: int = 100,
+    max_pages: Optional[int] = None,
 ) -> List[Mapping[Any, Any]]:
     """Query entities (e.g. datasets) in the knowledge base by a string.
 
@@ -36,11 +43,15 @@ def query_entities_by_string(
         string (str): String to query entity for
         entity (str): Entity type to query. Default "dataset" 
         url (str): URL to the knowledgebase query API. Default utils/default_global_vars/DATA_QUERY_URL.
+        max_pages (Optional[int], optional): Maximal number of result pages to query.
+                                             Defaults to None (all pages, fetched concurrently).
 
     Returns:
         List[Mapping[Any, Any]]: List of all entities associated to that string with their metadata
     """
     query_url = url + string
+    if max_pages is not None:
+        return list(iter_entities(query_url, page_item=page_item, max_pages=max_pages, entity=entity))
     entities = query_multipages(url=query_url, page_item=page_item)
     return [ent for ent in entities if ent.get("type") == entity]
 
@@ -94,18 +105,36 @@ def filter_existing(data_json: List) -> Tuple[List, List]:
     """
     update_list: List = []
     import_list: List = []
-    project_context.clear()
-    datasets = Dataset.list()
     #datasets = renku_api.renku_dataset_list()
-    slug_list = [dataset.slug for dataset in datasets]
+    slug_index = project_snapshot.index().by_slug
     for data in data_json:
-        if data["slug"] in slug_list:
+        if data["slug"] in slug_index.keys():
             update_list.append(data)
         else:
             import_list.append(data)
     return import_list, update_list
 
 
+# Filter datasets that did not change upstream
+def get_unchanged_slugs(data_json: List) -> Set[str]:
+    """Get the slugs of existing datasets whose knowledge base version matches the local one.
+
+    Args:
+        data_json (List): List of existing datasets with their knowledge base metadata
+
+    Returns:
+        Set[str]: Slugs of datasets that do not need to be updated
+    """
+    if len(data_json) < 1:
+        return set()
+    datasets = project_snapshot.index().by_slug
+    return {
+        data["slug"]
+        for data in data_json
+        if data["slug"] in datasets.keys() and not dataset_is_outdated(datasets[data["slug"]], data)
+    }
+
+
 # Apply predefined filter
 def import_filter(data_json: List, filter_slugs: Optional[List[str]] = None) -> List[Mapping[Any, Any]]:
     """Filter import datasets by specified slugs.
@@ -130,6 +159,7 @@ def get_ref_by_dataset_property(
     property_name: str = "keywords",
     filter_ex: bool = False,
     filter_slugs: Optional[List[str]] = None,
+    data_json: Optional[List[Mapping[Any, Any]]] = None,
 ) -> Tuple[List[str], List[str]]:
     """Get the dataset reference of all datasets that match a specified query.
 
@@ -139,14 +169,17 @@ def get_ref_by_dataset_property(
         property_name (str, optional): Dataset property to match with the query string. Defaults to "keywords".
         filter_ex (bool, optional): If true return the slug of all existing datasets instead. Defaults to False.
         filter_slugs (Optional[List[str]], optional): slugs to be filtered from the dataset list. Defaults to None.
+        data_json (Optional[List[Mapping[Any, Any]]], optional): Result of the query, if it was already run.
+                                                                 Defaults to None (query the knowledge base).
 
     Returns:
         Tuple[List[str], List[str]]: List with all or not already existing datasets.
                                      List with slugs of existing datasets.
     """
-    data_json = query_datasets_by_property(
-        string=string, url=url, property_name=property_name
-    )
+    if data_json is None:
+        data_json = query_datasets_by_property(
+            string=string, url=url, property_name=property_name
+        )
     data_json = import_filter(data_json=data_json, filter_slugs=filter_slugs)
     up_json: List = []
     if filter_ex:
@@ -170,47 +203,91 @@ def get_data_info_by_url(
     Returns:
         Mapping[Any, Any]: Dataset metadata (e.g., slug, description, keywords, links, creator, ...)
     """
-    response = requests.get(url)
+    response = http_client.get(url)
+    return response.json()
+
+
+def get_data_infos_by_urls(
+    urls: List[str], max_workers: int = 8
+) -> List[Mapping[Any, Any]]:
+    """Get dataset metadata of several datasets concurrently
+
+    Args:
+        urls (List[str]): Dataset urls.
+        max_workers (int, optional): Maximal number of parallel requests. Defaults to 8.
+
+    Returns:
+        List[Mapping[Any, Any]]: Dataset metadata in the order of the urls
+    """
+    if len(urls) < 1:
+        return []
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(urls))) as pool:
+        return list(pool.map(get_data_info_by_url, urls))
+
+
+def get_file_lineage(project_url: str, data_file: str) -> Mapping[Any, Any]:
+    """Get the lineage of a file in a project
+
+    Args:
+        project_url (str): URL to the knowledgebase project URL.
+        data_file (str): Path of the file in the project
+
+    Returns:
+        Mapping[Any, Any]: File lineage with nodes and edges or an error message
+    """
+    response = http_client.get(
+        project_url + "/files/" + urllib.parse.quote(data_file, safe="") + "/lineage"
+    )
     return response.json()
 
 
 def find_dataset_linked_to_wflow(
-    info_list: List[Mapping], top: int = 2, filter_pat: str = "meta"
+    info_list: List[Mapping], top: int = 2, filter_pat: str = "meta", max_workers: int = 8
 ) -> List[Mapping]:
     """Check a list of datasets for workflows associated to their linked files.
+       Lineage probes run concurrently and remaining probes of a dataset are skipped once it is linked.
 
     Args:
         info_list (List[Mapping]): List of datasets and their metadata to filter
         top (int, optional): Number of associated files to check for workflow association Defaults to 2.
         filter_pat (str, optional): Filter pattern to exclude files by. Defaults to "meta".
+        max_workers (int, optional): Maximal number of parallel lineage requests. Defaults to 8.
 
     Returns:
         List[Mapping]: List of datasets and metadata with files that have a workflow linked to them.
     """
-    origin_info = []
-    for info in info_list:
-        data_files = info["hasPart"]
-        data_file_list = [
+    data_file_lists = [
+        [
             data_fi["atLocation"]
-            for data_fi in data_files
+            for data_fi in info["hasPart"]
             if filter_pat not in data_fi["atLocation"]
-        ]
-        for data_file in data_file_list[:top]:
-            file_lineage = requests.get(
-                info["project"]["_links"][0]["href"]
-                + "/files/"
-                + urllib.parse.quote(data_file, safe="")
-                + "/lineage"
-            )
-            if "message" in file_lineage.json().keys():
-                continue
-            if "edges" in file_lineage.json().keys():
-                if any(
-                    data_file in fi["target"] for fi in file_lineage.json()["edges"]
-                ):
-                    if info not in origin_info:
-                        origin_info.append(info)
-    return origin_info
+        ][:top]
+        for info in info_list
+    ]
+    # Probe the first file of every dataset before the second one to make early stops likely
+    probes = [
+        (idx, data_files[rank])
+        for rank in range(top)
+        for idx, data_files in enumerate(data_file_lists)
+        if rank < len(data_files)
+    ]
+    linked: Set[int] = set()
+    lock = threading.Lock()
+
+    def probe(idx: int, data_file: str):
+        if idx in linked:
+            return
+        file_lineage = get_file_lineage(info_list[idx]["project"]["_links"][0]["href"], data_file)
+        if "message" in file_lineage.keys() or "edges" not in file_lineage.keys():
+            return
+        if any(data_file in fi["target"] for fi in file_lineage["edges"]):
+            with lock:
+                linked.add(idx)
+
+    if len(probes) > 0:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(probes))) as pool:
+            list(pool.map(lambda prob: probe(*prob), probes))
+    return unique_infos([info_list[idx] for idx in sorted(linked)])
 
 
 def get_dataset_from_project(info_list: List[Mapping], project_url: str) -> List:
@@ -224,28 +301,66 @@ def get_dataset_from_project(info_list: List[Mapping], project_url: str) -> List
         List: Dataset infos related to the project url
     """
     all_datasets = query_multipages(url=project_url + "/datasets")
-    all_ids = [dat["identifier"] for dat in all_datasets]
+    all_ids = {dat["identifier"] for dat in all_datasets}
     return [info for info in info_list if any(val in all_ids for val in [info["identifier"], info["url"].split("/")[-1]])]
 
 
 
-def filter_duplicated_slugs(info_list: List[Mapping], o_url: Optional[str] = None) -> List[Mapping]:
+def get_info_key(info: Mapping) -> str:
+    """Get the key datasets are considered identical by: their identifier, or their full metadata if they have none.
+
+    Args:
+        info (Mapping): Dataset metadata
+
+    Returns:
+        str: Dataset key
+    """
+    if info.get("identifier") is not None:
+        return str(info["identifier"])
+    return json.dumps(info, sort_keys=True, default=str)
+
+
+def unique_infos(info_list: List[Mapping]) -> List[Mapping]:
+    """Drop repeated datasets from a list, keeping the first occurence
+
+    Args:
+        info_list (List[Mapping]): List of datasets with metadata
+
+    Returns:
+        List[Mapping]: Dataset list without repeated datasets in the original order
+    """
+    uni_infos: Dict[str, Mapping] = {}
+    for info in info_list:
+        uni_infos.setdefault(get_info_key(info), info)
+    return list(uni_infos.values())
+
+
+def filter_duplicated_slugs(
+    info_list: List[Mapping],
+    o_url: Optional[str] = None,
+    o_index: Optional[OrchestratorIndex] = None,
+) -> List[Mapping]:
     """Filter a list of datasets to get only the original dataset if their are multiple datasets found with the same slug.
 
     Args:
         info_list (List[Mapping]): List of datasets with metadata to filter
+        o_url (Optional[str], optional): Orchestrator url to identify the origin of ambiguous datasets. Defaults to None.
+        o_index (Optional[OrchestratorIndex], optional): Index of the orchestrators projects.
+                                                         Built from o_url, if None. Defaults to None.
 
     Returns:
         List[Mapping]: Dataset list with unique datasets
     """
-    info_list = list(unique_everseen(info_list))
-    slug_list = [info.get("slug") for info in info_list]
-    dup_slugs = set(
-        [info_slug for info_slug in slug_list if slug_list.count(info_slug) > 1]
-    )
+    info_list = unique_infos(info_list)
+    if o_url is not None and o_index is None:
+        o_index = OrchestratorIndex(o_url)
+    slug_groups: Dict[Any, List[Mapping]] = {}
+    for info in info_list:
+        slug_groups.setdefault(info.get("slug"), []).append(info)
+    dup_slugs = {info_slug for info_slug, group in slug_groups.items() if len(group) > 1}
     uni_list = [info for info in info_list if info.get("slug") not in dup_slugs]
     for dup in dup_slugs:
-        dup_info = [info for info in info_list if info.get("slug") == dup]
+        dup_info = slug_groups[dup]
         dup_project = set([info["project"]["_links"][0]["href"] for info in dup_info])
         if len(dup_project) == 1:
             origin_info = get_dataset_from_project(info_list = dup_info, project_url = list(dup_project)[0])
@@ -255,7 +370,7 @@ def filter_duplicated_slugs(info_list: List[Mapping], o_url: Optional[str] = Non
             if len(o_project) == 1:
                 origin_info = get_dataset_from_project(info_list = o_info, project_url = list(o_project)[0])
             elif o_url is not None and len(o_project) > 1:
-                dat_info = [d_info for d_info in o_info if check_orchestrator(d_info, o_url = o_url) is not None]
+                dat_info = [d_info for d_info in o_info if check_orchestrator(d_info, o_url = o_url, o_index = o_index) is not None]
                 origin_info = dat_info if len(dat_info) == 1 else []
             else:    
                 origin_info = []
@@ -274,7 +389,9 @@ def filter_duplicated_slugs(info_list: List[Mapping], o_url: Optional[str] = Non
 def get_origin_dataset_infos(
     refs: List[str],
     data_url: str = DATA_URL,
-    o_url: Optional[str] = None
+    o_url: Optional[str] = None,
+    max_workers: int = 8,
+    o_index: Optional[OrchestratorIndex] = None,
 ) -> List[Mapping]:
     """Filter a list of dataset urls for original dataset urls
        (datasets associated to projects, where they were generated and not imported).
@@ -282,25 +399,49 @@ def get_origin_dataset_infos(
     Args:
         refs (List[str]): List of dataset references (urls) to filter
         data_url (str): URL to knowledgebase data endpoint
+        max_workers (int, optional): Maximal number of parallel requests. Defaults to 8.
+        o_index (Optional[OrchestratorIndex], optional): Index of the orchestrators projects. Defaults to None.
 
     Returns:
         List[Mapping]: Filtered datasets and their metadata
     """
-    all_infos: List = []
-    checkurl = re.sub("/knowledge-graph/.*$", "", data_url)
-    for ref_url in refs:
-        data_info = get_data_info_by_url(url=ref_url)
-        if "sameAs" in data_info.keys():
-            if not data_info["sameAs"] == data_info["url"] and data_info["sameAs"].startswith(checkurl):
-                same_id = data_info["sameAs"].split("/")[-1]
-                same_url = data_url + same_id
-                data_info = get_data_info_by_url(url=same_url)
-        if data_info not in all_infos and "slug" in data_info.keys():
-            all_infos.append(data_info)
-    origin_infos = filter_duplicated_slugs(all_infos, o_url = o_url)
+    data_infos = resolve_dataset_infos(refs, data_url=data_url, max_workers=max_workers)
+    all_infos = unique_infos([data_info for data_info in data_infos if "slug" in data_info.keys()])
+    origin_infos = filter_duplicated_slugs(all_infos, o_url = o_url, o_index = o_index)
     return origin_infos
 
 
+def resolve_dataset_infos(
+    refs: List[str],
+    data_url: str = DATA_URL,
+    max_workers: int = 8,
+) -> List[Mapping]:
+    """Get the metadata of a list of dataset references and follow their sameAs links to the dataset they were imported from.
+       All references are resolved concurrently, followed by a second concurrent wave for their sameAs targets.
+
+    Args:
+        refs (List[str]): List of dataset references (urls)
+        data_url (str): URL to knowledgebase data endpoint
+        max_workers (int, optional): Maximal number of parallel requests. Defaults to 8.
+
+    Returns:
+        List[Mapping]: Dataset metadata in the order of the references
+    """
+    checkurl = re.sub("/knowledge-graph/.*$", "", data_url)
+    data_infos = get_data_infos_by_urls(refs, max_workers=max_workers)
+    same_urls = {
+        idx: data_url + data_info["sameAs"].split("/")[-1]
+        for idx, data_info in enumerate(data_infos)
+        if "sameAs" in data_info.keys()
+        and not data_info["sameAs"] == data_info["url"]
+        and data_info["sameAs"].startswith(checkurl)
+    }
+    same_infos = get_data_infos_by_urls(list(same_urls.values()), max_workers=max_workers)
+    for idx, same_info in zip(same_urls.keys(), same_infos):
+        data_infos[idx] = same_info
+    return data_infos
+
+
 def get_project_info_from_url(project_url: str) -> Mapping[Any, Any]:
     """Get project metadata from url
 
@@ -310,15 +451,16 @@ def get_project_info_from_url(project_url: str) -> Mapping[Any, Any]:
     Returns:
         Mapping[Any, Any]: Project metadata dictionary
     """
-    response = requests.get(project_url)
+    response = http_client.get(project_url)
     return response.json()
 
 
 def check_orchestrator(
     data_info: Mapping,
     o_url: str,
-    gitlab_url: str = GIT_URL,
+    gitlab_url: Optional[str] = None,
     n_latest: int = 9,
+    o_index: Optional[OrchestratorIndex] = None,
 ) -> Optional[str]:
     """Check if a dataset is associated to a project that is part of the specified orchestrators projects.
 
@@ -326,6 +468,9 @@ def check_orchestrator(
         data_info (Mapping): Dataset metadata to check
         o_url (str): orchestrator url to check if the dataset project is associated to.
         gitlab_url (url, optional): General Gitlab url. Default utils/default_global_vars/GIT_URL.
+        n_latest (int, optional): Number of latest orchestrator pipelines to check. Defaults to 9.
+        o_index (Optional[OrchestratorIndex], optional): Index of the orchestrators projects to reuse across datasets.
+                                                         Built from o_url, if None. Defaults to None.
 
     Returns:
         Optional[str]: Dataset url, if the dataset is associated to a project that is part of the orchestrator.
@@ -338,25 +483,10 @@ def check_orchestrator(
             f"Please check {data_info['slug']}.\n"
         )
         return None
-    o_info = get_project_info_from_url(o_url)
-    renku_git = gitlab.Gitlab(gitlab_url)
-    o_git = renku_git.projects.get(o_info["identifier"])
-    success = o_git.pipelines.list(status="success", all=False)
-    latest = o_git.pipelines.list(order_by="updated_at", all=False)[
-        :n_latest
-    ]  # type:ignore
-    query_pipes = list(set(success + latest))  # type:ignore
-    bridge_projects: List = []
-    for pipe in query_pipes:
-        bridge_projects.extend(
-            [
-                brid.downstream_pipeline["project_id"]
-                for brid in pipe.bridges.list(get_all=True)
-                if brid.status == "success"
-            ]
-        )
-        if project_info["identifier"] in bridge_projects:
-            return data_info["url"]
+    if o_index is None:
+        o_index = OrchestratorIndex(o_url, gitlab_url=gitlab_url, n_latest=n_latest)
+    if project_info["identifier"] in o_index:
+        return data_info["url"]
     return None
 
 
@@ -367,9 +497,10 @@ def get_data_url_by_keyword(
     filter_slugs: Optional[List[str]] = None,
     query_url: str = DATA_QUERY_URL,
     data_url: str = DATA_URL,
-    gitlab_url: str = GIT_URL,
+    gitlab_url: Optional[str] = None,
     check_o_url: bool = True,
     n_latest: int = 9,
+    data_json: Optional[List[Mapping[Any, Any]]] = None,
 ) -> Tuple[List[str], List[str]]:
     """Get all valid dataset urls by matching keywords.
 
@@ -380,19 +511,22 @@ def get_data_url_by_keyword(
         filter_names (Optional[List[str]], optional): Names to be filtered from the dataset list. Defaults to None.
         query_url (str, optional): URL to the knowledgebase dataset query API.
         gitlab_url (str, optional): General Gitlab url. Defaults to utils/default_global_vars/GIT_URL.
+        data_json (Optional[List[Mapping[Any, Any]]], optional): Datasets matching the keyword, if they were already queried.
+                                                                 Defaults to None (query the knowledge base).
 
     Returns:
         Tuple[List[str], List[str]]: 1. List with all matching non-existing dataset urls,
                                      2. List with all matching existig dataset urls.
     """
     all_ids, up_exist = get_ref_by_dataset_property(
-        string=keyword, url=query_url, filter_ex=filter_ex, filter_slugs=filter_slugs
+        string=keyword, url=query_url, filter_ex=filter_ex, filter_slugs=filter_slugs, data_json=data_json
     )
     up_exist = list(unique_everseen(up_exist))
     if len(all_ids) + len(up_exist) < 1:
         print(f"WARNING:No datasets found with keyword {keyword}")
         return [], []
-    origin_infos = get_origin_dataset_infos(refs=all_ids, data_url = data_url, o_url = o_url)
+    o_index = OrchestratorIndex(o_url, gitlab_url=gitlab_url, n_latest=n_latest)
+    origin_infos = get_origin_dataset_infos(refs=all_ids, data_url = data_url, o_url = o_url, o_index = o_index)
     if len(origin_infos) + len(up_exist) < 1:
         print(
             "WARNING:Could not identify dataset sources.\n"
@@ -402,7 +536,7 @@ def get_data_url_by_keyword(
     if check_o_url:
         omni_ids = [
             check_orchestrator(
-                data_info=info, o_url=o_url, gitlab_url=gitlab_url, n_latest=n_latest
+                data_info=info, o_url=o_url, gitlab_url=gitlab_url, n_latest=n_latest, o_index=o_index
             )
             for info in origin_infos
         ]
@@ -429,11 +563,11 @@ def find_datasets_with_non_matching_keywords(
         keywords (List[str]): Keywords to keep datasets with
         remove (bool, optional): Remove datasets and clean up. Defaults to True.
     """
-    project_context.clear()
-    datasets = Dataset.list()
+    datasets = project_snapshot.datasets()
     #datasets = renku_api.renku_dataset_list()
     if include is not None:
-        datasets = [dataset for dataset in datasets if dataset.slug in include]
+        include_slugs = set(include)
+        datasets = [dataset for dataset in datasets if dataset.slug in include_slugs]
     data_filter = [
         dataset.slug
         for dataset in datasets
@@ -450,10 +584,11 @@ def update_datasets_by_keyword(
     filter_slugs: Optional[List[str]] = None,
     query_url: str = DATA_QUERY_URL,
     data_url: str = DATA_URL,
-    gitlab_url: str = GIT_URL,
+    gitlab_url: Optional[str] = None,
     check_o_url: bool = True,
     n_latest: int = 9,
     all: bool = True,
+    check_version: bool = True,
 ):
     """Import and/or update all datasets that match a certain keyword
 
@@ -465,7 +600,9 @@ def update_datasets_by_keyword(
         query_url (_type_, optional): URL to the knowledgebase dataset query API.
         gitlab_url (_type_, optional): General Gitlab url. Defaults to utils/default_global_vars/GIT_URL.
         all (bool, optional): If all datasets with matching keyword should be imported.
+        check_version (bool, optional): If existing datasets are only updated if they changed upstream. Defaults to True.
     """
+    data_json = query_datasets_by_property(string=keyword, url=query_url)
     imp_ids, up_slugs = get_data_url_by_keyword(
         keyword=keyword,
         o_url=o_url,
@@ -476,17 +613,20 @@ def update_datasets_by_keyword(
         gitlab_url=gitlab_url,
         check_o_url=check_o_url,
         n_latest=n_latest,
+        data_json=data_json,
     )
-    if all:
-        for id in imp_ids:
-            renku_dataset_import(uri=id)
-    else:
-        if len(imp_ids) > 0:
-            renku_dataset_import(uri=imp_ids[0])
-    for slu in up_slugs:
-        print(f"Updated dataset {slu}.")
-        renku_dataset_update(slugs=[slu])
-        renku_save()
+    renku_dataset_import_bulk(uris=imp_ids if all else imp_ids[:1])
+    unchanged: Set[str] = set()
+    if check_version and len(up_slugs) > 0:
+        unchanged = get_unchanged_slugs([data for data in data_json if data["slug"] in up_slugs])
+    with save_session():
+        for slu in up_slugs:
+            if slu in unchanged:
+                print(f"Dataset {slu} is up to date.")
+                continue
+            print(f"Updated dataset {slu}.")
+            renku_dataset_update(slugs=[slu])
+            renku_save()
     find_datasets_with_non_matching_keywords(
         keywords=[keyword], include=up_slugs, remove=True
     )
@@ -499,55 +639,65 @@ def update_dataset_files(urls: List[str], dataset_slug: str):
         urls (List[str]): File paths to add/update
         dataset_slug (str): Dataset name to add files to/update files in
     """
-    project_context.clear()
-    datasets = Dataset.list()
+    index = project_snapshot.index()
     # datasets = renku_api.renku_dataset_list()
-    slug_list = [dataset.slug for dataset in datasets]
-    if dataset_slug not in slug_list:
+    if dataset_slug not in index.by_slug.keys():
         print(
             f"WARNING: Dataset {dataset_slug} does not exist.\n"
             f"Files will not be added to any dataset."
         )
         return
-    dataset = [data for data in datasets if data.slug == dataset_slug][0]
     valid_urls = [url for url in into_list(urls) if os.path.isfile(url)]
-    dataset_files = [fi.path for fi in dataset.files]
-    add_urls = [url for url in valid_urls if url not in dataset_files]
+    add_urls = [url for url in valid_urls if not index.has_file(dataset_slug, url)]
     if len(add_urls) > 0:
         renku_add_to_dataset(urls=add_urls, dataset_slug=dataset_slug)
         print(f"Added the following files to {dataset_slug}:\n {add_urls}")
     return
 
 
-def unlink_dataset_files(out_files: List[str], dataset_slug: str, remove: bool = True):
-    """Unlink files from a given dataset
+def remove_files(files: List[str], max_workers: int = 8):
+    """Delete files in parallel, skipping files that do not exist (anymore)
+
+    Args:
+        files (List[str]): Files to delete
+        max_workers (int, optional): Maximal number of parallel deletions. Defaults to 8.
+    """
+    def remove_file(file: str):
+        try:
+            os.remove(file)
+        except FileNotFoundError:
+            pass
+
+    if len(files) < 1:
+        return
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(files))) as pool:
+        list(pool.map(remove_file, files))
+
+
+def unlink_dataset_files(out_files: List[str], dataset_slug: str, remove: bool = True, max_workers: int = 8):
+    """Unlink files from a given dataset.
+       All files are unlinked by a single renku command and deleted in parallel afterwards.
 
     Args:
         out_files (List[str]): List of files to unlink
         dataset_slug (str): Dataset slug to unlink files from
+        remove (bool, optional): If the files shall be deleted. Defaults to True.
+        max_workers (int, optional): Maximal number of parallel deletions. Defaults to 8.
 
     Raises:
         InputError: Dataset needs to refer to an existing dataset in the current project.
     """
-    project_context.clear()
-    datasets = Dataset.list()
+    index = project_snapshot.index()
     # datasets = renku_api.renku_dataset_list()
-    slug_list = [dataset.slug for dataset in datasets]
-    if dataset_slug not in slug_list:
+    if dataset_slug not in index.by_slug.keys():
         raise InputError("Dataset {dataset_name} does not exist in this project.")
-    dataset = [data for data in datasets if data.slug == dataset_slug][0]
-    out_urls = [url for url in out_files if os.path.isfile(url)]
-    dataset_files = [fi.path for fi in dataset.files]
+    out_urls = list(dict.fromkeys(url for url in out_files if os.path.isfile(url)))
+    unlink_urls = [url for url in out_urls if index.has_file(dataset_slug, url)]
     # What is with include as pattern? Can we replace all if renku doesn't complain for non-existing files?
-    [
-        renku_unlink_from_dataset(slug=dataset_slug, include=[out_url])
-        for out_url in out_urls
-        if out_url in dataset_files
-    ]
+    if len(unlink_urls) > 0:
+        renku_unlink_from_dataset(slug=dataset_slug, include=unlink_urls)
     if remove:
-        for out_url in out_urls:
-            if os.path.exists(out_url):
-                os.remove(out_url)
+        remove_files(out_urls, max_workers=max_workers)
 
 
 def link_files_by_prefix(
@@ -563,14 +713,8 @@ def link_files_by_prefix(
     """
     link_list: List = []
     prefix = [prefix] if not isinstance(prefix, List) else prefix  # type:ignore
-    project_context.clear()
-    datasets = Dataset.list()
     # datasets = renku_api.renku_dataset_list()
-    key_data = [
-        dataset
-        for dataset in datasets
-        if any(key in keyword for key in dataset.keywords)
-    ]
+    key_data = project_snapshot.index().datasets_by_keywords(keyword)
     for data in key_data:
         pat_list = [re.compile(pattern) for pattern in prefix]
         pat_files = [
@@ -1,32 +1,76 @@
 """General checks to ensure the enviroment and setup are as expected"""
 
-from renku.ui.api.models.project import Project
+from renku.infrastructure.repository import Repository
 from omnibenchmark.utils.exceptions import InputError
 from renku.core.errors import RequestError
 from omnibenchmark.utils.general import into_list
 from omnibenchmark.utils.local_cache.config import local_bench_cat_data
 from omnibenchmark.utils.default_global_vars import BENCH_URL
-from typing import Union, Optional, List, Mapping
+from omnibenchmark.utils import http_client
+from typing import Dict, Tuple, Union, Optional, List, Mapping
+import threading
 import warnings
 import os
-import requests
 import json
 
 
-def is_renku_project(path: Union[os.PathLike, str] = os.getcwd()) -> bool:
+RENKU_METADATA = os.path.join(".renku", "metadata.yml")
+_renku_project_memo: Dict[str, Tuple[Tuple[float, float], bool]] = {}
+_renku_project_lock = threading.Lock()
+
+
+def find_repository_root(path: Union[os.PathLike, str]) -> Optional[str]:
+    """Find the root of the git repository a path belongs to
+
+    Args:
+        path (Union[os.PathLike, str]): A resolved path
+
+    Returns:
+        Optional[str]: Repository root, None if the path is not part of a git repository.
+    """
+    current = str(path)
+    while True:
+        if os.path.exists(os.path.join(current, ".git")):
+            return current
+        parent = os.path.dirname(current)
+        if parent == current:
+            return None
+        current = parent
+
+
+def is_renku_project(path: Optional[Union[os.PathLike, str]] = None) -> bool:
     """Checks if a project is an initialized renku project.
+       Results are memoized by repository root and the modification times of the renku metadata and the git index.
+
     Args:
-        path (Pathlike, str, optional): A path to check. Defaults to ".".
+        path (Pathlike, str, optional): A path to check. Defaults to None (current working directory).
+
+    Raises:
+        FileNotFoundError: If the path does not exist.
 
     Returns:
         bool: True if project is a renku project.
     """
-    current_dir = os.getcwd()
-    os.chdir(path)
-    project = Project()
-    repo = project.repository
-    os.chdir(current_dir)
-    return True if '.renku/metadata.yml' in repo.files else False
+    path = os.path.realpath(os.getcwd() if path is None else path)
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"No such file or directory: '{path}'")
+    root = find_repository_root(path)
+    if root is None:
+        return False
+    try:
+        key = (
+            os.stat(os.path.join(root, RENKU_METADATA)).st_mtime,
+            os.stat(os.path.join(root, ".git", "index")).st_mtime if os.path.isdir(os.path.join(root, ".git")) else 0.0,
+        )
+    except FileNotFoundError:
+        return False
+    with _renku_project_lock:
+        memo = _renku_project_memo.get(root)
+        if memo is not None and memo[0] == key:
+            return memo[1]
+        is_project = Repository(root).contains(RENKU_METADATA)
+        _renku_project_memo[root] = (key, is_project)
+        return is_project
 
 
 def get_bench_essentials(
@@ -41,7 +85,7 @@ def get_bench_essentials(
             warnings.warn(f'Warning: Could not detect local cache. \n Checking {bench_url} instead.')
             data = None
     if not local_cache or data is None:
-        r = requests.get(bench_url)
+        r = http_client.get(bench_url)
         if r.status_code == 404:
             raise RequestError( f'Requested url not available: {bench_url}')
         data = r.json()
@@ -0,0 +1,110 @@
+"""Dry-run plan of everything an update and run of an omnibenchmark module would do"""
+
+from typing import Any, Dict, List, Optional
+from omnibenchmark.management.update_planner import UpdatePlan
+from omnibenchmark.management.project_snapshot import project_snapshot
+from omnibenchmark.management.wflow_checks import plan_index_cache
+from omnibenchmark.management import general_checks
+
+
+class ModulePlan:
+    """Datasets, plans, activities and outputs an update and run of a module would create or change"""
+
+    def __init__(self):
+        """Structured dry-run plan of a module. Nothing in the project is changed by building it.
+           Requests that could not be answered from the local cache while planning offline are listed in missing,
+           the plan is incomplete for those.
+        """
+        self.imports: List[str] = []
+        self.updates: List[str] = []
+        self.unchanged: List[str] = []
+        self.plans: List[str] = []
+        self.plans_to_create: List[str] = []
+        self.activities_to_create: List[str] = []
+        self.activities_to_update: List[str] = []
+        self.outputs_to_link: List[str] = []
+        self.offline: bool = False
+        self.missing: List[str] = []
+        self.warnings: List[str] = []
+
+    @property
+    def is_complete(self) -> bool:
+        return len(self.missing) < 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Get the plan as a json serializable dictionary
+
+        Returns:
+            Dict[str, Any]: All fields of the plan
+        """
+        return {key: (list(value) if isinstance(value, list) else value) for key, value in vars(self).items()}
+
+    def __str__(self) -> str:
+        nl = "\n  "
+        sections = [
+            ("Datasets to import", self.imports),
+            ("Datasets to update", self.updates),
+            ("Datasets that are up to date", self.unchanged),
+            ("Existing plans", self.plans),
+            ("Plans to create", self.plans_to_create),
+            ("Activities to create", self.activities_to_create),
+            ("Activities to update", self.activities_to_update),
+            ("Outputs to link", self.outputs_to_link),
+            ("Not cached (plan is incomplete)", self.missing),
+            ("Warnings", self.warnings),
+        ]
+        return "\n".join(
+            f"{title}:{nl}{nl.join(items)}" for title, items in sections if len(items) > 0
+        ) or "Nothing to do."
+
+
+def add_dataset_plan(plan: ModulePlan, update_plan: UpdatePlan):
+    """Add the datasets to import and update of a dataset update plan to a module plan
+
+    Args:
+        plan (ModulePlan): Module plan to extend
+        update_plan (UpdatePlan): Datasets to import and update per keyword
+    """
+    plan.imports = update_plan.import_urls()
+    plan.updates = update_plan.update_slugs()
+    planned = {slug for key in update_plan.keywords for slug in update_plan.updates.get(key, [])}
+    plan.unchanged = sorted(planned & update_plan.unchanged)
+
+
+def add_workflow_plan(
+    plan: ModulePlan,
+    out_files: List[str],
+    command_line: Optional[str] = None,
+    dataset_slug: Optional[str] = None,
+):
+    """Add the plans, activities and output files a run of a module would create or update to a module plan.
+       Uses one plan index and one dataset snapshot of the current project for all lookups.
+
+    Args:
+        plan (ModulePlan): Module plan to extend
+        out_files (List[str]): Output files of the module
+        command_line (Optional[str], optional): Command a new plan would be created from. Defaults to None.
+        dataset_slug (Optional[str], optional): Slug of the modules output dataset. Defaults to None.
+    """
+    plan_index = plan_index_cache.get()
+    plans = plan_index.plans_by_outputs(out_files)
+    plan.plans = [str(wflow.name) for wflow in plans]
+    if len(plans) > 1:
+        plan.warnings.append(
+            "Ambiguity: Too many plans found associated to output files. Running the module will fail."
+        )
+    if len(plans) < 1 and command_line is not None:
+        plan.plans_to_create = [command_line]
+    generation_index = plan_index.generation_index
+    for out in out_files:
+        if str(out) in generation_index:
+            plan.activities_to_update.append(out)
+        else:
+            plan.activities_to_create.append(out)
+    if dataset_slug is None:
+        return
+    if not general_checks.is_renku_project():
+        plan.outputs_to_link = list(out_files)
+        return
+    project_index = project_snapshot.index()
+    plan.outputs_to_link = [out for out in out_files if not project_index.has_file(dataset_slug, out)]
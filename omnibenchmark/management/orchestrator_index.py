@@ -0,0 +1,199 @@
+"""Index of all projects that are part of an orchestrator"""
+
+from typing import Dict, List, Optional, Set, Tuple
+from omnibenchmark.utils import http_client
+from omnibenchmark.utils.default_global_vars import get_git_url
+from omnibenchmark.utils.local_cache.config import orchestrator_cache_dir
+from omnibenchmark.utils.local_cache.response_cache import response_cache
+import threading
+import hashlib
+import json
+import os
+
+# Downstream project ids by orchestrator and pipeline state, shared by all indexes of this process
+_memory_cache: Dict[str, Set[int]] = {}
+_lock = threading.Lock()
+
+
+def get_orchestrator_prefix(key: str) -> str:
+    """Get the part of an index cache key that identifies the orchestrator
+
+    Args:
+        key (str): Cache key ("<gitlab url> <orchestrator id> <pipeline id>@<updated at> ...")
+
+    Returns:
+        str: Gitlab url and orchestrator id followed by a space
+    """
+    return " ".join(key.split(" ")[:2]) + " "
+
+
+class OrchestratorIndex:
+    """Downstream project ids of the latest pipelines of an orchestrator"""
+
+    def __init__(
+        self,
+        o_url: str,
+        gitlab_url: Optional[str] = None,
+        n_latest: int = 9,
+        cache_dir: str = orchestrator_cache_dir,
+    ):
+        """Index of all projects an orchestrator successfully triggered in its latest pipelines.
+           The index is built on first use and cached in memory and on disk by the orchestrator pipeline state.
+
+        Args:
+            o_url (str): Orchestrator url
+            gitlab_url (str, optional): General Gitlab url. Defaults to utils/default_global_vars/GIT_URL.
+            n_latest (int, optional): Number of latest pipelines to include. Defaults to 9.
+            cache_dir (str, optional): Directory to cache indexes in. Defaults to the XDG data dir.
+        """
+        self.o_url = o_url
+        self.gitlab_url = get_git_url() if gitlab_url is None else gitlab_url
+        self.n_latest = n_latest
+        self.cache_dir = cache_dir
+        self.key: Optional[str] = None
+        self.project_ids: Optional[Set[int]] = None
+        self._build_lock = threading.Lock()
+
+    def __contains__(self, project_id: object) -> bool:
+        return project_id in self.build()
+
+    def get_pipelines(self) -> Tuple[str, List]:
+        """Get the orchestrators pipelines to index and the cache key describing their state
+
+        Returns:
+            Tuple[str, List]: Cache key and list of gitlab pipelines
+        """
+        o_info = http_client.get(self.o_url).json()
+        renku_git = http_client.get_gitlab(self.gitlab_url)
+        o_git = renku_git.projects.get(o_info["identifier"])
+        success = o_git.pipelines.list(status="success", all=False)
+        latest = o_git.pipelines.list(order_by="updated_at", all=False)[
+            : self.n_latest
+        ]  # type:ignore
+        query_pipes = list({pipe.id: pipe for pipe in success + latest}.values())  # type:ignore
+        pipe_state = sorted(str(pipe.id) + "@" + str(pipe.updated_at) for pipe in query_pipes)
+        key = " ".join([self.gitlab_url, str(o_info["identifier"])] + pipe_state)
+        return key, query_pipes
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, hashlib.sha256(key.encode()).hexdigest() + ".json")
+
+    def load(self, key: str) -> Optional[Set[int]]:
+        """Load the project ids of an index from memory or disk
+
+        Args:
+            key (str): Cache key
+
+        Returns:
+            Optional[Set[int]]: Downstream project ids, if the index was cached
+        """
+        with _lock:
+            if key in _memory_cache:
+                return _memory_cache[key]
+        try:
+            with open(self._path(key)) as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if cached.get("key") != key:
+            return None
+        project_ids = set(cached["project_ids"])
+        with _lock:
+            _memory_cache[key] = project_ids
+        return project_ids
+
+    def store(self, key: str, project_ids: Set[int]):
+        """Store the project ids of an index in memory and on disk
+
+        Args:
+            key (str): Cache key
+            project_ids (Set[int]): Downstream project ids
+        """
+        prefix = get_orchestrator_prefix(key)
+        with _lock:
+            for old_key in [old for old in _memory_cache if old.startswith(prefix) and old != key]:
+                del _memory_cache[old_key]
+            _memory_cache[key] = project_ids
+        os.makedirs(self.cache_dir, exist_ok=True)
+        with open(self._path(key), "w") as f:
+            json.dump({"key": key, "project_ids": sorted(project_ids)}, f)
+        self.evict(prefix, keep=key)
+
+    def evict(self, prefix: str, keep: str):
+        """Remove all indexes of an orchestrator from disk except the current one
+
+        Args:
+            prefix (str): Cache key prefix of the orchestrator (see get_orchestrator_prefix)
+            keep (str): Cache key of the index to keep
+        """
+        for fi in os.scandir(self.cache_dir):
+            if not fi.name.endswith(".json") or fi.path == self._path(keep):
+                continue
+            try:
+                with open(fi.path) as f:
+                    cached = json.load(f)
+            except (OSError, ValueError):
+                continue
+            if str(cached.get("key", "")).startswith(prefix):
+                try:
+                    os.remove(fi.path)
+                except FileNotFoundError:
+                    pass
+
+    def load_latest(self) -> Optional[Set[int]]:
+        """Load the most recently stored index of the orchestrator without querying its pipelines
+
+        Returns:
+            Optional[Set[int]]: Downstream project ids, if any index of the orchestrator was cached
+        """
+        o_info = http_client.get(self.o_url).json()
+        if "identifier" not in o_info.keys():
+            return None
+        prefix = get_orchestrator_prefix(" ".join([self.gitlab_url, str(o_info["identifier"])]))
+        if not os.path.isdir(self.cache_dir):
+            return None
+        entries = sorted(
+            (fi for fi in os.scandir(self.cache_dir) if fi.name.endswith(".json")),
+            key=lambda fi: fi.stat().st_mtime,
+            reverse=True,
+        )
+        for fi in entries:
+            try:
+                with open(fi.path) as f:
+                    cached = json.load(f)
+            except (OSError, ValueError):
+                continue
+            if str(cached.get("key", "")).startswith(prefix):
+                return set(cached["project_ids"])
+        return None
+
+    def build(self) -> Set[int]:
+        """Collect all projects that were successfully triggered by the orchestrators latest pipelines.
+           While the response cache is offline the most recently stored index is used instead.
+
+        Returns:
+            Set[int]: Downstream project ids
+        """
+        with self._build_lock:
+            if self.project_ids is not None:
+                return self.project_ids
+            if response_cache.offline:
+                project_ids = self.load_latest()
+                if project_ids is None:
+                    response_cache.record_miss(f"orchestrator index of {self.o_url}")
+                    project_ids = set()
+                self.project_ids = project_ids
+                return project_ids
+            key, query_pipes = self.get_pipelines()
+            project_ids = self.load(key)
+            if project_ids is None:
+                project_ids = {
+                    brid.downstream_pipeline["project_id"]
+                    for pipe in query_pipes
+                    for brid in pipe.bridges.list(get_all=True)
+                    if brid.status == "success"
+                }
+                self.store(key, project_ids)
+            self.key = key
+            self.project_ids = project_ids
+            return project_ids
@@ -0,0 +1,134 @@
+"""Per process snapshot of the dataset metadata of renku projects"""
+
+from typing import Dict, List, Optional, Set, Union
+from renku.ui.api.models.dataset import Dataset
+from renku.domain_model.project_context import project_context
+import functools
+import threading
+import os
+
+
+class ProjectIndex:
+    """Keyword, slug and file path lookups over the datasets of a project"""
+
+    def __init__(self, datasets: List[Dataset]):
+        """Build all lookups in one pass over the datasets and their files.
+
+        Args:
+            datasets (List[Dataset]): Datasets of a project
+        """
+        self.datasets = datasets
+        self.by_slug: Dict[str, Dataset] = {}
+        self.by_keyword: Dict[str, List[int]] = {}
+        self.files_by_slug: Dict[str, Set[str]] = {}
+        self.by_path: Dict[str, List[str]] = {}
+        for pos, dataset in enumerate(datasets):
+            self.by_slug.setdefault(dataset.slug, dataset)
+            for key in set(dataset.keywords or []):
+                self.by_keyword.setdefault(key, []).append(pos)
+            paths = {fi.path for fi in dataset.files}
+            self.files_by_slug.setdefault(dataset.slug, set()).update(paths)
+            for path in paths:
+                self.by_path.setdefault(path, []).append(dataset.slug)
+
+    def datasets_by_keywords(self, keyword: Union[List[str], str]) -> List[Dataset]:
+        """Get all datasets with at least one matching keyword in project order.
+           Keywords are matched like `dataset_key in keyword`, i.e., by membership for lists and as substring for strings.
+
+        Args:
+            keyword (Union[List[str], str]): Keyword(s) to match
+
+        Returns:
+            List[Dataset]: Matching datasets
+        """
+        if isinstance(keyword, str):
+            match_keys = [key for key in self.by_keyword.keys() if key in keyword]
+        else:
+            match_keys = [key for key in set(keyword) if key in self.by_keyword.keys()]
+        positions = sorted({pos for key in match_keys for pos in self.by_keyword[key]})
+        return [self.datasets[pos] for pos in positions]
+
+    def has_file(self, slug: str, path: str) -> bool:
+        """Check if a file is part of a dataset
+
+        Args:
+            slug (str): Dataset slug
+            path (str): File path relative to the project root
+
+        Returns:
+            bool: True if the dataset contains the file
+        """
+        return path in self.files_by_slug.get(slug, set())
+
+
+class ProjectSnapshot:
+    """Datasets of renku projects, loaded once and shared by all readers"""
+
+    def __init__(self):
+        """Snapshot of the datasets of each project path.
+           A snapshot is only reloaded after it was invalidated, e.g. by the dataset write wrappers in renku_commands/datasets.
+        """
+        self._datasets: Dict[str, List[Dataset]] = {}
+        self._indexes: Dict[str, ProjectIndex] = {}
+        self._lock = threading.Lock()
+
+    def datasets(self) -> List[Dataset]:
+        """Get all datasets of the project in the current working directory
+
+        Returns:
+            List[Dataset]: Datasets of the project
+        """
+        path = os.path.realpath(os.getcwd())
+        with self._lock:
+            if path not in self._datasets:
+                project_context.clear()
+                self._datasets[path] = Dataset.list()
+            return self._datasets[path]
+
+    def index(self) -> ProjectIndex:
+        """Get the keyword, slug and file path index of the project in the current working directory.
+           The index is built once per snapshot and invalidated together with it.
+
+        Returns:
+            ProjectIndex: Index over the projects datasets
+        """
+        datasets = self.datasets()
+        path = os.path.realpath(os.getcwd())
+        with self._lock:
+            index = self._indexes.get(path)
+            if index is None or index.datasets is not datasets:
+                index = ProjectIndex(datasets)
+                self._indexes[path] = index
+            return index
+
+    def invalidate(self, path: Optional[Union[os.PathLike, str]] = None):
+        """Drop the snapshot of a project, so that it is reloaded on next use
+
+        Args:
+            path (Optional[Union[os.PathLike, str]], optional): Project path. Defaults to None (all projects).
+        """
+        with self._lock:
+            if path is None:
+                self._datasets.clear()
+                self._indexes.clear()
+            else:
+                self._datasets.pop(os.path.realpath(path), None)
+                self._indexes.pop(os.path.realpath(path), None)
+
+
+project_snapshot = ProjectSnapshot()
+
+
+def invalidates_snapshot(function):
+    """
+    Invalidate the project snapshot after a function that changes datasets, even if it fails
+    """
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        try:
+            return function(*args, **kwargs)
+        finally:
+            project_snapshot.invalidate()
+
+    return wrapper
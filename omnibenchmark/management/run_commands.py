@@ -21,7 +21,8 @@ from omnibenchmark.utils.user_input_checks import (
 from omnibenchmark.core.output_classes import OmniCommand, OmniOutput, OmniPlan
 from renku.command.view_model.plan import PlanViewModel
 from renku.domain_model.workflow.plan import AbstractPlan
-from renku.api import Activity, Plan
+from renku.api import Activity
+from renku.ui.api.models.activity import get_activities
 from renku.ui.api.util import get_plan_gateway
 from renku.domain_model.project_context import project_context
 from renku.core.workflow.value_resolution import ValueResolver
@@ -374,12 +375,12 @@ def revert_run(
         activities = flatten([Activity.filter(input=in_fi) for in_fi in in_files])
 
     if plan_id is not None:
-        renku_plan = [plan for plan in Plan.list() if plan.id in plan_id]
+        renku_plan = wflow.plan_index_cache.get().plans_by_id(plan_id)
         if len(renku_plan) == 0:
             raise InputError(
                 f"Invalid plan_id. Could not find any plan associated with {plan_id} in this project."
             )
-        activities = activities + renku_plan[0].activities
+        activities = activities + get_activities(plan_id=renku_plan[0].id)
 
     if len(activities) > 0:
         out_fis = flatten(
@@ -387,9 +388,7 @@ def revert_run(
         )
 
     if out_files is not None:
-        activities = activities + flatten(
-            [Activity.filter(outputs=out_fi) for out_fi in out_files]
-        )
+        activities = activities + Activity.filter(outputs=out_files)
         out_fis = out_fis + out_files
 
     if len(activities) == 0:
@@ -404,11 +403,11 @@ def revert_run(
 
     if dataset_slug is not None:
         unlink_dataset_files(
-            out_files=out_fis, dataset_slug=dataset_slug, remove=remove
+            out_files=list(dict.fromkeys(out_fis)), dataset_slug=dataset_slug, remove=remove
         )
 
     # revert activities
-    activity_ids = list(set([act.id for act in activities]))
+    activity_ids = list(dict.fromkeys([act.id for act in activities]))
     [
         omni_wflow.renku_workflow_revert(activity_id=act_id, plan=True)
         for act_id in activity_ids
@@ -0,0 +1,258 @@
+"""Plan and run dataset imports and updates for several keywords at once"""
+
+from typing import Dict, List, Mapping, Optional, Set
+from concurrent.futures import ThreadPoolExecutor
+from omnibenchmark.utils.default_global_vars import DATA_QUERY_URL, DATA_URL
+from omnibenchmark.management.orchestrator_index import OrchestratorIndex
+from omnibenchmark.management.data_commands import (
+    query_datasets_by_property,
+    import_filter,
+    filter_existing,
+    get_unchanged_slugs,
+    resolve_dataset_infos,
+    filter_duplicated_slugs,
+    unique_infos,
+    check_orchestrator,
+    find_datasets_with_non_matching_keywords,
+)
+from omnibenchmark.renku_commands.datasets import (
+    renku_dataset_import_bulk,
+    renku_dataset_update,
+)
+from omnibenchmark.renku_commands.general import renku_save, save_session
+from iteration_utilities import unique_everseen  # type: ignore
+
+
+class UpdatePlan:
+    """Datasets to import and to update per keyword"""
+
+    def __init__(self):
+        """Import and update plan of one or several keywords.
+           Tracks which datasets were already imported/updated, so that datasets shared between keywords are handled once.
+           Existing datasets that did not change upstream are kept as unchanged and are not updated.
+           Imports that failed are kept with their error message and are not retried.
+        """
+        self.imports: Dict[str, List[str]] = {}
+        self.updates: Dict[str, List[str]] = {}
+        self.unchanged: Set[str] = set()
+        self.imported: Set[str] = set()
+        self.updated: Set[str] = set()
+        self.failed: Dict[str, str] = {}
+
+    @property
+    def keywords(self) -> List[str]:
+        return list(self.imports.keys())
+
+    def add(self, keyword: str, imp_ids: List[str], up_slugs: List[str]):
+        """Add the datasets to import and update for a keyword
+
+        Args:
+            keyword (str): Keyword the datasets were found by
+            imp_ids (List[str]): Urls of datasets to import
+            up_slugs (List[str]): Slugs of existing datasets to update
+        """
+        self.imports[keyword] = imp_ids
+        self.updates[keyword] = up_slugs
+
+    def import_urls(self, keywords: Optional[List[str]] = None) -> List[str]:
+        """Get all dataset urls to import
+
+        Args:
+            keywords (Optional[List[str]], optional): Keywords to get imports for. Defaults to all keywords.
+
+        Returns:
+            List[str]: Unique dataset urls
+        """
+        keywords = self.keywords if keywords is None else keywords
+        return list(unique_everseen(url for key in keywords for url in self.imports.get(key, [])))
+
+    def update_slugs(self, keywords: Optional[List[str]] = None) -> List[str]:
+        """Get all dataset slugs to update, without datasets that did not change upstream
+
+        Args:
+            keywords (Optional[List[str]], optional): Keywords to get updates for. Defaults to all keywords.
+
+        Returns:
+            List[str]: Unique dataset slugs
+        """
+        keywords = self.keywords if keywords is None else keywords
+        return list(
+            unique_everseen(
+                slug
+                for key in keywords
+                for slug in self.updates.get(key, [])
+                if slug not in self.unchanged
+            )
+        )
+
+
+def merge_filter_slugs(
+    filter_list: List[Optional[List[str]]]
+) -> Optional[List[str]]:
+    """Merge the slug filter of a keyword that is used several times.
+       A slug is only filtered, if it is filtered by every usage of the keyword.
+
+    Args:
+        filter_list (List[Optional[List[str]]]): Slug filter of each usage
+
+    Returns:
+        Optional[List[str]]: Merged slug filter
+    """
+    if any(filter_slugs is None for filter_slugs in filter_list):
+        return None
+    return [slug for slug in filter_list[0] if all(slug in filt for filt in filter_list)]  # type:ignore
+
+
+def plan_dataset_updates(
+    keyword_filters: Mapping[str, Optional[List[str]]],
+    o_url: str,
+    filter_ex: bool = True,
+    query_url: str = DATA_QUERY_URL,
+    data_url: str = DATA_URL,
+    gitlab_url: Optional[str] = None,
+    check_o_url: bool = True,
+    n_latest: int = 9,
+    max_workers: int = 8,
+    check_version: bool = True,
+) -> UpdatePlan:
+    """Find all datasets to import and update for several keywords.
+       Keywords are queried concurrently and every dataset is resolved and checked against the orchestrator once.
+
+    Args:
+        keyword_filters (Mapping[str, Optional[List[str]]]): Keywords to find datasets by with the slugs to filter for each keyword
+        o_url (str): Orchestrator url that links all valid projects
+        filter_ex (bool, optional): If existing datasets should be planned as updates. Defaults to True.
+        query_url (str, optional): URL to the knowledgebase dataset query API.
+        data_url (str, optional): URL to the knowledgebase dataset API.
+        gitlab_url (str, optional): General Gitlab url. Defaults to utils/default_global_vars/GIT_URL.
+        check_o_url (bool, optional): If datasets need to be part of the orchestrator. Defaults to True.
+        n_latest (int, optional): Number of latest orchestrator pipelines to check. Defaults to 9.
+        max_workers (int, optional): Maximal number of parallel requests. Defaults to 8.
+        check_version (bool, optional): If existing datasets are only updated if they changed upstream. Defaults to True.
+
+    Returns:
+        UpdatePlan: Datasets to import and update per keyword
+    """
+    plan = UpdatePlan()
+    keywords = list(keyword_filters.keys())
+    if len(keywords) < 1:
+        return plan
+
+    # Query all keywords at once
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(keywords))) as pool:
+        query_res = pool.map(
+            lambda key: query_datasets_by_property(string=key, url=query_url), keywords
+        )
+        data_jsons = {
+            key: import_filter(data_json=data_json, filter_slugs=keyword_filters[key])
+            for key, data_json in zip(keywords, query_res)
+        }
+    exist_slugs: Set[str] = set()
+    if filter_ex:
+        _, up_json = filter_existing(
+            data_json=[data for data_json in data_jsons.values() for data in data_json]
+        )
+        exist_slugs = {data["slug"] for data in up_json}
+        if check_version:
+            plan.unchanged = get_unchanged_slugs(up_json)
+    all_ids = {
+        key: [data.get("_links")[0].get("href") for data in data_json if data["slug"] not in exist_slugs]  # type:ignore
+        for key, data_json in data_jsons.items()
+    }
+    up_exist = {
+        key: list(unique_everseen(data["slug"] for data in data_json if data["slug"] in exist_slugs))
+        for key, data_json in data_jsons.items()
+    }
+
+    # Resolve every dataset reference once
+    refs = list(unique_everseen(ref for ids in all_ids.values() for ref in ids))
+    ref_infos = dict(zip(refs, resolve_dataset_infos(refs, data_url=data_url, max_workers=max_workers)))
+    o_index = OrchestratorIndex(o_url, gitlab_url=gitlab_url, n_latest=n_latest)
+    origin_infos: Dict[str, List[Mapping]] = {}
+    for key in keywords:
+        infos = [ref_infos[ref] for ref in all_ids[key] if "slug" in ref_infos[ref].keys()]
+        origin_infos[key] = filter_duplicated_slugs(
+            unique_infos(infos), o_url=o_url, o_index=o_index
+        )
+
+    # Check every dataset against the orchestrator once
+    check_infos = {
+        info["identifier"]: info for infos in origin_infos.values() for info in infos
+    }
+    if check_o_url and len(check_infos) > 0:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(check_infos))) as pool:
+            o_checks = dict(
+                zip(
+                    check_infos.keys(),
+                    pool.map(
+                        lambda info: check_orchestrator(
+                            data_info=info, o_url=o_url, gitlab_url=gitlab_url, n_latest=n_latest, o_index=o_index
+                        ),
+                        check_infos.values(),
+                    ),
+                )
+            )
+    else:
+        o_checks = {ident: info["url"] for ident, info in check_infos.items()}
+
+    for key in keywords:
+        if len(all_ids[key]) + len(up_exist[key]) < 1:
+            print(f"WARNING:No datasets found with keyword {key}")
+            plan.add(key, [], [])
+            continue
+        if len(origin_infos[key]) + len(up_exist[key]) < 1:
+            print(
+                "WARNING:Could not identify dataset sources.\n"
+                f"Please check each of {all_ids[key]} to make sure they are the intended source"
+            )
+            plan.add(key, [], [])
+            continue
+        omni_ids = [o_checks[info["identifier"]] for info in origin_infos[key]]
+        omni_ids = list(filter(None, omni_ids))
+        if len(omni_ids) < 1:
+            if len(up_exist[key]) < 1:
+                print(
+                    f"WARNING:No dataset with keyword {key} was associated to an omnibenchmark at ${o_url}\n"
+                    f"Please check if you specified the correct benchmark/url \n"
+                )
+            else:
+                print(f"No new dataset with keyword {key} was found.")
+        plan.add(key, omni_ids, up_exist[key])  # type:ignore
+    return plan
+
+
+def run_update_plan(plan: UpdatePlan, keywords: List[str], all: bool = True):
+    """Import and update all datasets of an update plan that were found by the specified keywords.
+       All new datasets of a keyword are imported by one renku command and commit.
+       Datasets that were already imported or updated by this plan are skipped.
+
+    Args:
+        plan (UpdatePlan): Plan to run
+        keywords (List[str]): Keywords to run the plan for
+        all (bool, optional): If all datasets of a keyword should be imported or only the first one. Defaults to True.
+    """
+    with save_session():
+        for keyword in keywords:
+            imp_ids = plan.imports.get(keyword, [])
+            if not all:
+                imp_ids = imp_ids[:1]
+            import_ids = [id for id in imp_ids if id not in plan.imported and id not in plan.failed]
+            if len(import_ids) > 0:
+                report = renku_dataset_import_bulk(uris=import_ids)
+                plan.imported.update(report["imported"])
+                plan.failed.update(report["failed"])
+            up_slugs = plan.updates.get(keyword, [])
+            for slu in up_slugs:
+                if slu in plan.updated:
+                    continue
+                if slu in plan.unchanged:
+                    print(f"Dataset {slu} is up to date.")
+                    plan.updated.add(slu)
+                    continue
+                print(f"Updated dataset {slu}.")
+                renku_dataset_update(slugs=[slu])
+                renku_save()
+                plan.updated.add(slu)
+            find_datasets_with_non_matching_keywords(
+                keywords=[keyword], include=up_slugs, remove=True
+            )
@@ -1,17 +1,23 @@
 """Checks related to workflow management"""
 
 from os import PathLike
-from typing import List, Optional, Union
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
 from renku.ui.api.util import get_activity_gateway, get_plan_gateway
 from renku.infrastructure.gateway.activity_gateway import ActivityGateway
 from renku.domain_model.workflow.plan import Plan
+from renku.domain_model.provenance.activity import Activity
 from omnibenchmark.utils.exceptions import WorkflowError
 from omnibenchmark.management import general_checks
 from renku.domain_model.project_context import project_context
+import functools
+import threading
 import logging
+import os
 
 logger = logging.getLogger("omnibenchmark.management.wflow_checks")
 
+RENKU_DATABASE = os.path.join(".renku", "metadata")
+
 # Activities
 
 
@@ -40,6 +46,26 @@ def activity_plan_is_valid(
     return output if len(valid_activities) >= 1 else None
 
 
+def get_generation_index(activity_gateway: ActivityGateway) -> Dict[str, List[Activity]]:
+    """Map all generated paths to their valid activities in one pass over all activities of a project
+
+    Args:
+        activity_gateway (ActivityGateway): Activity gateway
+
+    Returns:
+        Dict[str, List[Activity]]: Output path - valid activities mapping
+    """
+    generation_index: Dict[str, List[Activity]] = {}
+    for act in activity_gateway.get_all_activities():
+        if act.association.plan.date_removed is not None:
+            continue
+        for generation in act.generations:
+            path_activities = generation_index.setdefault(str(generation.entity.path), [])
+            if act not in path_activities:
+                path_activities.append(act)
+    return generation_index
+
+
 def filter_activity_exist(outputs: List[str]) -> List[Union[PathLike, str, None]]:
     """Checks a list of outputs for existing and valid acitivites
 
@@ -49,12 +75,8 @@ def filter_activity_exist(outputs: List[str]) -> List[Union[PathLike, str, None]
     Returns:
         List[str]: A list of output paths with valid activities
     """
-    project_context.clear()
-    activity_gateway = get_activity_gateway()
-    return [
-        activity_plan_is_valid(out, activity_gateway=activity_gateway)
-        for out in outputs
-    ]
+    generation_index = plan_index_cache.get().generation_index
+    return [out if str(out) in generation_index else None for out in outputs]
 
 
 # Plans
@@ -124,16 +146,7 @@ def find_plan_by_outputs(outputs: List[str]) -> Plan:
     Returns:
         Optional[Plan]: Plan to generate one or several of those output files
     """
-    project_context.clear()
-    plans = get_all_plans()
-    valid_plans = filter_valid_plans(plans)
-    activity_gateway = get_activity_gateway()
-    out_plan_ids = [
-        get_plan_id_from_output(out, activity_gateway=activity_gateway)
-        for out in outputs
-    ]
-    flat_ids = [item for sublist in out_plan_ids for item in sublist]
-    return [plan for plan in valid_plans if plan.id in flat_ids]
+    return plan_index_cache.get().plans_by_outputs(outputs)
 
 
 def check_plan_exist(out_files: List[str]) -> Optional[Plan]:
@@ -159,3 +172,139 @@ def check_plan_exist(out_files: List[str]) -> Optional[Plan]:
         return plan[0]
     else:
         return None
+
+
+# Plan index
+
+
+class PlanIndex:
+    """Valid plans of a project indexed by plan id and by the output paths their activities generate"""
+
+    def __init__(self, plans: List[Plan], generation_index: Dict[str, List[Activity]]):
+        """Index plans and their outputs.
+
+        Args:
+            plans (List[Plan]): All plans of a project
+            generation_index (Dict[str, List[Activity]]): Output path - valid activities mapping (see get_generation_index)
+        """
+        self.plans = filter_valid_plans(plans)
+        self.by_id: Dict[str, Plan] = {plan.id: plan for plan in self.plans}
+        self.generation_index = generation_index
+        self.by_output: Dict[str, Set[str]] = {
+            path: {act.association.plan.id for act in activities}
+            for path, activities in generation_index.items()
+        }
+
+    def plans_by_outputs(self, outputs: Iterable[Union[PathLike, str]]) -> List[Plan]:
+        """Get all valid plans with activities that generated any of the outputs
+
+        Args:
+            outputs (Iterable[Union[PathLike, str]]): Output paths
+
+        Returns:
+            List[Plan]: Matching plans in project order
+        """
+        plan_ids: Set[str] = set()
+        for out in outputs:
+            plan_ids.update(self.by_output.get(str(out), set()))
+        return [plan for plan in self.plans if plan.id in plan_ids]
+
+    def plans_by_id(self, plan_id: str) -> List[Plan]:
+        """Get a valid plan by its id. Falls back to all plans whose id is part of plan_id.
+
+        Args:
+            plan_id (str): Plan id
+
+        Returns:
+            List[Plan]: Matching plans
+        """
+        if plan_id in self.by_id:
+            return [self.by_id[plan_id]]
+        return [plan for plan in self.plans if plan.id in plan_id]
+
+
+def get_database_key(path: Union[PathLike, str]) -> Optional[Tuple[Tuple[str, int], ...]]:
+    """Get the freshness key of the renku database of a project.
+       renku rewrites the index files (e.g., plans, activities) on top of the database on every change,
+       so their modification times change whenever plans or activities are added, changed or reverted.
+
+    Args:
+        path (Union[PathLike, str]): A resolved path within the project
+
+    Returns:
+        Optional[Tuple[Tuple[str, int], ...]]: Name and modification time of all index files,
+                                               None if the path is not part of a renku project.
+    """
+    root = general_checks.find_repository_root(path)
+    if root is None:
+        return None
+    try:
+        entries = os.scandir(os.path.join(root, RENKU_DATABASE))
+        return tuple(sorted((fi.name, fi.stat().st_mtime_ns) for fi in entries if fi.is_file()))
+    except FileNotFoundError:
+        return None
+
+
+class PlanIndexCache:
+    """Plan indexes of renku projects, built once and shared by all workflow checks"""
+
+    def __init__(self):
+        """Plan index of each project path, keyed by the modification times of the renku database.
+           An index is rebuilt after the renku metadata changed or it was invalidated,
+           e.g. by the workflow wrappers in renku_commands/workflows.
+        """
+        self._indexes: Dict[str, Tuple[Optional[Tuple[Tuple[str, int], ...]], PlanIndex]] = {}
+        self._lock = threading.Lock()
+
+    def get(self) -> PlanIndex:
+        """Get the plan index of the project in the current working directory.
+           Directories that are no renku project get an empty index, which is not cached.
+
+        Returns:
+            PlanIndex: Index over the projects plans and activities
+        """
+        path = os.path.realpath(os.getcwd())
+        key = get_database_key(path)
+        with self._lock:
+            if path not in self._indexes or self._indexes[path][0] != key:
+                project_context.clear()
+                if not general_checks.is_renku_project():
+                    return PlanIndex([], {})
+                self._indexes[path] = (
+                    key,
+                    PlanIndex(
+                        get_plan_gateway().get_all_plans(),
+                        get_generation_index(get_activity_gateway()),
+                    ),
+                )
+            return self._indexes[path][1]
+
+    def invalidate(self, path: Optional[Union[PathLike, str]] = None):
+        """Drop the plan index of a project, so that it is rebuilt on next use
+
+        Args:
+            path (Optional[Union[PathLike, str]], optional): Project path. Defaults to None (all projects).
+        """
+        with self._lock:
+            if path is None:
+                self._indexes.clear()
+            else:
+                self._indexes.pop(os.path.realpath(path), None)
+
+
+plan_index_cache = PlanIndexCache()
+
+
+def invalidates_plan_index(function):
+    """
+    Invalidate the plan index after a function that changes plans or activities, even if it fails
+    """
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        try:
+            return function(*args, **kwargs)
+        finally:
+            plan_index_cache.invalidate()
+
+    return wrapper
@@ -1,11 +1,18 @@
 from __future__ import annotations
 import logging
-from typing import Any, TypeVar, Optional, List, Union, Dict
+import os
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, TypeVar, Optional, List, Set, Union, Dict, Mapping, Tuple
 from pathlib import Path
 from renku.domain_model.dataset import Dataset as RenkuDataSet
 import omnibenchmark.management.general_checks
 from omnibenchmark.utils.default_global_vars import DATA_QUERY_URL
 from omnibenchmark.management.data_checks import dataset_slug_exist, renku_dataset_exist
+from omnibenchmark.management.project_snapshot import invalidates_snapshot
+from renku.command.command_builder.command import Command
+from renku.core.constant import DATASET_METADATA_PATHS
+from renku.core.dataset.dataset import import_dataset
 from renku.command.dataset import (
     create_dataset_command,
     import_dataset_command,
@@ -15,12 +22,19 @@ from renku.command.dataset import (
     remove_dataset_command,
 )
 from renku.core import errors
+from renku.core.dataset.providers.factory import ProviderFactory
+from renku.core.dataset.providers.renku import RenkuProvider
+from renku.core.storage import pull_paths_from_storage
+from renku.core.util.git import clone_renku_repository, get_cache_directory_for_repository, get_dirty_paths
+from renku.domain_model.project_context import project_context
+from renku.infrastructure.repository import split_paths
 from omnibenchmark.utils.exceptions import ProjectError
 
 PathLike = TypeVar("PathLike", str, Path, None)
 logger = logging.getLogger("omnibenchmark.renku_commands")
 
 
+@invalidates_snapshot
 def renku_dataset_create(
     slug: str,
     data_query_url: str = DATA_QUERY_URL,
@@ -82,6 +96,7 @@ def renku_dataset_create(
     return result.output
 
 
+@invalidates_snapshot
 def renku_dataset_import(
     uri: str, slug: Optional[str] = None, extract: bool = False, yes: bool = True, datadir: Optional[str] = None, 
     previous_dataset: Optional[str] = None,
@@ -120,6 +135,384 @@ def renku_dataset_import(
     return result.output
 
 
+def _importer_source(provider: RenkuProvider, importer: Any) -> Optional[Dict[str, Any]]:
+    """Read the source project and dataset identifier of a renku importer.
+       renku does not expose them publicly before the dataset is fetched, this is the only place
+       relying on the private importer/provider attributes.
+
+    Args:
+        provider (RenkuProvider): Renku import provider of the dataset
+        importer (Any): Importer returned by provider.get_importer
+
+    Returns:
+        Optional[Dict[str, Any]]: Project urls ("urls"), dataset identifier ("identifier") and
+                                  knowledge graph query function ("query"), None if renku does not provide them.
+    """
+    urls = tuple(
+        url
+        for url in (getattr(importer, "_project_url_ssh", None), getattr(importer, "_project_url_http", None))
+        if url
+    )
+    query = getattr(provider, "_query_knowledge_graph", None)
+    if len(urls) < 1 or not callable(query):
+        return None
+    return {"urls": urls, "identifier": getattr(importer, "_identifier", None), "query": query}
+
+
+def _resolve_import_source(
+    uri: str, project_path: str, gitlab_token: Optional[str] = None
+) -> Dict[str, Any]:
+    """Resolve the source project and the files of a dataset to import from the knowledge graph
+
+    Args:
+        uri (str): URL to the dataset to import
+        project_path (str): Path to the project the dataset is imported into
+        gitlab_token (Optional[str], optional): Gitlab OAuth2 token. Defaults to None.
+
+    Raises:
+        errors.ParameterError: The dataset is no renku dataset or its source project can not be resolved
+
+    Returns:
+        Dict[str, Any]: Project urls ("urls"), deployment hostname ("hostname") and dataset files ("files")
+    """
+    with project_context.with_path(project_path):
+        provider = ProviderFactory.get_import_provider(uri)
+        if not isinstance(provider, RenkuProvider):
+            raise errors.ParameterError(f"Only renku datasets can be prefetched: {uri}")
+        importer = provider.get_importer(gitlab_token=gitlab_token)
+    source = _importer_source(provider, importer)
+    if source is None:
+        raise errors.ParameterError(f"Cannot resolve the source project of {uri}, importing without prefetch.")
+    parsed_uri = urllib.parse.urlparse(uri)
+    files: List[str] = []
+    if source["identifier"] is not None:
+        kg_url = parsed_uri._replace(path=f"/knowledge-graph/datasets/{source['identifier']}").geturl()
+        try:
+            dataset_info = source["query"](kg_url)
+        except errors.RenkuException:
+            dataset_info = {}
+        files = [part["atLocation"] for part in dataset_info.get("hasPart", []) if "atLocation" in part]
+    return {"urls": source["urls"], "hostname": parsed_uri.netloc, "files": files}
+
+
+def _prefetch_repository(
+    urls: Tuple[str, ...],
+    files: List[str],
+    project_path: str,
+    hostname: Optional[str] = None,
+    gitlab_token: Optional[str] = None,
+):
+    """Clone (or update) a source project into the repository cache of the project and pull the lfs objects of files.
+       Uses the same cache directory as renku, so that the following import reuses the local clone.
+
+    Args:
+        urls (Tuple[str, ...]): Urls of the source project, tried in order
+        files (List[str]): Files of the source project to pull from lfs
+        project_path (str): Path to the project the datasets are imported into
+        hostname (Optional[str], optional): Renku deployment hostname. Defaults to None.
+        gitlab_token (Optional[str], optional): Gitlab OAuth2 token. Defaults to None.
+
+    Raises:
+        errors.ParameterError: None of the urls could be cloned
+    """
+    with project_context.with_path(project_path):
+        remote_repository = None
+        for url in urls:
+            try:
+                remote_repository = clone_renku_repository(
+                    url=url,
+                    path=get_cache_directory_for_repository(url=url),
+                    gitlab_token=gitlab_token,
+                    deployment_hostname=hostname,
+                    depth=None,
+                    reuse_existing_repository=True,
+                    use_renku_credentials=True,
+                )
+            except errors.GitError:
+                continue
+            break
+    if remote_repository is None:
+        raise errors.ParameterError("Cannot clone remote projects:\n\t" + "\n\t".join(urls))
+    if len(files) < 1:
+        return
+    with project_context.with_path(remote_repository.path):
+        paths = [path for path in files if (remote_repository.path / path).exists()]
+        if paths:
+            pull_paths_from_storage(remote_repository, *paths)
+
+
+def prefetch_datasets(
+    uris: List[str],
+    project_path: Optional[str] = None,
+    gitlab_token: Optional[str] = None,
+    max_workers: int = 4,
+) -> Dict[str, Any]:
+    """Download the source projects and file payloads of several datasets concurrently before importing them.
+       Sources are resolved in parallel, then every source project is cloned into the repository cache
+       and its lfs objects are pulled by one worker. Interrupted downloads are resumed by the next prefetch/import.
+
+    Args:
+        uris (List[str]): URLs to the datasets to import
+        project_path (Optional[str], optional): Path to the project the datasets are imported into.
+                                                Defaults to None (repository of the current directory).
+        gitlab_token (Optional[str], optional): Gitlab OAuth2 token. Defaults to None.
+        max_workers (int, optional): Maximal number of parallel downloads. Defaults to 4.
+
+    Returns:
+        Dict[str, Any]: Prefetched uris ("prefetched") and failed uris with their error message ("failed")
+    """
+    root = project_path
+    if root is None:
+        root = omnibenchmark.management.general_checks.find_repository_root(os.getcwd())
+    if root is None:
+        return {"prefetched": [], "failed": {uri: "Not inside a git repository." for uri in uris}}
+    repository_root: str = root
+
+    def resolve(uri: str) -> Union[Mapping[str, Any], Exception]:
+        try:
+            return _resolve_import_source(uri, project_path=repository_root, gitlab_token=gitlab_token)
+        except Exception as e:
+            return e
+
+    failed: Dict[str, str] = {}
+    sources: Dict[Tuple[str, ...], Dict[str, Any]] = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for uri, source in zip(uris, executor.map(resolve, uris)):
+            if isinstance(source, Exception):
+                failed[uri] = str(source)
+                continue
+            group = sources.setdefault(
+                source["urls"], {"hostname": source["hostname"], "files": [], "uris": []}
+            )
+            group["files"].extend(path for path in source["files"] if path not in group["files"])
+            group["uris"].append(uri)
+
+        def fetch(urls: Tuple[str, ...]) -> Optional[Exception]:
+            group = sources[urls]
+            try:
+                _prefetch_repository(
+                    urls,
+                    files=group["files"],
+                    project_path=repository_root,
+                    hostname=group["hostname"],
+                    gitlab_token=gitlab_token,
+                )
+            except Exception as e:
+                return e
+            return None
+
+        prefetched: List[str] = []
+        for urls, error in zip(sources.keys(), executor.map(fetch, list(sources.keys()))):
+            if error is None:
+                prefetched.extend(sources[urls]["uris"])
+            else:
+                failed.update({uri: str(error) for uri in sources[urls]["uris"]})
+    return {"prefetched": prefetched, "failed": failed}
+
+
+def _metadata_paths(repository) -> List[str]:
+    """Get the absolute paths of the dataset metadata files and directories a renku import writes to
+
+    Args:
+        repository (Repository): Project repository
+
+    Returns:
+        List[str]: Metadata paths (see renku.core.constant.DATASET_METADATA_PATHS)
+    """
+    return [os.path.join(repository.path, path) for path in DATASET_METADATA_PATHS]
+
+
+def _snapshot_metadata(repository) -> Dict[str, bytes]:
+    """Read the content of all dataset metadata files (database, pointers, .gitattributes, ...)
+
+    Args:
+        repository (Repository): Project repository
+
+    Returns:
+        Dict[str, bytes]: Content by absolute file path
+    """
+    snapshot: Dict[str, bytes] = {}
+    for path in _metadata_paths(repository):
+        if os.path.isfile(path):
+            files = [path]
+        else:
+            files = [os.path.join(root, name) for root, _, names in os.walk(path) for name in names]
+        for file_path in files:
+            with open(file_path, "rb") as f:
+                snapshot[file_path] = f.read()
+    return snapshot
+
+
+def _remove_file(repository, path: str):
+    """Remove a file and all directories of the repository it leaves empty"""
+    if os.path.isfile(path) or os.path.islink(path):
+        os.remove(path)
+    parent = os.path.dirname(path)
+    while parent.startswith(str(repository.path) + os.sep) and os.path.isdir(parent) and not os.listdir(parent):
+        os.rmdir(parent)
+        parent = os.path.dirname(parent)
+
+
+def _restore_metadata(repository, snapshot: Mapping[str, bytes]):
+    """Restore the dataset metadata files to a snapshot: rewrite changed files and remove new ones
+
+    Args:
+        repository (Repository): Project repository
+        snapshot (Mapping[str, bytes]): Content by absolute file path (see _snapshot_metadata)
+    """
+    for path, content in snapshot.items():
+        if os.path.isfile(path):
+            with open(path, "rb") as f:
+                if f.read() == content:
+                    continue
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(content)
+    for path in set(_snapshot_metadata(repository).keys()) - set(snapshot.keys()):
+        _remove_file(repository, path)
+
+
+def _undo_import(repository, dirty_before: Set[str], metadata: Mapping[str, bytes]):
+    """Undo the changes of a failed import: restore the dataset metadata, restore files that exist in HEAD
+       and unstage and remove new files
+
+    Args:
+        repository (Repository): Project repository
+        dirty_before (Set[str]): Dirty paths before the import (see get_dirty_paths)
+        metadata (Mapping[str, bytes]): Dataset metadata before the import (see _snapshot_metadata)
+    """
+    _restore_metadata(repository, metadata)
+    metadata_paths = tuple(_metadata_paths(repository))
+    changed = sorted(
+        path
+        for path in get_dirty_paths(repository) - dirty_before
+        if not any(path == meta or path.startswith(meta + os.sep) for meta in metadata_paths)
+    )
+    if len(changed) < 1:
+        return
+    relative = {os.path.relpath(path, repository.path): path for path in changed}
+    in_head: Set[str] = set()
+    for batch in split_paths(*relative):
+        in_head.update(repository.run_git_command("ls-tree", "-r", "--name-only", "HEAD", "--", *batch).splitlines())
+    for batch in split_paths(*sorted(in_head)):
+        if batch:
+            repository.run_git_command("checkout", "HEAD", "--", *batch)
+    new_paths = sorted(path for path in relative if path not in in_head)
+    for batch in split_paths(*new_paths):
+        if batch:
+            repository.run_git_command("rm", "--cached", "-f", "-q", "--ignore-unmatch", "--", *batch)
+    for path in new_paths:
+        _remove_file(repository, relative[path])
+
+
+def import_datasets(
+    uris: List[str],
+    extract: bool = False,
+    yes: bool = True,
+    datadir: Optional[str] = None,
+    gitlab_token: Optional[str] = None,
+    **kwargs,
+) -> Dict[str, Any]:
+    """Import several datasets one after another within the same renku command.
+       Every import is atomic: a failing import is undone, recorded and does not stop the remaining imports.
+       renku writes the database while importing (before the import finished), so the dataset metadata
+       is snapshotted before each import and restored if it fails. Each import uses its own database instance,
+       so no objects of a failed import are kept in memory and committed by a later import.
+
+    Args:
+        uris (List[str]): URLs to the datasets to import
+        extract (bool, optional): If the datasets are zipped and shall be extracted. Defaults to False.
+        yes (bool, optional): Skip manual confirmation. Defaults to True.
+        datadir (Optional[str], optional): Data directory for the imported datasets. Defaults to None.
+        gitlab_token (Optional[str], optional): Gitlab OAuth2 token. Defaults to None.
+
+    Returns:
+        Dict[str, Any]: Imported uris ("imported") and failed uris with their error message ("failed")
+    """
+    imported: List[str] = []
+    failed: Dict[str, str] = {}
+    project_path = project_context.path
+    repository = project_context.repository
+    for uri in uris:
+        dirty_before = get_dirty_paths(repository)
+        metadata = _snapshot_metadata(repository)
+        try:
+            with project_context.with_path(project_path):
+                import_dataset(
+                    uri=uri, extract=extract, yes=yes, datadir=datadir, gitlab_token=gitlab_token, **kwargs
+                )
+        except Exception as e:
+            _undo_import(repository, dirty_before=dirty_before, metadata=metadata)
+            failed[uri] = str(e)
+            continue
+        imported.append(uri)
+    return {"imported": imported, "failed": failed}
+
+
+def import_datasets_command() -> Command:
+    """Create a command importing several datasets with one migration check, database write and commit"""
+    command = Command().command(import_datasets).lock_dataset().with_database(write=True)
+    return command.require_migration().with_commit(commit_only=DATASET_METADATA_PATHS)
+
+
+@invalidates_snapshot
+def renku_dataset_import_bulk(
+    uris: List[str],
+    extract: bool = False,
+    yes: bool = True,
+    datadir: Optional[str] = None,
+    gitlab_token: Optional[str] = None,
+    prefetch: bool = True,
+    max_workers: int = 4,
+    **kwargs,
+) -> Dict[str, Any]:
+    """Import several renku datasets by url within a single renku command and commit.
+       With several datasets their files are downloaded concurrently first (see prefetch_datasets),
+       so that the sequential metadata registration works on local copies.
+
+    Args:
+        uris (List[str]): URLs to the datasets to import
+        extract (bool, optional): If the datasets are zipped and shall be extracted. Defaults to False.
+        yes (bool, optional): Skip manual confirmation. Defaults to True.
+        datadir (Optional[str], optional): Data directory for the imported datasets. Defaults to None.
+        gitlab_token (Optional[str], optional): Gitlab OAuth2 token. Defaults to None.
+        prefetch (bool, optional): Download the datasets in parallel before importing them. Defaults to True.
+        max_workers (int, optional): Maximal number of parallel downloads. Defaults to 4.
+
+    Raises:
+        ProjectError: Project to import the datasets into needs to be a renku project
+
+    Returns:
+        Dict[str, Any]: Imported uris ("imported") and failed uris with their error message ("failed")
+    """
+    if not omnibenchmark.management.general_checks.is_renku_project():
+        raise ProjectError(
+            "Directory is not a renku project.\n"
+            "Make sure you are in the correct context.\n"
+            "No dataset was imported."
+        )
+
+    uris = list(dict.fromkeys(uris))
+    if len(uris) < 1:
+        return {"imported": [], "failed": {}}
+
+    if prefetch and len(uris) > 1:
+        prefetched = prefetch_datasets(uris, gitlab_token=gitlab_token, max_workers=max_workers)
+        for uri, error in prefetched["failed"].items():
+            logger.info(f"Could not prefetch dataset {uri}: {error}")
+
+    result = (
+        import_datasets_command()
+        .build()
+        .execute(uris=uris, extract=extract, yes=yes, datadir=datadir, gitlab_token=gitlab_token, **kwargs)
+    )
+    for uri, error in result.output["failed"].items():
+        print(f"WARNING: Could not import dataset {uri}:\n{error}")
+
+    return result.output
+
+
+@invalidates_snapshot
 def renku_dataset_update(
     slugs: List[str],
     creators: Optional[List[str]] = None,
@@ -195,6 +588,7 @@ def renku_dataset_update(
     return result.output
 
 
+@invalidates_snapshot
 def renku_add_to_dataset(
     urls: List[str],
     dataset_slug: str,
@@ -248,6 +642,7 @@ def renku_add_to_dataset(
     return result
 
 
+@invalidates_snapshot
 def renku_unlink_from_dataset(
     slug: str,
     include: Optional[List[str]] = None,
@@ -286,6 +681,7 @@ def renku_unlink_from_dataset(
     )
 
 
+@invalidates_snapshot
 def renku_dataset_remove(slug: str):
     """Remove renku dataset from the current project
 
@@ -1,20 +1,135 @@
-from typing import Optional, List
+from typing import Iterator, Optional, List, Set
+from contextlib import contextmanager
 from renku.command.save import save_and_push_command
+from renku.command.command_builder.command import Command
+from renku.domain_model.project_context import project_context
+from renku.core.storage import track_paths_in_storage
+from renku.core.util.git import commit_changes, get_dirty_paths
+import threading
 
 
-def renku_save(
-    message: Optional[str] = None,
-    destination: Optional[str] = None,
-    paths: Optional[List[str]] = None,
-):
-    """Commit and push all changes to GitLab
+class SaveSession:
+    """Collects all renku_save calls made while it is active and saves them at once"""
+
+    def __init__(self, push: bool = True):
+        """Save session. Nested sessions join the outermost one, which saves when it ends.
+
+        Args:
+            push (bool, optional): If the changes shall be pushed when the session ends.
+                                   If False they are only committed and pushed by the next renku_save. Defaults to True.
+        """
+        self.push = push
+        self.depth = 0
+        self.requests = 0
+        self.messages: List[str] = []
+        self.destination: Optional[str] = None
+        self.paths: Optional[Set[str]] = set()
+
+    def add(
+        self,
+        message: Optional[str] = None,
+        destination: Optional[str] = None,
+        paths: Optional[List[str]] = None,
+    ):
+        """Record a save request
+
+        Args:
+            message (Optional[str], optional): Commit message. Defaults to None.
+            destination (Optional[str], optional): repository url. Defaults to None.
+            paths (Optional[List[str]], optional): Paths to commit. Defaults to None (all changes).
+        """
+        self.requests += 1
+        if message is not None and message not in self.messages:
+            self.messages.append(message)
+        if destination is not None:
+            self.destination = destination
+        if paths is None or self.paths is None:
+            self.paths = None
+        else:
+            self.paths.update(paths)
+
+    def flush(self):
+        """Save all recorded requests with a single commit (and push)"""
+        if self.requests < 1:
+            return
+        message = "\n".join(self.messages) if len(self.messages) > 0 else None
+        paths = sorted(self.paths) if self.paths else None
+        self.requests = 0
+        if self.push:
+            _save(message=message, destination=self.destination, paths=paths)
+        else:
+            renku_commit(message=message, paths=paths)
+
+
+_session_lock = threading.Lock()
+_session: Optional[SaveSession] = None
+
+
+@contextmanager
+def save_session(push: bool = True) -> Iterator[SaveSession]:
+    """Coalesce all renku_save calls within the context into one save at its end.
+       Nested sessions join the outermost session. Nothing is saved if the context fails.
+
+    Args:
+        push (bool, optional): If the changes shall be pushed at the end. Defaults to True.
+
+    Yields:
+        SaveSession: The active session
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = SaveSession(push=push)
+        session = _session
+        session.depth += 1
+    try:
+        yield session
+    except BaseException:
+        with _session_lock:
+            session.depth -= 1
+            if session.depth == 0:
+                _session = None
+        if session.requests > 0:
+            print("WARNING: Changes of this session were not saved.")
+        raise
+    with _session_lock:
+        session.depth -= 1
+        outermost = session.depth == 0
+        if outermost:
+            _session = None
+    if outermost:
+        session.flush()
+
+
+def _commit(message: Optional[str] = None, paths: Optional[List[str]] = None) -> List[str]:
+    repository = project_context.repository
+    if not paths:
+        paths = list(get_dirty_paths(repository))
+    if paths:
+        track_paths_in_storage(*paths)
+        paths = commit_changes(*paths, repository=repository, message=message)
+    return paths
+
+
+def renku_commit(message: Optional[str] = None, paths: Optional[List[str]] = None):
+    """Commit all changes without pushing them
 
     Args:
         message (Optional[str], optional): Commit message. Defaults to None.
-        destination (Optional[str], optional): repository url. Defaults to None.
         paths (Optional[List[str]], optional): Paths to commits. Defaults to None.
     """
+    saved_paths = Command().command(_commit).build().execute(message=message, paths=paths).output
+    if saved_paths:
+        print("Successfully committed: \n\t{}".format("\n\t".join(saved_paths)))
+    else:
+        print("There were no changes to save.")
+
 
+def _save(
+    message: Optional[str] = None,
+    destination: Optional[str] = None,
+    paths: Optional[List[str]] = None,
+):
     saved_paths, branch = (
         save_and_push_command()
         .build()
@@ -29,3 +144,24 @@ def renku_save(
         )
     else:
         print("There were no changes to save.")
+
+
+def renku_save(
+    message: Optional[str] = None,
+    destination: Optional[str] = None,
+    paths: Optional[List[str]] = None,
+):
+    """Commit and push all changes to GitLab.
+       Within a save_session the save is deferred to the end of the session.
+
+    Args:
+        message (Optional[str], optional): Commit message. Defaults to None.
+        destination (Optional[str], optional): repository url. Defaults to None.
+        paths (Optional[List[str]], optional): Paths to commits. Defaults to None.
+    """
+    with _session_lock:
+        session = _session
+    if session is not None:
+        session.add(message=message, destination=destination, paths=paths)
+        return
+    _save(message=message, destination=destination, paths=paths)
@@ -13,6 +13,7 @@ from renku.command.format.activity import tabulate_activities
 from renku.core.workflow.execute import execute_workflow_graph
 from renku.command.command_builder.command import Command
 from omnibenchmark.management.general_checks import is_renku_project
+from omnibenchmark.management.wflow_checks import invalidates_plan_index
 from networkx import DiGraph
 import shlex
 import logging
@@ -20,6 +21,7 @@ import logging
 logger = logging.getLogger("omnibenchmark.renku_commands")
 
 
+@invalidates_plan_index
 def renku_workflow_run(
     command_line: str,
     name: Optional[str] = None,
@@ -84,6 +86,7 @@ def renku_workflow_run(
     return workflow
 
 
+@invalidates_plan_index
 def renku_workflow_execute(
     name_or_id: str,
     set_params: List[str],
@@ -119,6 +122,7 @@ def renku_workflow_execute(
     return workflow
 
 
+@invalidates_plan_index
 def renku_update_activity(
     update_all: bool = False,
     paths: Optional[List[PathLike]] = None,
@@ -161,6 +165,7 @@ def renku_update_activity(
             print(tabulate_activities(activities, modified_inputs))
 
 
+@invalidates_plan_index
 def renku_workflow_revert(
     activity_id: str,
     metadata_only: bool = False,
@@ -208,6 +213,7 @@ def execute_workflow_graph_command(skip_metadata_update: bool):
     return command
 
 
+@invalidates_plan_index
 def mod_renku_execute_workflow_graph(dag: DiGraph, provider: str = "toil", config: Optional[str] = None, skip_metadata_update: bool = False):
     """Execute workflow graph 
 
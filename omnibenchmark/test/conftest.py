@@ -26,17 +26,26 @@ from omnibenchmark.core.input_classes import OutMapping
 import renku.ui.api
 import omnibenchmark.management.general_checks
 import omnibenchmark.renku_commands.renku_api
+from omnibenchmark.utils.local_cache.response_cache import response_cache
+from omnibenchmark.management.project_snapshot import project_snapshot
+from omnibenchmark.management.wflow_checks import plan_index_cache
 
 
 ### API related fixtures
 
 
+@pytest.fixture(autouse=True)
+def disable_response_cache(monkeypatch):
+    monkeypatch.setattr(response_cache, "enabled", False)
+
+
+
 @pytest.fixture
 def disable_api_calls(monkeypatch):
     def stunted_get():
         raise RuntimeError("Network access not allowed during testing!")
 
-    monkeypatch.setattr(requests, "get", lambda *args, **kwargs: stunted_get())
+    monkeypatch.setattr(requests.Session, "get", lambda *args, **kwargs: stunted_get())
 
 @pytest.fixture
 def mock_orchestrator_json():
@@ -185,10 +194,17 @@ def mock_dataset_query(monkeypatch, mock_response_json):
         mock_res = mock_response_json
         return mock_res
 
-    monkeypatch.setattr(requests, "get", lambda *args, **kwargs: get_mock_data_json())
+    monkeypatch.setattr(requests.Session, "get", lambda *args, **kwargs: get_mock_data_json())
 
 
 ### Dataset related fixtures
+@pytest.fixture(autouse=True)
+def invalidate_project_snapshot():
+    project_snapshot.invalidate()
+    yield
+    project_snapshot.invalidate()
+
+
 @pytest.fixture
 def mock_renkuDatasetFile():
 
@@ -272,6 +288,12 @@ def no_project_context(monkeypatch):
 
 
 ### Activity related fixtures
+@pytest.fixture(autouse=True)
+def invalidate_plan_index():
+    plan_index_cache.invalidate()
+    yield
+    plan_index_cache.invalidate()
+
 
 
 @pytest.fixture
@@ -1,4 +1,7 @@
 from omnibenchmark.management import data_checks
+import requests
+from renku.domain_model.dataset import Url
+from datetime import datetime, timezone
 
 
 ### Test renku_dataset_exist
@@ -17,3 +20,112 @@ def test_dataset_slug_exist_for_not_existing(mock_dataset_query):
 
 def test_dataset_slug_exist_for_existing(mock_dataset_query):
     assert data_checks.dataset_slug_exist("mock_dataset", data_query_url="mock_url")
+
+
+### Test query_multipages
+def test_query_multipages_concurrent_pages_keep_order(monkeypatch):
+    class MockResponse:
+        def __init__(self, page):
+            self.page = page
+            self.headers = {"Total": "5"}
+
+        def json(self):
+            return [{"page": self.page}, {"page": self.page}] if self.page < 3 else [{"page": self.page}]
+
+    def mock_get(*args, **kwargs):
+        return MockResponse(kwargs["params"]["page"])
+
+    monkeypatch.setattr(requests.Session, "get", mock_get)
+    res = data_checks.query_multipages("mock_url", page_item=2)
+    assert [item["page"] for item in res] == [1, 1, 2, 2, 3]
+
+
+def test_query_multipages_without_pagination_hints(mock_dataset_query, mock_dataset_json):
+    assert data_checks.query_multipages("mock_url", page_item=2) == mock_dataset_json
+
+
+### Test iter_entities
+def test_iter_entities_stops_early(monkeypatch):
+    pages = []
+
+    class MockResponse:
+        def __init__(self, page):
+            self.page = page
+
+        def json(self):
+            return [{"type": "dataset", "slug": "slug_" + str(self.page)}, {"type": "project"}]
+
+    def mock_get(*args, **kwargs):
+        pages.append(kwargs["params"]["page"])
+        return MockResponse(kwargs["params"]["page"])
+
+    monkeypatch.setattr(requests.Session, "get", mock_get)
+    entities = data_checks.iter_entities("mock_url", page_item=2, entity="dataset")
+    assert next(entities)["slug"] == "slug_1"
+    entities.close()
+    assert max(pages) <= 2
+
+
+def test_iter_entities_max_pages(monkeypatch):
+    class MockResponse:
+        def __init__(self, page):
+            self.page = page
+
+        def json(self):
+            return [{"page": self.page}, {"page": self.page}]
+
+    def mock_get(*args, **kwargs):
+        return MockResponse(kwargs["params"]["page"])
+
+    monkeypatch.setattr(requests.Session, "get", mock_get)
+    res = list(data_checks.iter_entities("mock_url", page_item=2, max_pages=3))
+    assert [item["page"] for item in res] == [1, 1, 2, 2, 3, 3]
+
+
+### Test dataset_is_outdated
+def test_dataset_is_outdated_same_version(mock_renkuDataset, mock_entity_json):
+    mock_renkuDataset.same_as = Url(url_id="https://renkulab.io/datasets/XXXXXX")
+    mock_renkuDataset.date_modified = datetime(2022, 1, 1, tzinfo=timezone.utc)
+    data = mock_entity_json[0]
+    data["_links"] = [{"rel": "details", "href": "https://renkulab.io/knowledge-graph/datasets/XXXXXX"}]
+    data["dateModified"] = "2021-06-10T07:17:51.817557Z"
+    assert not data_checks.dataset_is_outdated(mock_renkuDataset, data)
+    data["dateModified"] = "2023-06-10T07:17:51Z"
+    assert data_checks.dataset_is_outdated(mock_renkuDataset, data)
+
+
+def test_dataset_is_outdated_missing_date(mock_renkuDataset, mock_entity_json):
+    mock_renkuDataset.same_as = Url(url_id="https://renkulab.io/datasets/XXXXXX")
+    data = mock_entity_json[0]
+    data["_links"] = [{"rel": "details", "href": "https://renkulab.io/knowledge-graph/datasets/XXXXXX"}]
+    assert data_checks.dataset_is_outdated(mock_renkuDataset, data)
+
+
+def test_dataset_is_outdated_empty_links(mock_renkuDataset, mock_entity_json):
+    mock_renkuDataset.same_as = Url(url_id="https://renkulab.io/datasets/XXXXXX")
+    data = mock_entity_json[0]
+    data["_links"] = []
+    assert data_checks.dataset_is_outdated(mock_renkuDataset, data)
+
+
+### Test parse_kg_date
+def test_parse_kg_date():
+    utc = timezone.utc
+    assert data_checks.parse_kg_date("2021-06-10T07:17:51Z") == datetime(2021, 6, 10, 7, 17, 51, tzinfo=utc)
+    assert data_checks.parse_kg_date("2021-06-10T07:17:51.1234567Z") == datetime(
+        2021, 6, 10, 7, 17, 51, 123456, tzinfo=utc
+    )
+    assert data_checks.parse_kg_date("2021-06-10T07:17:51") == datetime(2021, 6, 10, 7, 17, 51, tzinfo=utc)
+    assert data_checks.parse_kg_date("not a date") is None
+    assert data_checks.parse_kg_date(None) is None
+
+
+def test_dataset_is_outdated_new_version(mock_renkuDataset, mock_entity_json):
+    mock_renkuDataset.same_as = Url(url_id="https://renkulab.io/datasets/XXXXXX")
+    data = mock_entity_json[0]
+    data["_links"] = [{"rel": "details", "href": "https://renkulab.io/knowledge-graph/datasets/YYYYYY"}]
+    assert data_checks.dataset_is_outdated(mock_renkuDataset, data)
+
+
+def test_dataset_is_outdated_unknown_source(mock_renkuDataset, mock_entity_json):
+    assert data_checks.dataset_is_outdated(mock_renkuDataset, mock_entity_json[0])
@@ -1,5 +1,6 @@
 from omnibenchmark.management import data_commands
 import requests
+import os
 import re
 
 import pytest
@@ -22,7 +23,7 @@ def test_query_datasets_by_property_with_matching_key(mock_entity_json, monkeypa
     def mock_get(*args, **kwargs):
         return MockResponse()
 
-    monkeypatch.setattr(requests, "get", mock_get)
+    monkeypatch.setattr(requests.Session, "get", mock_get)
 
     res = data_commands.query_datasets_by_property("mock")
     assert res[0]["slug"] == "mock_dataset"
@@ -37,7 +38,7 @@ def test_query_datasets_by_property_not_matching_key(mock_entity_json, monkeypat
     def mock_get(*args, **kwargs):
         return MockResponse()
 
-    monkeypatch.setattr(requests, "get", mock_get)
+    monkeypatch.setattr(requests.Session, "get", mock_get)
 
     res = data_commands.query_datasets_by_property("something")
     assert res == []
@@ -52,7 +53,7 @@ def test_query_datasets_by_property_other_property(mock_entity_json, monkeypatch
     def mock_get(*args, **kwargs):
         return MockResponse()
 
-    monkeypatch.setattr(requests, "get", mock_get)
+    monkeypatch.setattr(requests.Session, "get", mock_get)
 
     res = data_commands.query_datasets_by_property(
         string="mock", match_string="A mock dataset", property_name="name"
@@ -94,7 +95,7 @@ def test_get_ref_by_dataset_property_no_filter(mock_entity_json, monkeypatch):
     def mock_get(*args, **kwargs):
         return MockResponse()
 
-    monkeypatch.setattr(requests, "get", mock_get)
+    monkeypatch.setattr(requests.Session, "get", mock_get)
 
     res1, res2 = data_commands.get_ref_by_dataset_property("mock")
     assert res1 == ["https://this_is_a_mo.ck"]
@@ -110,7 +111,7 @@ def test_get_ref_by_dataset_property_filter_names(mock_entity_json, monkeypatch)
     def mock_get(*args, **kwargs):
         return MockResponse()
 
-    monkeypatch.setattr(requests, "get", mock_get)
+    monkeypatch.setattr(requests.Session, "get", mock_get)
 
     res1, res2 = data_commands.get_ref_by_dataset_property(
         "mock", filter_slugs="mock_dataset"
@@ -130,7 +131,7 @@ def test_get_ref_by_dataset_property_with_filter(
     def mock_get(*args, **kwargs):
         return MockResponse()
 
-    monkeypatch.setattr(requests, "get", mock_get)
+    monkeypatch.setattr(requests.Session, "get", mock_get)
 
     res1, res2 = data_commands.get_ref_by_dataset_property("mock", filter_ex=True)
     assert res1 == []
@@ -150,7 +151,7 @@ def test_get_ref_by_dataset_property_with_filter_no_match(
     def mock_get(*args, **kwargs):
         return MockResponse()
 
-    monkeypatch.setattr(requests, "get", mock_get)
+    monkeypatch.setattr(requests.Session, "get", mock_get)
 
     res1, res2 = data_commands.get_ref_by_dataset_property("mock", filter_ex=True)
     assert res1 == ["https://this_is_a_mo.ck"]
@@ -168,7 +169,7 @@ def test_get_ref_by_dataset_property_no_data(
     def mock_get(*args, **kwargs):
         return MockResponse()
 
-    monkeypatch.setattr(requests, "get", mock_get)
+    monkeypatch.setattr(requests.Session, "get", mock_get)
 
     res1, res2 = data_commands.get_ref_by_dataset_property("mock", filter_ex=True)
     assert res1 == []
@@ -182,6 +183,31 @@ def test_find_dataset_linked_to_wflow(mock_dataset_info):
     assert linked == []
 
 
+def test_find_dataset_linked_to_wflow_stops_after_link(mock_dataset_info, monkeypatch):
+    other_info = mock_dataset_info.copy()
+    other_info["project"] = {"_links": [{"href": "https://renkulab.io/knowledge-graph/projects/mock/other"}]}
+    calls = []
+
+    class MockResponse:
+        def __init__(self, url):
+            self.url = url
+
+        def json(self):
+            if "/other/" in self.url:
+                return {"message": "Resource not found"}
+            return {"edges": [{"source": "some/plan", "target": "data/mock_dataset/counts_test.mtx.gz"}]}
+
+    def mock_get(self, url, *args, **kwargs):
+        calls.append(url)
+        return MockResponse(url)
+
+    monkeypatch.setattr(requests.Session, "get", mock_get)
+
+    linked = data_commands.find_dataset_linked_to_wflow([other_info, mock_dataset_info], max_workers=1)
+    assert linked == [mock_dataset_info]
+    assert len(calls) == 3
+
+
 # filter_duplicated_names
 @pytest.mark.api_call
 def test_filter_duplicated_slugs_works(
@@ -199,7 +225,7 @@ def test_filter_duplicated_slugs_works(
     def mock_get(*args, **kwargs):
         return MockResponse()
 
-    monkeypatch.setattr(requests, "get", mock_get)
+    monkeypatch.setattr(requests.Session, "get", mock_get)
 
     uni_dat = data_commands.filter_duplicated_slugs(info_list)
     assert uni_dat == [mock_copy]
@@ -229,6 +255,18 @@ def test_filter_duplicated_slugs_no_dup(
     assert uni_dat == [mock_dataset_info]
 
 
+def test_filter_duplicated_slugs_keeps_unique_in_order(mock_dataset_info):
+    info_list = []
+    for idx in range(3):
+        info = mock_dataset_info.copy()
+        info["identifier"] = "id_" + str(idx)
+        info["slug"] = "slug_" + str(idx)
+        info_list.extend([info, info.copy()])
+
+    uni_dat = data_commands.filter_duplicated_slugs(info_list)
+    assert [info["identifier"] for info in uni_dat] == ["id_0", "id_1", "id_2"]
+
+
 # get_origin_dataset_ids
 def test_get_origin_dataset_infos_unique_ref(monkeypatch, mock_dataset_info):
     class MockResponse:
@@ -239,7 +277,7 @@ def test_get_origin_dataset_infos_unique_ref(monkeypatch, mock_dataset_info):
     def mock_get(*args, **kwargs):
         return MockResponse()
 
-    monkeypatch.setattr(requests, "get", mock_get)
+    monkeypatch.setattr(requests.Session, "get", mock_get)
 
     data_ids = data_commands.get_origin_dataset_infos(["idx"])
     assert data_ids == [mock_dataset_info]
@@ -257,7 +295,7 @@ def test_get_origin_dataset_infos_with_sameas(monkeypatch, mock_dataset_info):
     def mock_get(*args, **kwargs):
         return MockResponse()
 
-    monkeypatch.setattr(requests, "get", mock_get)
+    monkeypatch.setattr(requests.Session, "get", mock_get)
 
     data_ids = data_commands.get_origin_dataset_infos(["idx"])
     assert data_ids == [mock_dataset_info]
@@ -275,12 +313,38 @@ def test_get_origin_dataset_infos_with_noname(monkeypatch, mock_dataset_info):
     def mock_get(*args, **kwargs):
         return MockResponse()
 
-    monkeypatch.setattr(requests, "get", mock_get)
+    monkeypatch.setattr(requests.Session, "get", mock_get)
 
     data_ids = data_commands.get_origin_dataset_infos(["idx"])
     assert data_ids == []
 
 
+def test_get_origin_dataset_infos_resolves_sameas_in_order(monkeypatch, mock_dataset_info):
+    infos = {}
+    for ref in ["ref1", "ref2", "orig1"]:
+        info = mock_dataset_info.copy()
+        info["slug"] = ref
+        info["identifier"] = ref
+        info["url"] = "https://renkulab.io/datasets/" + ref
+        infos[ref] = info
+    infos["ref1"]["sameAs"] = "https://renkulab.io/datasets/orig1"
+
+    class MockResponse:
+        def __init__(self, url):
+            self.url = url
+
+        def json(self):
+            return infos[self.url.split("/")[-1]]
+
+    def mock_get(self, url, *args, **kwargs):
+        return MockResponse(url)
+
+    monkeypatch.setattr(requests.Session, "get", mock_get)
+
+    data_infos = data_commands.get_origin_dataset_infos(["ref1", "ref2"])
+    assert data_infos == [infos["orig1"], infos["ref2"]]
+
+
 ### Assumptions do not hold after renku api change.
 #@pytest.mark.api_call
 #def test_get_origin_dataset_infos_works():
@@ -314,7 +378,7 @@ def test_check_orchestrator_existing(monkeypatch, mock_dataset_info):
         else:
             return MockResponse()
 
-    monkeypatch.setattr(requests, "get", get_project_info)
+    monkeypatch.setattr(requests.Session, "get", get_project_info)
     o_check = data_commands.check_orchestrator(mock_dataset_info, o_url="some/url", gitlab_url='https://gitlab.renkulab.io')
     assert o_check == mock_dataset_info["url"]
 
@@ -329,7 +393,7 @@ def test_get_data_url_by_keyword_no_datasets(mock_dataset_json, monkeypatch):
     def mock_get(*args, **kwargs):
         return MockResponse()
 
-    monkeypatch.setattr(requests, "get", mock_get)
+    monkeypatch.setattr(requests.Session, "get", mock_get)
 
     assert data_commands.get_data_url_by_keyword("mock", "some/path") == ([], [])
 
@@ -366,3 +430,98 @@ def test_link_files_by_prefix_prefix_string(get_renkuDataset_List, capsys):
         r"Run link_files_by_prefix with dry_run = False to link the following files to some:\n\nsome/path/to/genes_file.txt*",
         captured.out,
     )
+
+
+# unlink_dataset_files
+def test_unlink_dataset_files_single_command(get_renkuDataset_List, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    os.makedirs("some/path/to")
+    for fi in ["some/path/to/genes_file.txt", "some/path/to/other_file.txt"]:
+        open(fi, "w").close()
+    unlinked = []
+    monkeypatch.setattr(
+        data_commands,
+        "renku_unlink_from_dataset",
+        lambda slug, include: unlinked.append((slug, include)),
+    )
+
+    data_commands.unlink_dataset_files(
+        out_files=[
+            "some/path/to/genes_file.txt",
+            "some/path/to/other_file.txt",
+            "some/path/to/genes_file.txt",
+            "some/path/to/missing_file.txt",
+        ],
+        dataset_slug="mock_dataset",
+    )
+    assert unlinked == [("mock_dataset", ["some/path/to/genes_file.txt"])]
+    assert not os.path.exists("some/path/to/genes_file.txt")
+    assert not os.path.exists("some/path/to/other_file.txt")
+
+
+def test_unlink_dataset_files_no_dataset_files(get_renkuDataset_List, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    open("other_file.txt", "w").close()
+    unlinked = []
+    monkeypatch.setattr(
+        data_commands,
+        "renku_unlink_from_dataset",
+        lambda slug, include: unlinked.append((slug, include)),
+    )
+
+    data_commands.unlink_dataset_files(
+        out_files=["other_file.txt"], dataset_slug="mock_dataset", remove=False
+    )
+    assert unlinked == []
+    assert os.path.exists("other_file.txt")
+
+
+# remove_files
+def test_remove_files_skips_missing(tmp_path):
+    files = [str(tmp_path / f"file_{i}.txt") for i in range(20)]
+    for fi in files:
+        open(fi, "w").close()
+    data_commands.remove_files(files + [str(tmp_path / "missing.txt")], max_workers=4)
+    assert not any(os.path.exists(fi) for fi in files)
+
+
+def test_query_entities_by_string_full_scan_uses_multipages(mock_entity_json, monkeypatch):
+    calls = []
+
+    def mock_multipages(url, page_item=100, **kwargs):
+        calls.append(url)
+        return mock_entity_json
+
+    monkeypatch.setattr(data_commands, "query_multipages", mock_multipages)
+    res = data_commands.query_entities_by_string("mock", url="some.url/")
+    assert calls == ["some.url/mock"]
+    assert all(ent["type"] == "dataset" for ent in res)
+
+
+# update_datasets_by_keyword
+def test_update_datasets_by_keyword_queries_once(mock_entity_json, monkeypatch):
+    queries = []
+    passed = {}
+
+    def mock_query(*args, **kwargs):
+        queries.append(1)
+        return mock_entity_json
+
+    def mock_get_urls(*args, data_json=None, **kwargs):
+        passed["data_json"] = data_json
+        return [], ["mock_dataset"]
+
+    def mock_unchanged(data_json):
+        passed["unchanged"] = data_json
+        return {"mock_dataset"}
+
+    monkeypatch.setattr(data_commands, "query_datasets_by_property", mock_query)
+    monkeypatch.setattr(data_commands, "get_data_url_by_keyword", mock_get_urls)
+    monkeypatch.setattr(data_commands, "get_unchanged_slugs", mock_unchanged)
+    monkeypatch.setattr(data_commands, "renku_dataset_import_bulk", lambda *args, **kwargs: None)
+    monkeypatch.setattr(data_commands, "find_datasets_with_non_matching_keywords", lambda *args, **kwargs: None)
+
+    data_commands.update_datasets_by_keyword("mock", o_url="some/url")
+    assert len(queries) == 1
+    assert passed["data_json"] is mock_entity_json
+    assert passed["unchanged"] == mock_entity_json
@@ -3,6 +3,8 @@ from omnibenchmark.utils.exceptions import InputError
 from renku.core.errors import RequestError
 import pytest
 import requests
+import subprocess
+import os
 
 ### Test is_renku_project
 def test_is_renku_project_for_current_dir():
@@ -20,7 +22,7 @@ def test_find_orchestrator_matching_key(monkeypatch, mock_response_essential):
     def mock_get(*args, **kwargs):
         return mock_response_essential
 
-    monkeypatch.setattr(requests, "get", mock_get)
+    monkeypatch.setattr(requests.Session, "get", mock_get)
     assert (
         general_checks.find_orchestrator("explicit")
         == "https://mocklab.io/kg/projects/another-orchestrator-path"
@@ -32,7 +34,7 @@ def test_find_orchestrator_multi_matching_key(monkeypatch, mock_response_essenti
     def mock_get(*args, **kwargs):
         return mock_response_essential
 
-    monkeypatch.setattr(requests, "get", mock_get)
+    monkeypatch.setattr(requests.Session, "get", mock_get)
     assert (
         general_checks.find_orchestrator("one")
         == "https://mocklab.io/kg/projects/orchestrator-path"
@@ -46,7 +48,7 @@ def test_find_orchestrator_not_existing_url(monkeypatch, mock_response_essential
         mock_resp.status_code = 404
         return mock_resp
 
-    monkeypatch.setattr(requests, "get", mock_get)
+    monkeypatch.setattr(requests.Session, "get", mock_get)
 
     with pytest.raises(RequestError, match=r"Requested url not available:*?"):
         general_checks.find_orchestrator("omni_batch")
@@ -57,7 +59,7 @@ def test_find_orchestrator_not_existing_key(monkeypatch, mock_response_essential
     def mock_get(*args, **kwargs):
         return mock_response_essential
 
-    monkeypatch.setattr(requests, "get", mock_get)
+    monkeypatch.setattr(requests.Session, "get", mock_get)
     assert general_checks.find_orchestrator("omni") is None
 
 
@@ -67,3 +69,31 @@ def test_find_orchestrator_works():
         general_checks.find_orchestrator("omni_batch_py")
         == "https://renkulab.io/knowledge-graph/projects/omnibenchmark/omni-batch-py/orchestrator-py"
     )
+
+
+def test_is_renku_project_memoized_by_metadata(tmp_path, monkeypatch):
+    subprocess.run(["git", "init", "-q", str(tmp_path)], check=True)
+    os.makedirs(tmp_path / "sub")
+    assert not general_checks.is_renku_project(tmp_path / "sub")
+
+    os.makedirs(tmp_path / ".renku")
+    (tmp_path / ".renku" / "metadata.yml").write_text("mock")
+    assert not general_checks.is_renku_project(tmp_path)
+
+    subprocess.run(["git", "-C", str(tmp_path), "add", ".renku/metadata.yml"], check=True)
+    assert general_checks.is_renku_project(tmp_path / "sub")
+
+    calls = []
+    monkeypatch.setattr(
+        general_checks.Repository, "contains", lambda *args, **kwargs: calls.append(1)
+    )
+    monkeypatch.chdir(tmp_path / "sub")
+    assert general_checks.is_renku_project()
+    assert calls == []
+    assert os.getcwd() == os.path.realpath(tmp_path / "sub")
+
+
+def test_find_repository_root(tmp_path):
+    subprocess.run(["git", "init", "-q", str(tmp_path / "repo")], check=True)
+    os.makedirs(tmp_path / "repo" / "sub")
+    assert general_checks.find_repository_root(tmp_path / "repo" / "sub") == str(tmp_path / "repo")
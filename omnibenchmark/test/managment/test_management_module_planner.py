@@ -0,0 +1,61 @@
+from omnibenchmark.management import module_planner, wflow_checks
+from omnibenchmark.management.module_planner import ModulePlan, add_dataset_plan, add_workflow_plan
+from omnibenchmark.management.update_planner import UpdatePlan
+from omnibenchmark.management.project_snapshot import ProjectIndex
+import pytest
+
+
+@pytest.fixture
+def mock_project(monkeypatch, mock_plan, mock_activity, mock_api_Dataset_2files):
+    plan_index = wflow_checks.PlanIndex([mock_plan], {"test_output": [mock_activity]})
+    project_index = ProjectIndex([mock_api_Dataset_2files])
+    monkeypatch.setattr(module_planner.plan_index_cache, "get", lambda *args, **kwargs: plan_index)
+    monkeypatch.setattr(module_planner.project_snapshot, "index", lambda *args, **kwargs: project_index)
+    monkeypatch.setattr(
+        module_planner.general_checks, "is_renku_project", lambda *args, **kwargs: True
+    )
+
+
+# Test add_dataset_plan
+def test_add_dataset_plan():
+    update_plan = UpdatePlan()
+    update_plan.add("key1", ["url1", "url2"], ["slug1", "slug2"])
+    update_plan.add("key2", ["url2"], ["slug2"])
+    update_plan.unchanged = {"slug2", "other_slug"}
+    plan = ModulePlan()
+    add_dataset_plan(plan, update_plan)
+    assert plan.imports == ["url1", "url2"]
+    assert plan.updates == ["slug1"]
+    assert plan.unchanged == ["slug2"]
+
+
+# Test add_workflow_plan
+def test_add_workflow_plan_existing_plan(mock_project):
+    plan = ModulePlan()
+    out_files = ["test_output", "new_output", "some/path/to/genes_file.txt"]
+    add_workflow_plan(plan, out_files=out_files, command_line="test command", dataset_slug="mock_dataset")
+    assert len(plan.plans) == 1
+    assert plan.plans_to_create == []
+    assert plan.activities_to_update == ["test_output"]
+    assert plan.activities_to_create == ["new_output", "some/path/to/genes_file.txt"]
+    assert plan.outputs_to_link == ["test_output", "new_output"]
+
+
+def test_add_workflow_plan_new_plan(mock_project):
+    plan = ModulePlan()
+    add_workflow_plan(plan, out_files=["new_output"], command_line="test command", dataset_slug="mock_dataset")
+    assert plan.plans == []
+    assert plan.plans_to_create == ["test command"]
+    assert plan.activities_to_create == ["new_output"]
+
+
+# Test ModulePlan
+def test_module_plan_report():
+    plan = ModulePlan()
+    assert str(plan) == "Nothing to do."
+    assert plan.is_complete
+    plan.imports = ["url1"]
+    plan.missing = ["https://mocklab.io/knowledge-graph/datasets/XXX"]
+    assert "Datasets to import:\n  url1" in str(plan)
+    assert not plan.is_complete
+    assert plan.to_dict()["imports"] == ["url1"]
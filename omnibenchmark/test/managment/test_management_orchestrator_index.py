@@ -0,0 +1,103 @@
+from omnibenchmark.management import orchestrator_index
+from omnibenchmark.utils import http_client
+from omnibenchmark.utils.local_cache.response_cache import response_cache
+import requests
+import pytest
+
+
+@pytest.fixture
+def mock_orchestrator(monkeypatch):
+    calls = {"bridges": 0}
+
+    class MockBridge:
+        def __init__(self, project_id, status="success"):
+            self.status = status
+            self.downstream_pipeline = {"project_id": project_id}
+
+    class MockBridges:
+        def __init__(self, bridges):
+            self.bridges = bridges
+
+        def list(self, **kwargs):
+            calls["bridges"] += 1
+            return self.bridges
+
+    class MockPipeline:
+        def __init__(self, id, bridges):
+            self.id = id
+            self.updated_at = "2023-01-0" + str(id)
+            self.bridges = MockBridges(bridges)
+
+    pipes = [
+        MockPipeline(1, [MockBridge(11), MockBridge(12, status="failed")]),
+        MockPipeline(2, [MockBridge(13)]),
+    ]
+
+    class MockPipelines:
+        def list(self, **kwargs):
+            return pipes
+
+    class MockProject:
+        pipelines = MockPipelines()
+
+    class MockProjects:
+        def get(self, *args, **kwargs):
+            return MockProject()
+
+    class MockGitlab:
+        projects = MockProjects()
+
+    class MockResponse:
+        @staticmethod
+        def json():
+            return {"identifier": 1234}
+
+    monkeypatch.setattr(requests.Session, "get", lambda *args, **kwargs: MockResponse())
+    monkeypatch.setattr(http_client, "get_gitlab", lambda *args, **kwargs: MockGitlab())
+    monkeypatch.setattr(orchestrator_index, "_memory_cache", {})
+    return calls
+
+
+# Test OrchestratorIndex
+def test_orchestrator_index_membership(mock_orchestrator, tmp_path):
+    o_index = orchestrator_index.OrchestratorIndex("some/url", cache_dir=str(tmp_path))
+    assert 11 in o_index
+    assert 13 in o_index
+    assert 12 not in o_index
+    assert mock_orchestrator["bridges"] == 2
+
+
+def test_orchestrator_index_reused_from_cache(mock_orchestrator, tmp_path):
+    orchestrator_index.OrchestratorIndex("some/url", cache_dir=str(tmp_path)).build()
+    orchestrator_index._memory_cache.clear()
+    o_index = orchestrator_index.OrchestratorIndex("some/url", cache_dir=str(tmp_path))
+    assert o_index.build() == {11, 13}
+    assert mock_orchestrator["bridges"] == 2
+
+
+def test_orchestrator_index_offline_uses_latest_index(mock_orchestrator, monkeypatch, tmp_path):
+    orchestrator_index.OrchestratorIndex("some/url", gitlab_url="https://git", cache_dir=str(tmp_path)).build()
+    orchestrator_index._memory_cache.clear()
+    monkeypatch.setattr(http_client, "get_gitlab", None)
+    monkeypatch.setattr(
+        http_client, "get", lambda *args, **kwargs: type("Response", (), {"json": lambda self: {"identifier": 1234}})()
+    )
+    with response_cache.offline_mode():
+        o_index = orchestrator_index.OrchestratorIndex("some/url", gitlab_url="https://git", cache_dir=str(tmp_path))
+        assert o_index.build() == {11, 13}
+        empty_index = orchestrator_index.OrchestratorIndex("other/url", gitlab_url="https://other", cache_dir=str(tmp_path))
+        assert empty_index.build() == set()
+        assert response_cache.misses == ["orchestrator index of other/url"]
+    assert mock_orchestrator["bridges"] == 2
+
+
+def test_orchestrator_index_store_evicts_older_indexes(mock_orchestrator, tmp_path):
+    o_index = orchestrator_index.OrchestratorIndex("some/url", gitlab_url="https://git", cache_dir=str(tmp_path))
+    o_index.store("https://git 1234 1@2023-01-01", {11})
+    o_index.store("https://git 5678 1@2023-01-01", {21})
+    o_index.store("https://git 1234 1@2023-01-02", {11, 13})
+
+    assert len(list(tmp_path.iterdir())) == 2
+    assert o_index.load("https://git 1234 1@2023-01-01") is None
+    assert o_index.load("https://git 1234 1@2023-01-02") == {11, 13}
+    assert o_index.load("https://git 5678 1@2023-01-01") == {21}
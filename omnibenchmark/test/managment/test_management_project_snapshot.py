@@ -0,0 +1,55 @@
+from omnibenchmark.management import project_snapshot as snapshot_module
+from omnibenchmark.management.project_snapshot import project_snapshot, invalidates_snapshot
+import renku.ui.api.models.dataset
+import pytest
+
+
+@pytest.fixture
+def keep_project_context(monkeypatch):
+    monkeypatch.setattr(snapshot_module.project_context, "clear", lambda: None)
+
+
+def test_project_snapshot_loads_once(monkeypatch, mock_api_Dataset, keep_project_context):
+    calls = []
+
+    def mock_list(*args, **kwargs):
+        calls.append(1)
+        return [mock_api_Dataset]
+
+    monkeypatch.setattr(renku.ui.api.models.dataset.Dataset, "list", mock_list)
+    assert project_snapshot.datasets() == [mock_api_Dataset]
+    assert project_snapshot.datasets() == [mock_api_Dataset]
+    assert len(calls) == 1
+
+
+def test_project_snapshot_invalidated_by_writes(monkeypatch, mock_api_Dataset, keep_project_context):
+    calls = []
+
+    def mock_list(*args, **kwargs):
+        calls.append(1)
+        return [mock_api_Dataset]
+
+    @invalidates_snapshot
+    def mock_write():
+        pass
+
+    monkeypatch.setattr(renku.ui.api.models.dataset.Dataset, "list", mock_list)
+    project_snapshot.datasets()
+    mock_write()
+    project_snapshot.datasets()
+    assert len(calls) == 2
+
+
+def test_project_index_keyword_semantics(mock_api_Dataset, mock_api_Dataset_2files):
+    index = snapshot_module.ProjectIndex([mock_api_Dataset, mock_api_Dataset_2files])
+    assert index.datasets_by_keywords(["mock"]) == [mock_api_Dataset, mock_api_Dataset_2files]
+    assert index.datasets_by_keywords("mock_data") == [mock_api_Dataset, mock_api_Dataset_2files]
+    assert index.datasets_by_keywords(["mock_data"]) == []
+
+
+def test_project_index_file_lookup(mock_api_Dataset_2files):
+    index = snapshot_module.ProjectIndex([mock_api_Dataset_2files])
+    assert index.by_slug["mock_dataset"] is mock_api_Dataset_2files
+    assert index.has_file("mock_dataset", "some/path/to/features_file.txt")
+    assert not index.has_file("mock_dataset", "some/path/to/other_file.txt")
+    assert index.by_path["some/path/to/genes_file.txt"] == ["mock_dataset"]
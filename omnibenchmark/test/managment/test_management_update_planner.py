@@ -0,0 +1,112 @@
+from omnibenchmark.management import update_planner
+
+
+def mock_dataset(slug, href):
+    return {"slug": slug, "_links": [{"href": href}]}
+
+
+def mock_info(href):
+    return {"slug": href.split("/")[-1], "identifier": href, "url": href}
+
+
+# merge_filter_slugs
+def test_merge_filter_slugs_intersection():
+    assert update_planner.merge_filter_slugs([["a", "b"], ["b", "c"]]) == ["b"]
+
+
+def test_merge_filter_slugs_none():
+    assert update_planner.merge_filter_slugs([["a", "b"], None]) is None
+
+
+# plan_dataset_updates
+def test_plan_dataset_updates_resolves_shared_datasets_once(monkeypatch):
+    query_res = {
+        "key1": [mock_dataset("d1", "url/d1"), mock_dataset("d2", "url/d2"), mock_dataset("ex", "url/ex")],
+        "key2": [mock_dataset("d2", "url/d2"), mock_dataset("d3", "url/d3")],
+    }
+    resolved = []
+    checked = []
+
+    def mock_query(string, url):
+        return query_res[string]
+
+    def mock_existing(data_json):
+        return (
+            [data for data in data_json if data["slug"] != "ex"],
+            [data for data in data_json if data["slug"] == "ex"],
+        )
+
+    def mock_resolve(refs, data_url, max_workers):
+        resolved.extend(refs)
+        return [mock_info(ref) for ref in refs]
+
+    def mock_check(data_info, **kwargs):
+        checked.append(data_info["identifier"])
+        return None if data_info["slug"] == "d3" else data_info["url"]
+
+    monkeypatch.setattr(update_planner, "query_datasets_by_property", mock_query)
+    monkeypatch.setattr(update_planner, "filter_existing", mock_existing)
+    monkeypatch.setattr(update_planner, "resolve_dataset_infos", mock_resolve)
+    monkeypatch.setattr(update_planner, "check_orchestrator", mock_check)
+    monkeypatch.setattr(update_planner, "get_unchanged_slugs", lambda data_json: set())
+
+    plan = update_planner.plan_dataset_updates(
+        {"key1": None, "key2": ["d1"]}, o_url="some/url"
+    )
+    assert sorted(resolved) == ["url/d1", "url/d2", "url/d3"]
+    assert sorted(checked) == ["url/d1", "url/d2", "url/d3"]
+    assert plan.imports == {"key1": ["url/d1", "url/d2"], "key2": ["url/d2"]}
+    assert plan.updates == {"key1": ["ex"], "key2": []}
+    assert plan.import_urls() == ["url/d1", "url/d2"]
+    assert plan.update_slugs() == ["ex"]
+
+
+def test_plan_dataset_updates_no_datasets(monkeypatch, capsys):
+    monkeypatch.setattr(update_planner, "query_datasets_by_property", lambda string, url: [])
+    monkeypatch.setattr(update_planner, "filter_existing", lambda data_json: ([], []))
+    monkeypatch.setattr(update_planner, "get_unchanged_slugs", lambda data_json: set())
+
+    plan = update_planner.plan_dataset_updates({"mock": None}, o_url="some/url")
+    assert plan.imports == {"mock": []}
+    assert "WARNING:No datasets found with keyword mock" in capsys.readouterr().out
+
+
+# run_update_plan
+def test_run_update_plan_runs_shared_datasets_once(monkeypatch):
+    imported = []
+    updated = []
+    def mock_import(uris):
+        imported.append(uris)
+        failed = {uri: "error" for uri in uris if uri == "url/fail"}
+        return {"imported": [uri for uri in uris if uri not in failed], "failed": failed}
+
+    monkeypatch.setattr(update_planner, "renku_dataset_import_bulk", mock_import)
+    monkeypatch.setattr(update_planner, "renku_dataset_update", lambda slugs: updated.extend(slugs))
+    monkeypatch.setattr(update_planner, "renku_save", lambda: None)
+    monkeypatch.setattr(update_planner, "find_datasets_with_non_matching_keywords", lambda **kwargs: None)
+
+    plan = update_planner.UpdatePlan()
+    plan.add("key1", ["url/d1", "url/d2"], ["ex"])
+    plan.add("key2", ["url/d2", "url/fail", "url/d3"], ["ex"])
+    update_planner.run_update_plan(plan, keywords=["key1"], all=False)
+    update_planner.run_update_plan(plan, keywords=["key1", "key2"])
+    update_planner.run_update_plan(plan, keywords=["key2"])
+    assert imported == [["url/d1"], ["url/d2"], ["url/fail", "url/d3"]]
+    assert plan.imported == {"url/d1", "url/d2", "url/d3"}
+    assert plan.failed == {"url/fail": "error"}
+    assert updated == ["ex"]
+
+
+def test_run_update_plan_skips_unchanged(monkeypatch, capsys):
+    updated = []
+    monkeypatch.setattr(update_planner, "renku_dataset_update", lambda slugs: updated.extend(slugs))
+    monkeypatch.setattr(update_planner, "renku_save", lambda: None)
+    monkeypatch.setattr(update_planner, "find_datasets_with_non_matching_keywords", lambda **kwargs: None)
+
+    plan = update_planner.UpdatePlan()
+    plan.add("key1", [], ["ex", "same"])
+    plan.unchanged = {"same"}
+    assert plan.update_slugs() == ["ex"]
+    update_planner.run_update_plan(plan, keywords=["key1"])
+    assert updated == ["ex"]
+    assert "Dataset same is up to date." in capsys.readouterr().out
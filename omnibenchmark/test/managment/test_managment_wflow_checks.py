@@ -1,7 +1,11 @@
 from omnibenchmark.management import wflow_checks
 from renku.infrastructure.gateway.activity_gateway import ActivityGateway
+from renku.domain_model.provenance.activity import Generation
+from renku.domain_model.entity import Entity
+from renku.infrastructure.gateway.plan_gateway import PlanGateway
 from omnibenchmark.management import general_checks
 import pytest
+import os
 
 ### Test activity_plan_is_valid
 def test_activity_plan_is_valid_no_activity(act_gateway):
@@ -55,16 +59,40 @@ def test_activity_plan_is_valid_valid_activity(mock_activity, monkeypatch, act_g
     )
 
 
+### Test get_generation_index
+def test_get_generation_index_skips_removed_plans(mock_activity, monkeypatch, act_gateway):
+    mock_activity.generations = [
+        Generation(entity=Entity(path="test_output1", checksum="XXX"), id="gen1"),
+        Generation(entity=Entity(path="test_output2", checksum="YYY"), id="gen2"),
+    ]
+    monkeypatch.setattr(
+        ActivityGateway,
+        "get_all_activities",
+        lambda *args, **kwargs: [mock_activity],
+    )
+
+    assert wflow_checks.get_generation_index(act_gateway) == {
+        "test_output1": [mock_activity],
+        "test_output2": [mock_activity],
+    }
+    mock_activity.association.plan.date_removed = "today"
+    assert wflow_checks.get_generation_index(act_gateway) == {}
+
+
 ### Test filter_activity_exist
 def test_filter_activity_exist_gateway_establishment(mock_activity, monkeypatch):
-    def get_mock_activity():
+    mock_activity.generations = [
+        Generation(entity=Entity(path="test_output1", checksum="XXX"), id="gen1"),
+        Generation(entity=Entity(path="test_output2", checksum="YYY"), id="gen2"),
+    ]
+    calls = []
+
+    def get_mock_activity(*args, **kwargs):
+        calls.append(1)
         return [mock_activity]
 
-    monkeypatch.setattr(
-        ActivityGateway,
-        "get_activities_by_generation",
-        lambda *args, **kwargs: get_mock_activity(),
-    )
+    monkeypatch.setattr(ActivityGateway, "get_all_activities", get_mock_activity)
+    monkeypatch.setattr(PlanGateway, "get_all_plans", lambda *args, **kwargs: [])
 
     def get_mock_status():
         return True
@@ -73,10 +101,22 @@ def test_filter_activity_exist_gateway_establishment(mock_activity, monkeypatch)
         general_checks, "is_renku_project", lambda *args, **kwargs: get_mock_status()
     )
 
-    assert wflow_checks.filter_activity_exist(["test_output1", "test_output2"]) == [
+    assert wflow_checks.filter_activity_exist(
+        ["test_output1", "test_output2", "test_output3"]
+    ) == [
         "test_output1",
         "test_output2",
+        None,
     ]
+    assert len(calls) == 1
+
+
+def test_filter_activity_exist_no_project(monkeypatch):
+    monkeypatch.setattr(
+        general_checks, "is_renku_project", lambda *args, **kwargs: False
+    )
+
+    assert wflow_checks.filter_activity_exist(["test_output1"]) == [None]
 
 
 # Test get_all_plans
@@ -149,22 +189,95 @@ def test_find_plan_by_outputs_no_plan():
     assert wflow_checks.find_plan_by_outputs(["test_output"]) == []
 
 
-def test_find_plan_by_outputs_with_plan(monkeypatch, mock_plan):
-    def get_mock_plan():
-        return [mock_plan]
+def test_find_plan_by_outputs_with_plan(monkeypatch, mock_plan, mock_activity):
+    mock_activity.generations = [
+        Generation(entity=Entity(path="test_output", checksum="XXX"), id="gen1")
+    ]
+    monkeypatch.setattr(
+        wflow_checks.plan_index_cache,
+        "get",
+        lambda: wflow_checks.PlanIndex(
+            [mock_plan], {"test_output": [mock_activity]}
+        ),
+    )
+
+    assert wflow_checks.find_plan_by_outputs(["test_output"]) == [mock_plan]
+    assert wflow_checks.find_plan_by_outputs(["other_output"]) == []
+
+
+# Test PlanIndex
+def test_plan_index_lookups(mock_plan, mock_activity):
+    index = wflow_checks.PlanIndex([mock_plan], {"test_output": [mock_activity]})
+    assert index.by_id == {"XXX": mock_plan}
+    assert index.by_output == {"test_output": {"XXX"}}
+    assert index.plans_by_outputs(["test_output", "test_output"]) == [mock_plan]
+    assert index.plans_by_id("XXX") == [mock_plan]
+    assert index.plans_by_id("YYY") == []
+
+
+def test_plan_index_skips_removed_plans(mock_plan, mock_activity):
+    mock_plan.date_removed = "today"
+    index = wflow_checks.PlanIndex([mock_plan], {"test_output": [mock_activity]})
+    assert index.plans_by_outputs(["test_output"]) == []
+    assert index.plans_by_id("XXX") == []
 
-    def mock_plan_id():
-        return ["XXX"]
 
+# Test plan_index_cache
+def test_plan_index_cache_reused_until_invalidated(monkeypatch, mock_plan):
+    calls = []
+
+    def get_mock_plans(*args, **kwargs):
+        calls.append(1)
+        return [mock_plan]
+
+    monkeypatch.setattr(PlanGateway, "get_all_plans", get_mock_plans)
+    monkeypatch.setattr(ActivityGateway, "get_all_activities", lambda *args, **kwargs: [])
     monkeypatch.setattr(
-        wflow_checks, "filter_valid_plans", lambda *args, **kwargs: get_mock_plan()
+        general_checks, "is_renku_project", lambda *args, **kwargs: True
     )
 
+    index = wflow_checks.plan_index_cache.get()
+    assert wflow_checks.plan_index_cache.get() is index
+    assert index.plans == [mock_plan]
+    wflow_checks.invalidates_plan_index(lambda: None)()
+    assert wflow_checks.plan_index_cache.get() is not index
+    assert len(calls) == 2
+
+
+def test_plan_index_cache_rebuilt_after_metadata_change(monkeypatch, mock_plan):
+    calls = []
+    database_key = [(("plans", 1),)]
+
+    def get_mock_plans(*args, **kwargs):
+        calls.append(1)
+        return [mock_plan]
+
+    monkeypatch.setattr(PlanGateway, "get_all_plans", get_mock_plans)
+    monkeypatch.setattr(ActivityGateway, "get_all_activities", lambda *args, **kwargs: [])
     monkeypatch.setattr(
-        wflow_checks, "get_plan_id_from_output", lambda *args, **kwargs: mock_plan_id()
+        general_checks, "is_renku_project", lambda *args, **kwargs: True
     )
-
-    assert wflow_checks.find_plan_by_outputs(["test_output"]) == [mock_plan]
+    monkeypatch.setattr(wflow_checks, "get_database_key", lambda *args, **kwargs: database_key[0])
+
+    index = wflow_checks.plan_index_cache.get()
+    assert wflow_checks.plan_index_cache.get() is index
+    database_key[0] = (("plans", 2),)
+    assert wflow_checks.plan_index_cache.get() is not index
+    assert len(calls) == 2
+
+
+# Test get_database_key
+def test_get_database_key_changes_with_metadata(tmp_path):
+    assert wflow_checks.get_database_key(tmp_path) is None
+    os.makedirs(tmp_path / ".git")
+    os.makedirs(tmp_path / ".renku" / "metadata")
+    plans_file = tmp_path / ".renku" / "metadata" / "plans"
+    plans_file.write_text("{}")
+
+    key = wflow_checks.get_database_key(tmp_path)
+    stat = os.stat(plans_file)
+    os.utime(plans_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000000000))
+    assert wflow_checks.get_database_key(tmp_path) != key
 
 
 # Test check_plan_exist
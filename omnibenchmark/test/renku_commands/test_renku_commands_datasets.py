@@ -79,6 +79,220 @@ def test_renku_dataset_import_works():
     remove_dataset_command().build().execute("test_dataset")
 
 
+### Test import_datasets
+@pytest.fixture
+def git_project(tmp_path):
+    from renku.domain_model.project_context import project_context
+    from renku.infrastructure.repository import Repository
+
+    repository = Repository.initialize(tmp_path)
+    (tmp_path / "tracked.txt").write_text("original")
+    (tmp_path / ".gitattributes").write_text("*.csv filter=lfs\n")
+    repository.add(all=True)
+    repository.run_git_command("-c", "user.name=test", "-c", "user.email=test@test", "commit", "-m", "initial commit")
+    with project_context.with_path(tmp_path):
+        yield tmp_path
+
+
+def test_import_datasets_reports_failures(monkeypatch, git_project):
+    called = []
+
+    def mock_import(uri, **kwargs):
+        called.append(uri)
+        if uri == "fail.url":
+            raise errors.ParameterError("Could not process 'fail.url'.")
+
+    monkeypatch.setattr(ren_datasets, "import_dataset", mock_import)
+
+    report = ren_datasets.import_datasets(uris=["some.url", "fail.url", "other.url"])
+    assert called == ["some.url", "fail.url", "other.url"]
+    assert report["imported"] == ["some.url", "other.url"]
+    assert list(report["failed"].keys()) == ["fail.url"]
+    assert "Could not process" in report["failed"]["fail.url"]
+
+
+def test_import_datasets_undoes_failed_imports(monkeypatch, git_project):
+    def mock_import(uri, **kwargs):
+        slug = uri.split(".")[0]
+        os.makedirs(git_project / "data" / slug)
+        (git_project / "data" / slug / "file.csv").write_text(slug)
+        with open(git_project / ".gitattributes", "a") as f:
+            f.write(f"data/{slug}/** filter=lfs\n")
+        if slug == "fail":
+            (git_project / "tracked.txt").write_text("changed")
+            raise errors.ParameterError("Could not process 'fail.url'.")
+
+    monkeypatch.setattr(ren_datasets, "import_dataset", mock_import)
+
+    report = ren_datasets.import_datasets(uris=["some.url", "fail.url"])
+    assert report["imported"] == ["some.url"]
+    assert (git_project / "data" / "some" / "file.csv").exists()
+    assert not (git_project / "data" / "fail").exists()
+    assert (git_project / "tracked.txt").read_text() == "original"
+    assert (git_project / ".gitattributes").read_text() == "*.csv filter=lfs\ndata/some/** filter=lfs\n"
+
+
+def test_import_datasets_unstages_new_files_of_failed_imports(monkeypatch, git_project):
+    from renku.domain_model.project_context import project_context
+
+    def mock_import(uri, **kwargs):
+        slug = uri.split(".")[0]
+        os.makedirs(git_project / "data" / slug)
+        (git_project / "data" / slug / "file.csv").write_text(slug)
+        project_context.repository.add(f"data/{slug}/file.csv")
+        if slug == "fail":
+            raise errors.ParameterError("Could not tag 'fail.url'.")
+
+    monkeypatch.setattr(ren_datasets, "import_dataset", mock_import)
+
+    report = ren_datasets.import_datasets(uris=["some.url", "fail.url"])
+    staged = project_context.repository.run_git_command("diff", "--cached", "--name-only").splitlines()
+    assert report["imported"] == ["some.url"]
+    assert not (git_project / "data" / "fail").exists()
+    assert staged == ["data/some/file.csv"]
+
+
+def test_import_datasets_restores_metadata_of_failed_imports(monkeypatch, git_project):
+    metadata = git_project / ".renku" / "metadata"
+
+    def mock_import(uri, **kwargs):
+        slug = uri.split(".")[0]
+        os.makedirs(metadata, exist_ok=True)
+        with open(metadata / "datasets", "a") as f:
+            f.write(slug + "\n")
+        (metadata / slug).write_text(slug)
+        if slug == "fail":
+            raise errors.ParameterError("Could not tag 'fail.url'.")
+
+    monkeypatch.setattr(ren_datasets, "import_dataset", mock_import)
+
+    report = ren_datasets.import_datasets(uris=["some.url", "fail.url"])
+    assert report["imported"] == ["some.url"]
+    assert (metadata / "datasets").read_text() == "some\n"
+    assert sorted(os.listdir(metadata)) == ["datasets", "some"]
+
+
+### Test renku_dataset_import_bulk
+def test_renku_dataset_import_bulk_no_project_context(no_project_context):
+
+    with pytest.raises(ProjectError, match=r"Directory is not a renku project*?"):
+        ren_datasets.renku_dataset_import_bulk(uris=["some.url"])
+
+
+def test_renku_dataset_import_bulk_no_uris(monkeypatch):
+    monkeypatch.setattr(
+        omnibenchmark.management.general_checks,
+        "is_renku_project",
+        lambda *args, **kwargs: True,
+    )
+    assert ren_datasets.renku_dataset_import_bulk(uris=[]) == {"imported": [], "failed": {}}
+
+
+def test_renku_dataset_import_bulk_prefetches_several_uris(monkeypatch):
+    monkeypatch.setattr(
+        omnibenchmark.management.general_checks,
+        "is_renku_project",
+        lambda *args, **kwargs: True,
+    )
+    prefetched = []
+    monkeypatch.setattr(
+        ren_datasets,
+        "prefetch_datasets",
+        lambda uris, **kwargs: prefetched.append(uris) or {"prefetched": uris, "failed": {}},
+    )
+
+    class MockCommand:
+        def build(self):
+            return self
+
+        def execute(self, uris, **kwargs):
+            return type("Result", (), {"output": {"imported": uris, "failed": {}}})
+
+    monkeypatch.setattr(ren_datasets, "import_datasets_command", lambda: MockCommand())
+
+    ren_datasets.renku_dataset_import_bulk(uris=["a.url"])
+    assert prefetched == []
+    res = ren_datasets.renku_dataset_import_bulk(uris=["a.url", "b.url", "a.url"])
+    assert prefetched == [["a.url", "b.url"]]
+    assert res == {"imported": ["a.url", "b.url"], "failed": {}}
+    ren_datasets.renku_dataset_import_bulk(uris=["a.url", "b.url"], prefetch=False)
+    assert len(prefetched) == 1
+
+
+### Test prefetch_datasets
+def test_prefetch_datasets_groups_by_source_project(monkeypatch):
+    sources = {
+        "a.url": {"urls": ("ssh://x", "https://x"), "hostname": "host", "files": ["data/a/f1", "data/f"]},
+        "b.url": {"urls": ("ssh://x", "https://x"), "hostname": "host", "files": ["data/f", "data/b/f2"]},
+        "c.url": {"urls": ("https://y",), "hostname": "host", "files": []},
+    }
+    monkeypatch.setattr(ren_datasets, "_resolve_import_source", lambda uri, **kwargs: sources[uri])
+    fetched = {}
+
+    def mock_prefetch(urls, files, **kwargs):
+        fetched[urls] = files
+
+    monkeypatch.setattr(ren_datasets, "_prefetch_repository", mock_prefetch)
+    res = ren_datasets.prefetch_datasets(["a.url", "b.url", "c.url"], project_path="some/path")
+
+    assert res == {"prefetched": ["a.url", "b.url", "c.url"], "failed": {}}
+    assert fetched == {
+        ("ssh://x", "https://x"): ["data/a/f1", "data/f", "data/b/f2"],
+        ("https://y",): [],
+    }
+
+
+def test_prefetch_datasets_records_failures(monkeypatch):
+    def mock_resolve(uri, **kwargs):
+        if uri == "missing.url":
+            raise errors.NotFound("not found")
+        return {"urls": (uri,), "hostname": "host", "files": []}
+
+    def mock_prefetch(urls, files, **kwargs):
+        if urls == ("broken.url",):
+            raise errors.ParameterError("Cannot clone")
+
+    monkeypatch.setattr(ren_datasets, "_resolve_import_source", mock_resolve)
+    monkeypatch.setattr(ren_datasets, "_prefetch_repository", mock_prefetch)
+    res = ren_datasets.prefetch_datasets(
+        ["missing.url", "broken.url", "a.url"], project_path="some/path", max_workers=2
+    )
+
+    assert res["prefetched"] == ["a.url"]
+    assert set(res["failed"].keys()) == {"missing.url", "broken.url"}
+
+
+def test_prefetch_datasets_outside_repository(monkeypatch):
+    monkeypatch.setattr(
+        omnibenchmark.management.general_checks, "find_repository_root", lambda *args, **kwargs: None
+    )
+    res = ren_datasets.prefetch_datasets(["a.url", "b.url"])
+
+    assert res["prefetched"] == []
+    assert set(res["failed"].keys()) == {"a.url", "b.url"}
+
+
+### Test _importer_source
+def test_importer_source_reads_importer():
+    class MockProvider:
+        def _query_knowledge_graph(self, url):
+            return {}
+
+    class MockImporter:
+        _project_url_ssh = "ssh://x"
+        _project_url_http = "https://x"
+        _identifier = "123"
+
+    res = ren_datasets._importer_source(MockProvider(), MockImporter())
+
+    assert res["urls"] == ("ssh://x", "https://x")
+    assert res["identifier"] == "123"
+
+
+def test_importer_source_missing_attributes():
+    assert ren_datasets._importer_source(object(), object()) is None
+
+
 ### Test renku_dataset_update
 def test_renku_dataset_update_no_project_context(no_project_context):
 
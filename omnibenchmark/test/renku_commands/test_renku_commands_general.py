@@ -0,0 +1,75 @@
+from omnibenchmark.renku_commands import general
+import pytest
+
+
+@pytest.fixture
+def mock_saves(monkeypatch):
+    saves = []
+    monkeypatch.setattr(
+        general, "_save", lambda **kwargs: saves.append(("save", kwargs))
+    )
+    monkeypatch.setattr(
+        general, "renku_commit", lambda **kwargs: saves.append(("commit", kwargs))
+    )
+    return saves
+
+
+### Test renku_save
+def test_renku_save_without_session(mock_saves):
+    general.renku_save(message="update")
+    assert mock_saves == [
+        ("save", {"message": "update", "destination": None, "paths": None})
+    ]
+
+
+### Test save_session
+def test_save_session_coalesces_saves(mock_saves):
+    with general.save_session():
+        general.renku_save(message="update 1", paths=["data/a"])
+        general.renku_save(message="update 1", paths=["data/b"])
+        general.renku_save(message="update 2", paths=["data/a"])
+        assert mock_saves == []
+    assert mock_saves == [
+        (
+            "save",
+            {
+                "message": "update 1\nupdate 2",
+                "destination": None,
+                "paths": ["data/a", "data/b"],
+            },
+        )
+    ]
+
+
+def test_save_session_nested(mock_saves):
+    with general.save_session():
+        with general.save_session(push=False):
+            general.renku_save()
+        assert mock_saves == []
+        general.renku_save(paths=["data/a"])
+    assert mock_saves == [("save", {"message": None, "destination": None, "paths": None})]
+
+
+def test_save_session_defer_push(mock_saves):
+    with general.save_session(push=False):
+        general.renku_save(paths=["data/a"])
+    assert mock_saves == [("commit", {"message": None, "paths": ["data/a"]})]
+    general.renku_save()
+    assert mock_saves[-1][0] == "save"
+
+
+def test_save_session_no_saves(mock_saves):
+    with general.save_session():
+        pass
+    assert mock_saves == []
+
+
+def test_save_session_failing_context(mock_saves, capsys):
+    with pytest.raises(RuntimeError):
+        with general.save_session():
+            general.renku_save()
+            raise RuntimeError("failed update")
+    assert mock_saves == []
+    assert "WARNING: Changes of this session were not saved." in capsys.readouterr().out
+    general.renku_save()
+    assert len(mock_saves) == 1
@@ -274,3 +274,39 @@ def test_get_parameter_from_dataset_not_matching_names(
         names=["param4", "param3"], keyword=["mock_param"]
     )
     assert test_join == {}
+
+
+# find_stem
+def brute_force_stem(arr):
+    s = arr[0]
+    res = ""
+    for i in range(len(s)):
+        for j in range(i + 1, len(s) + 1):
+            if len(arr) > 1 and all(s[i:j] in other for other in arr[1:]) and len(s[i:j]) > len(res):
+                res = s[i:j]
+    return res
+
+
+def test_find_stem_works():
+    names = ["sample1_counts_filtered.mtx", "sample2_counts_filtered.mtx", "counts_filtered_sample3.mtx"]
+    assert omni.find_stem(names) == "counts_filtered"
+    assert omni.find_stem(["abc", "xyz"]) == ""
+    assert omni.find_stem(["abc"]) == ""
+    assert omni.find_stem(["", "abc"]) == ""
+
+
+def test_find_stem_first_of_equal_length():
+    assert omni.find_stem(["abxcd", "cdxab"]) == "ab"
+    assert omni.find_stem(["cdxab", "abxcd"]) == "cd"
+
+
+def test_find_stem_matches_brute_force():
+    import random
+
+    rand = random.Random(42)
+    for _ in range(500):
+        arr = [
+            "".join(rand.choice("ab_") for _ in range(rand.randint(0, 10)))
+            for _ in range(rand.randint(1, 4))
+        ]
+        assert omni.find_stem(arr) == brute_force_stem(arr)
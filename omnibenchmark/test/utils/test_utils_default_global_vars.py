@@ -0,0 +1,25 @@
+from omnibenchmark.utils import default_global_vars
+import subprocess
+import sys
+
+import pytest
+
+
+def test_git_url_resolved_lazily():
+    assert default_global_vars.GIT_URL == default_global_vars.get_git_url()
+    assert default_global_vars.GIT_URL.startswith(("http://", "https://"))
+
+
+def test_unknown_attribute():
+    with pytest.raises(AttributeError):
+        default_global_vars.NO_URL
+
+
+def test_package_import_without_renku(tmp_path):
+    code = (
+        "import sys, omnibenchmark\n"
+        "from omnibenchmark.utils import auto_output\n"
+        "assert not any(m.startswith(('renku', 'gitlab', 'networkx')) for m in sys.modules)\n"
+        "assert 'OmniObject' in dir(omnibenchmark)\n"
+    )
+    subprocess.run([sys.executable, "-c", code], cwd=tmp_path, check=True)
@@ -0,0 +1,25 @@
+from omnibenchmark.utils import http_client
+
+
+# Test get_session
+def test_get_session_shared_by_host():
+    session = http_client.get_session("https://mocklab.io/kg/datasets/XXX")
+    assert session is http_client.get_session("https://mocklab.io/kg/projects/YYY")
+    assert session is not http_client.get_session("https://gitlab.mocklab.io/api")
+
+
+# Test configure
+def test_configure_rebuilds_sessions():
+    session = http_client.get_session("https://mocklab.io/kg/datasets/XXX")
+    http_client.configure(pool_size=2, retries=0)
+    new_session = http_client.get_session("https://mocklab.io/kg/datasets/XXX")
+    assert new_session is not session
+    assert new_session.get_adapter("https://mocklab.io").max_retries.total == 0
+    http_client.configure(pool_size=http_client.POOL_SIZE, retries=http_client.RETRIES)
+
+
+# Test get_gitlab
+def test_get_gitlab_cached_with_shared_session():
+    renku_git = http_client.get_gitlab("https://gitlab.mocklab.io")
+    assert renku_git is http_client.get_gitlab("https://gitlab.mocklab.io")
+    assert renku_git.session is http_client.get_session("https://gitlab.mocklab.io")
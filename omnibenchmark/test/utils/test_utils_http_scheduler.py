@@ -0,0 +1,75 @@
+from omnibenchmark.utils import http_scheduler
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import requests
+import time
+
+
+def mock_response(status_code, headers=None):
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers.update(headers or {})
+    return response
+
+
+# Test parse_retry_after
+def test_parse_retry_after_seconds():
+    assert http_scheduler.parse_retry_after("3") == 3.0
+
+
+def test_parse_retry_after_invalid():
+    assert http_scheduler.parse_retry_after("quatsch") is None
+    assert http_scheduler.parse_retry_after(None) is None
+
+
+# Test RequestScheduler
+def test_scheduler_retries_throttled_requests():
+    scheduler = http_scheduler.RequestScheduler(rate=100.0)
+    responses = [mock_response(429, {"Retry-After": "0"}), mock_response(200)]
+
+    response = scheduler.run("https://mocklab.io/kg", lambda: responses.pop(0))
+    stats = scheduler.stats()["mocklab.io"]
+    assert response.status_code == 200
+    assert stats["requests"] == 2
+    assert stats["throttled"] == 1
+    assert stats["queue_depth"] == 0
+
+
+def test_scheduler_returns_throttled_response_for_long_retry_after():
+    scheduler = http_scheduler.RequestScheduler(rate=100.0)
+    responses = [mock_response(429, {"Retry-After": "86400"}), mock_response(200)]
+
+    response = scheduler.run("https://mocklab.io/kg", lambda: responses.pop(0))
+    state = scheduler.get_host("https://mocklab.io/kg")
+    assert response.status_code == 429
+    assert len(responses) == 1
+    assert state.blocked_until - time.monotonic() <= http_scheduler.MAX_BACKOFF
+
+
+def test_scheduler_caps_concurrency_per_host():
+    scheduler = http_scheduler.RequestScheduler(max_concurrency=2, rate=1000.0, burst=1000)
+    lock = threading.Lock()
+    running = [0]
+    max_running = [0]
+
+    def send():
+        with lock:
+            running[0] += 1
+            max_running[0] = max(max_running[0], running[0])
+        time.sleep(0.01)
+        with lock:
+            running[0] -= 1
+        return mock_response(200)
+
+    with ThreadPoolExecutor(max_workers=6) as pool:
+        list(pool.map(lambda _: scheduler.run("https://mocklab.io/kg", send), range(12)))
+    assert max_running[0] <= 2
+    assert scheduler.stats()["mocklab.io"]["requests"] == 12
+
+
+def test_scheduler_rate_limits_after_burst():
+    scheduler = http_scheduler.RequestScheduler(rate=50.0, burst=1)
+    start = time.monotonic()
+    for _ in range(4):
+        scheduler.run("https://mocklab.io/kg", lambda: mock_response(200))
+    assert time.monotonic() - start >= 0.05
@@ -0,0 +1,64 @@
+from omnibenchmark.utils import http_client, http_transport
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import threading
+import requests
+import pytest
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        content = ('{"path": "' + self.path + '"}').encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stand_in_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), MockHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield "http://127.0.0.1:" + str(server.server_address[1])
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def reset_transport():
+    yield
+    http_client.configure(transport="live", base_urls={})
+
+
+# Test rewrite_url
+def test_rewrite_url_matching_base():
+    base_urls = {"https://mocklab.io": "http://localhost:8000"}
+    assert http_transport.rewrite_url("https://mocklab.io/kg/datasets", base_urls) == "http://localhost:8000/kg/datasets"
+    assert http_transport.rewrite_url("https://other.io/kg", base_urls) == "https://other.io/kg"
+
+
+# Test RecordReplayAdapter
+def test_record_replay_adapter_unknown_mode():
+    with pytest.raises(ValueError):
+        http_transport.RecordReplayAdapter(mode="quatsch")
+
+
+def test_record_then_replay(stand_in_server, reset_transport, tmp_path):
+    http_client.configure(
+        transport="record",
+        fixture_dir=str(tmp_path),
+        base_urls={"https://mocklab.io": stand_in_server},
+    )
+    recorded = http_client.get("https://mocklab.io/kg/datasets", params={"page": 1})
+    assert recorded.json() == {"path": "/kg/datasets?page=1"}
+
+    http_client.configure(transport="replay", base_urls={})
+    replayed = http_client.get("https://mocklab.io/kg/datasets", params={"page": 1})
+    assert replayed.json() == recorded.json()
+    assert replayed.headers["Content-Type"] == "application/json"
+    with pytest.raises(requests.ConnectionError):
+        http_client.get("https://mocklab.io/kg/datasets", params={"page": 2})
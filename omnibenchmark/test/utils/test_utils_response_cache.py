@@ -0,0 +1,79 @@
+from omnibenchmark.utils.local_cache.response_cache import ResponseCache, get_endpoint
+import requests
+import pytest
+
+KG_DATA_URL = "https://mocklab.io/knowledge-graph/datasets/XXX"
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ResponseCache(cache_dir=str(tmp_path / "responses"))
+
+
+@pytest.fixture
+def mock_send():
+    calls = []
+
+    def send(headers):
+        calls.append(headers)
+        response = requests.Response()
+        response.status_code = 304 if "If-None-Match" in headers else 200
+        response.headers["ETag"] = '"v1"'
+        response._content = b'{"slug": "mock_dataset"}'
+        return response
+
+    send.calls = calls  # type:ignore
+    return send
+
+
+# Test get_endpoint
+def test_get_endpoint_kg_urls():
+    assert get_endpoint(KG_DATA_URL) == "datasets"
+    assert get_endpoint("https://mocklab.io/knowledge-graph/entities?query=mock") == "entities"
+    assert get_endpoint("https://mocklab.io/knowledge-graph/projects/a/b/files/c/lineage") == "lineage"
+    assert get_endpoint("https://raw.githubusercontent.com/some/file.json") is None
+
+
+# Test fetch
+def test_fetch_serves_fresh_entries_from_disk(cache, mock_send):
+    cache.fetch(KG_DATA_URL, None, mock_send)
+    response = cache.fetch(KG_DATA_URL, None, mock_send)
+    assert response.json() == {"slug": "mock_dataset"}
+    assert len(mock_send.calls) == 1
+
+
+def test_fetch_revalidates_stale_entries(cache, mock_send):
+    cache.ttls["datasets"] = 0
+    cache.fetch(KG_DATA_URL, None, mock_send)
+    response = cache.fetch(KG_DATA_URL, None, mock_send)
+    assert mock_send.calls[1] == {"If-None-Match": '"v1"'}
+    assert response.status_code == 200
+    assert response.json() == {"slug": "mock_dataset"}
+
+
+def test_fetch_refreshing_revalidates(cache, mock_send):
+    cache.fetch(KG_DATA_URL, None, mock_send)
+    with cache.refreshing():
+        cache.fetch(KG_DATA_URL, None, mock_send)
+    assert len(mock_send.calls) == 2
+
+
+def test_fetch_offline_serves_stale_entries_only(cache, mock_send):
+    cache.ttls["datasets"] = 0
+    cache.fetch(KG_DATA_URL, None, mock_send)
+    with cache.offline_mode():
+        response = cache.fetch(KG_DATA_URL, None, mock_send)
+        missing = cache.fetch(KG_DATA_URL + "YYY", None, mock_send)
+    assert len(mock_send.calls) == 1
+    assert response.json() == {"slug": "mock_dataset"}
+    assert missing.status_code == 504
+    assert missing.json() == {}
+    assert cache.misses == [KG_DATA_URL + "YYY"]
+    assert not cache.offline
+
+
+# Test evict
+def test_evict_least_recently_used(cache, mock_send):
+    cache.max_size = 1
+    cache.fetch(KG_DATA_URL, None, mock_send)
+    assert len(list(cache.entries())) == 0
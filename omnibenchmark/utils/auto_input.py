@@ -1,11 +1,10 @@
 """Functions to facilitate automatic input generation from file/object, usually config.yaml"""
 
-from typing import Dict, Mapping, List, Optional, Union
+from typing import Dict, Mapping, List, Optional, Set, Union
 from omnibenchmark.utils.exceptions import ParameterError
 from collections import defaultdict
-from renku.ui.api.models.dataset import Dataset
+from omnibenchmark.management.project_snapshot import project_snapshot
 from omnibenchmark.renku_commands import renku_api
-from renku.domain_model.project_context import project_context
 from difflib import SequenceMatcher
 import hashlib
 import re
@@ -13,42 +12,50 @@ import os
 import json
 
 
-def find_stem(arr):
-    """Find a common substring from a list of strings
+def common_substrings(arr: List[str], length: int) -> Set[str]:
+    """Get all substrings of a certain length that are part of every string of a list
 
     Args:
-        arr (Array): Array of strings
+        arr (List[str]): List of strings
+        length (int): Substring length
 
     Returns:
-        str: longest common substring
+        Set[str]: Common substrings
     """
-    n = len(arr)
-    # Take first word from array
-    # as reference
     s = arr[0]
-    len_s = len(s)
-    res = ""
-    for i in range(len_s):
-        for j in range(i + 1, len_s + 1):
+    common = {s[i:i + length] for i in range(len(s) - length + 1)}
+    for other in sorted(arr[1:], key=len):
+        if len(common) < 1:
+            break
+        common &= {other[i:i + length] for i in range(len(other) - length + 1)}
+    return common
 
-            # generating all possible substrings
-            # of our reference string arr[0] i.e s
-            stem = s[i:j]
-            k = 1
-            for k in range(1, n):
 
-                # Check if the generated stem is
-                # common to all words
-                if stem not in arr[k]:
-                    break
+def find_stem(arr):
+    """Find a common substring from a list of strings.
+       Binary search over the substring length, as every substring of a common substring is common as well.
 
-                # If current substring is present in
-                # all strings and its length is greater
-                # than current result
-                if k + 1 == n and len(res) < len(stem):
-                    res = stem
+    Args:
+        arr (Array): Array of strings
 
-    return res
+    Returns:
+        str: longest common substring, the first one in arr[0] if there are several
+    """
+    s = arr[0]
+    if len(arr) < 2:
+        return ""
+    low, high = 0, min(len(name) for name in arr)
+    stems: Set[str] = set()
+    while low < high:
+        mid = (low + high + 1) // 2
+        common = common_substrings(arr, mid)
+        if len(common) > 0:
+            low, stems = mid, common
+        else:
+            high = mid - 1
+    if low < 1:
+        return ""
+    return next(s[i:i + low] for i in range(len(s) - low + 1) if s[i:i + low] in stems)
 
 
 def best_match_name_seq(map_dict: Mapping[str, str]) -> str:
@@ -274,14 +281,8 @@ def get_input_files_from_prefix(
         Mapping[str, Mapping]: Input file types with their corresponding files.
     """
     input_files: Dict = {}
-    project_context.clear()
-    datasets = Dataset.list()
     #datasets = renku_api.renku_dataset_list()
-    key_data = [
-        dataset
-        for dataset in datasets
-        if any(key in keyword for key in dataset.keywords)
-    ]
+    key_data = project_snapshot.index().datasets_by_keywords(keyword)
     if multi_data_matching:
         all_fi = [data.files for data in key_data]
         all_files = [item for sublist in all_fi for item in sublist]
@@ -353,13 +354,7 @@ def get_parameter_from_dataset(
     """
     values: Dict = {}
     #datasets = renku_api.renku_dataset_list()
-    project_context.clear()
-    datasets = Dataset.list()
-    key_data = [
-        dataset
-        for dataset in datasets
-        if any(key in keyword for key in dataset.keywords)
-    ]
+    key_data = project_snapshot.index().datasets_by_keywords(keyword)
     for data in key_data:
         if not len(data.files) == 1:
             raise ParameterError(
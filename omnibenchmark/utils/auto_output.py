@@ -1,13 +1,16 @@
-from typing import Mapping, Optional, List, Union, Callable, Any
+from __future__ import annotations
+from typing import TYPE_CHECKING, Mapping, Optional, List, Union, Callable, Any
 from string import Template
 import itertools
 import json
 
-from omnibenchmark.core.input_classes import OmniInput, OmniParameter, OutMapping
 from omnibenchmark.utils.decorators import option_list, option_str
 from omnibenchmark.utils.user_input_checks import empty_object_to_none
 from omnibenchmark.management.parameter_checks import dict_values_to_str
 
+if TYPE_CHECKING:
+    from omnibenchmark.core.input_classes import OmniInput, OmniParameter, OutMapping
+
 
 def join_parameter(
     parameter: Optional[Mapping[str, str]] = None, sort_keys: bool = True
@@ -138,11 +138,12 @@ def get_file_mapping_from_out_files(
         List[OutMapping]: A List of OutMappings.
     """
     try:
+        out_set = set(out_files)
         map_list = [
             mapping
             for mapping in file_mapping  # type:ignore
             if any(
-                out_file in out_files
+                out_file in out_set
                 for out_file in list(mapping["output_files"].values())  # type:ignore
             )
         ]
@@ -1,8 +1,8 @@
-import gitlab
 from gitlab.v4.objects.pipelines import ProjectPipeline
 from gitlab.v4.objects.projects import Project
 from omnibenchmark.management.data_commands import get_project_info_from_url
-from omnibenchmark.utils.default_global_vars import GIT_URL
+from omnibenchmark.utils.default_global_vars import get_git_url
+from omnibenchmark.utils import http_client
 from typing import List, Optional
 import base64
 import yaml
@@ -10,7 +10,7 @@ import yaml
 
 def get_orchestrator_projects_from_cicd_yaml(
     o_url: str,
-    gitlab_url: str = GIT_URL,
+    gitlab_url: Optional[str] = None,
     target_branches: List[str] = ["master", "main"],
     exclude_stages: List[str] = ["build"],
 ) -> List[str]:
@@ -26,7 +26,7 @@ def get_orchestrator_projects_from_cicd_yaml(
         List[str]: Project urls associated to the
     """
     o_info = get_project_info_from_url(o_url)
-    renku_git = gitlab.Gitlab(gitlab_url)
+    renku_git = http_client.get_gitlab(get_git_url() if gitlab_url is None else gitlab_url)
     o_git = renku_git.projects.get(o_info["identifier"])
     bs = o_git.branches.list()
     br = [b.name for b in bs if b.name in target_branches][0]
@@ -47,7 +47,7 @@ def get_orchestrator_projects_from_cicd_yaml(
 
 
 def get_project_infos(
-    p_url: str, gitlab_url: str = GIT_URL
+    p_url: str, gitlab_url: Optional[str] = None
 ) -> Optional[Project]:
     """Get project info from url
 
@@ -62,7 +62,7 @@ def get_project_infos(
     if "message" in p_info.keys():
         print(f"Warning: Could not find project {p_url}")
         return None
-    renku_git = gitlab.Gitlab(gitlab_url)
+    renku_git = http_client.get_gitlab(get_git_url() if gitlab_url is None else gitlab_url)
     return renku_git.projects.get(p_info["identifier"])
 
 
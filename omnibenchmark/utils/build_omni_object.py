@@ -12,7 +12,7 @@ from os import PathLike
 from typing import Any, Optional, List, Union
 from omnibenchmark.utils.decorators import option_dict_none, option_dict_list
 from omnibenchmark.utils.user_input_checks import flatten, empty_object_to_none
-from omnibenchmark.utils.default_global_vars import KG_URL, GIT_URL, DATA_QUERY_URL, DATA_URL, BENCH_URL
+from omnibenchmark.utils.default_global_vars import KG_URL, DATA_QUERY_URL, DATA_URL, BENCH_URL, get_git_url
 import logging
 from typeguard import check_type
 
@@ -333,7 +333,7 @@ def build_omni_object_from_config(config: ConfigDict) -> OmniObject:
     obj_kg_url = KG_URL if config_url.get("kg_url") is None else config_url.get("kg_url")
     obj_data_query_url = DATA_QUERY_URL if config_url.get("data_query_url") is None else config_url.get("data_query_url")
     obj_data_url = DATA_URL if config_url.get("data_url") is None else config_url.get("data_url")
-    obj_git_url = GIT_URL if config_url.get("git_url") is None else config_url.get("git_url")
+    obj_git_url = get_git_url() if config_url.get("git_url") is None else config_url.get("git_url")
     obj_bench_url = BENCH_URL if config_url.get("bench_url") is None else config_url.get("bench_url")
 
     omni_object = OmniObject(
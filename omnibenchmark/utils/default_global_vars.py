@@ -1,15 +1,31 @@
 """Default settings"""
 
-
-from renku.api import Project
-from renku.core.util.git import get_remote, parse_git_url
-
-remote_url = get_remote(Project().repository).url
-remote_git = parse_git_url(remote_url)
+import functools
 
 KG_URL = "https://renkulab.io/knowledge-graph"
 DATA_URL = KG_URL + "/datasets/"
 DATA_QUERY_URL = KG_URL + "/entities?query="
-GIT_URL =  remote_git.scheme + "://" + remote_git.hostname
 ESS_URL = "https://raw.githubusercontent.com/omnibenchmark/omni_essentials/"
-BENCH_URL = ESS_URL + "main/general/benchmark_categories.json?inline=false"
\ No newline at end of file
+BENCH_URL = ESS_URL + "main/general/benchmark_categories.json?inline=false"
+
+
+@functools.lru_cache(maxsize=None)
+def get_git_url() -> str:
+    """Get the general gitlab url from the remote of the current project.
+       Resolved on first use, as it needs a git repository with a remote.
+
+    Returns:
+        str: Gitlab url, e.g. https://gitlab.renkulab.io
+    """
+    from renku.api import Project
+    from renku.core.util.git import get_remote, parse_git_url
+
+    remote_url = get_remote(Project().repository).url
+    remote_git = parse_git_url(remote_url)
+    return remote_git.scheme + "://" + remote_git.hostname
+
+
+def __getattr__(name: str):
+    if name == "GIT_URL":
+        return get_git_url()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,197 @@
+"""Shared http sessions and gitlab clients for all knowledge graph, gitlab and essentials requests"""
+
+from typing import Any, Dict, Mapping, Optional
+from urllib.parse import urlparse
+from urllib3.util.retry import Retry
+from omnibenchmark.utils.local_cache.response_cache import response_cache
+from omnibenchmark.utils.local_cache.config import (
+    http_transport_mode,
+    http_fixture_dir,
+    http_base_urls,
+)
+from omnibenchmark.utils.http_transport import RecordReplayAdapter
+from omnibenchmark.utils.http_scheduler import request_scheduler
+import threading
+import requests
+import gitlab
+
+# Default client settings
+POOL_SIZE = 16
+TIMEOUT = 30.0
+RETRIES = 3
+BACKOFF = 0.5
+RETRY_STATUS = (500, 502, 503, 504)
+
+_settings: Dict[str, Any] = {
+    "pool_size": POOL_SIZE,
+    "timeout": TIMEOUT,
+    "retries": RETRIES,
+    "backoff": BACKOFF,
+    "transport": http_transport_mode,
+    "fixture_dir": http_fixture_dir,
+    "base_urls": http_base_urls,
+}
+_sessions: Dict[str, requests.Session] = {}
+_gitlab_clients: Dict[str, gitlab.Gitlab] = {}
+_lock = threading.Lock()
+
+
+def configure(
+    pool_size: Optional[int] = None,
+    timeout: Optional[float] = None,
+    retries: Optional[int] = None,
+    backoff: Optional[float] = None,
+    transport: Optional[str] = None,
+    fixture_dir: Optional[str] = None,
+    base_urls: Optional[Mapping[str, str]] = None,
+    host_concurrency: Optional[int] = None,
+    host_rate: Optional[float] = None,
+    host_limits: Optional[Mapping[str, Mapping[str, Any]]] = None,
+):
+    """Change the settings of all shared sessions. Existing sessions are closed and rebuilt on next use.
+
+    Args:
+        pool_size (Optional[int], optional): Number of keep-alive connections per host. Defaults to None.
+        timeout (Optional[float], optional): Timeout in seconds for a single request. Defaults to None.
+        retries (Optional[int], optional): Number of retries on connection errors and server errors. Defaults to None.
+        backoff (Optional[float], optional): Backoff factor in seconds between retries. Defaults to None.
+        transport (Optional[str], optional): "live", "record" or "replay". Defaults to None.
+        fixture_dir (Optional[str], optional): Directory to record responses to and replay them from. Defaults to None.
+        base_urls (Optional[Mapping[str, str]], optional): Base urls to redirect, e.g. to a local stand-in server.
+                                                          Defaults to None.
+        host_concurrency (Optional[int], optional): Maximal number of parallel requests per host. Defaults to None.
+        host_rate (Optional[float], optional): Maximal number of requests per second and host. Defaults to None.
+        host_limits (Optional[Mapping[str, Mapping[str, Any]]], optional): Concurrency and rate limits of specific hosts.
+                                                                          Defaults to None.
+    """
+    new_settings = {
+        "pool_size": pool_size,
+        "timeout": timeout,
+        "retries": retries,
+        "backoff": backoff,
+        "transport": transport,
+        "fixture_dir": fixture_dir,
+        "base_urls": base_urls,
+    }
+    _settings.update({key: val for key, val in new_settings.items() if val is not None})
+    request_scheduler.configure(
+        max_concurrency=host_concurrency, rate=host_rate, host_limits=host_limits
+    )
+    close_all()
+
+
+def get_base_url(url: str) -> str:
+    """Get the scheme and host part of an url, e.g. https://renkulab.io
+
+    Args:
+        url (str): Any url
+
+    Returns:
+        str: Base url that sessions are shared by
+    """
+    parsed_url = urlparse(url)
+    return parsed_url.scheme + "://" + parsed_url.netloc
+
+
+def new_session() -> requests.Session:
+    """Build a keep-alive session with connection pooling, retries and the record/replay transport according to the current settings
+
+    Returns:
+        requests.Session: A new session
+    """
+    retry = Retry(
+        total=_settings["retries"],
+        backoff_factor=_settings["backoff"],
+        status_forcelist=RETRY_STATUS,
+        allowed_methods=frozenset(["GET", "HEAD"]),
+        raise_on_status=False,
+    )
+    adapter = RecordReplayAdapter(
+        mode=_settings["transport"],
+        fixture_dir=_settings["fixture_dir"],
+        base_urls=_settings["base_urls"],
+        scheduler=request_scheduler,
+        pool_connections=_settings["pool_size"],
+        pool_maxsize=_settings["pool_size"],
+        max_retries=retry,
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_session(url: str) -> requests.Session:
+    """Get the shared session for the host of an url
+
+    Args:
+        url (str): Url that will be requested with the session
+
+    Returns:
+        requests.Session: Shared session for that host
+    """
+    base_url = get_base_url(url)
+    with _lock:
+        if base_url not in _sessions:
+            _sessions[base_url] = new_session()
+        return _sessions[base_url]
+
+
+def get(url: str, params: Optional[Dict[str, Any]] = None, **kwargs) -> requests.Response:
+    """Send a GET request through the shared session of the urls host.
+       Knowledge graph responses are served from and stored in the local response cache.
+
+    Args:
+        url (str): Url to request
+        params (Optional[Dict[str, Any]], optional): Query parameter. Defaults to None.
+
+    Returns:
+        requests.Response: Response to the request
+    """
+    kwargs.setdefault("timeout", _settings["timeout"])
+    headers = kwargs.pop("headers", {})
+    session = get_session(url)
+
+    def send(cache_headers: Mapping[str, str]) -> requests.Response:
+        return session.get(url, params=params, headers={**headers, **cache_headers}, **kwargs)
+
+    return response_cache.fetch(url, params, send)
+
+
+def get_gitlab(gitlab_url: str) -> gitlab.Gitlab:
+    """Get a cached gitlab client that uses the shared session of the gitlab host.
+       Retries are handled by the session, not by the gitlab client.
+
+    Args:
+        gitlab_url (str): Gitlab url
+
+    Returns:
+        gitlab.Gitlab: Gitlab API client
+    """
+    session = get_session(gitlab_url)
+    with _lock:
+        if gitlab_url not in _gitlab_clients:
+            _gitlab_clients[gitlab_url] = gitlab.Gitlab(
+                gitlab_url,
+                session=session,
+                timeout=_settings["timeout"],
+            )
+        return _gitlab_clients[gitlab_url]
+
+
+def get_stats() -> Dict[str, Dict[str, Any]]:
+    """Get queue depth, latency and throttling stats of all requests per host
+
+    Returns:
+        Dict[str, Dict[str, Any]]: Stats per host
+    """
+    return request_scheduler.stats()
+
+
+def close_all():
+    """Close all shared sessions and drop the cached gitlab clients"""
+    with _lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
+        _gitlab_clients.clear()
@@ -0,0 +1,245 @@
+"""Per host scheduling of outgoing requests with concurrency caps, token bucket rate limits and adaptive backoff"""
+
+from typing import Any, Callable, Dict, Mapping, Optional
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+import threading
+import requests
+import time
+
+# Default scheduler settings per host
+MAX_CONCURRENCY = 8
+RATE = 20.0
+BURST = 20
+MIN_RATE = 0.5
+BACKOFF = 1.0
+MAX_BACKOFF = 60.0
+THROTTLE_RETRIES = 3
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header into seconds
+
+    Args:
+        value (Optional[str]): Header value, either seconds or a http date
+
+    Returns:
+        Optional[float]: Seconds to wait, if the header could be parsed
+    """
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class HostState:
+    """Limits, token bucket and stats of one host"""
+
+    def __init__(self, max_concurrency: int, rate: float, burst: int):
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.last_refill = time.monotonic()
+        self.blocked_until = 0.0
+        self.backoff = BACKOFF
+        self.semaphore = threading.BoundedSemaphore(max_concurrency)
+        self.lock = threading.Lock()
+        self.waiting = 0
+        self.in_flight = 0
+        self.requests = 0
+        self.throttled = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+
+    def refill(self, now: float):
+        self.tokens = min(self.burst, self.tokens + (now - self.last_refill) * self.rate)
+        self.last_refill = now
+
+
+class RequestScheduler:
+    """Scheduler every outgoing request of the shared http sessions goes through"""
+
+    def __init__(
+        self,
+        max_concurrency: int = MAX_CONCURRENCY,
+        rate: float = RATE,
+        burst: int = BURST,
+        host_limits: Optional[Mapping[str, Mapping[str, Any]]] = None,
+    ):
+        """Scheduler with per host concurrency caps and rate limits.
+           Throttled requests (429) are retried after their Retry-After time and reduce the hosts rate,
+           which recovers with every successful request.
+
+        Args:
+            max_concurrency (int, optional): Maximal number of parallel requests per host. Defaults to 8.
+            rate (float, optional): Maximal number of requests per second and host. Defaults to 20.
+            burst (int, optional): Number of requests a host can get at once after being idle. Defaults to 20.
+            host_limits (Optional[Mapping[str, Mapping[str, Any]]], optional): Limits for specific hosts (e.g., {"renkulab.io": {"rate": 5}}).
+                                                                               Defaults to None.
+        """
+        self.max_concurrency = max_concurrency
+        self.rate = rate
+        self.burst = burst
+        self.host_limits = dict(host_limits) if host_limits is not None else {}
+        self._hosts: Dict[str, HostState] = {}
+        self._lock = threading.Lock()
+
+    def configure(
+        self,
+        max_concurrency: Optional[int] = None,
+        rate: Optional[float] = None,
+        burst: Optional[int] = None,
+        host_limits: Optional[Mapping[str, Mapping[str, Any]]] = None,
+    ):
+        """Change the scheduler limits. Stats and host states are reset.
+
+        Args:
+            max_concurrency (Optional[int], optional): Maximal number of parallel requests per host. Defaults to None.
+            rate (Optional[float], optional): Maximal number of requests per second and host. Defaults to None.
+            burst (Optional[int], optional): Number of requests a host can get at once after being idle. Defaults to None.
+            host_limits (Optional[Mapping[str, Mapping[str, Any]]], optional): Limits for specific hosts. Defaults to None.
+        """
+        with self._lock:
+            if max_concurrency is not None:
+                self.max_concurrency = max_concurrency
+            if rate is not None:
+                self.rate = rate
+            if burst is not None:
+                self.burst = burst
+            if host_limits is not None:
+                self.host_limits = dict(host_limits)
+            self._hosts.clear()
+
+    def get_host(self, url: str) -> HostState:
+        """Get the state of the host an url belongs to
+
+        Args:
+            url (str): Requested url
+
+        Returns:
+            HostState: Limits, token bucket and stats of the host
+        """
+        host = urlparse(url).netloc
+        with self._lock:
+            if host not in self._hosts:
+                limits = self.host_limits.get(host, {})
+                self._hosts[host] = HostState(
+                    max_concurrency=limits.get("max_concurrency", self.max_concurrency),
+                    rate=limits.get("rate", self.rate),
+                    burst=limits.get("burst", self.burst),
+                )
+            return self._hosts[host]
+
+    def acquire(self, state: HostState):
+        """Wait for a free slot and a token of a host
+
+        Args:
+            state (HostState): Host to send a request to
+        """
+        with state.lock:
+            state.waiting += 1
+        state.semaphore.acquire()
+        while True:
+            with state.lock:
+                now = time.monotonic()
+                state.refill(now)
+                wait = state.blocked_until - now
+                if wait <= 0:
+                    if state.tokens >= 1:
+                        state.tokens -= 1
+                        state.waiting -= 1
+                        state.in_flight += 1
+                        return
+                    wait = (1 - state.tokens) / state.rate
+            time.sleep(wait)
+
+    def release(self, state: HostState, latency: float, response: Optional[requests.Response]) -> Optional[float]:
+        """Free a hosts slot and adapt its rate to the response
+
+        Args:
+            state (HostState): Host the request was sent to
+            latency (float): Request latency in seconds
+            response (Optional[requests.Response]): Response, None if the request failed
+
+        Returns:
+            Optional[float]: Seconds until the host accepts requests again, if the request was throttled
+                             and the server asks for a wait of at most MAX_BACKOFF seconds
+        """
+        delay = None
+        with state.lock:
+            state.in_flight -= 1
+            state.requests += 1
+            state.total_latency += latency
+            state.max_latency = max(state.max_latency, latency)
+            if response is not None and response.status_code == 429:
+                state.throttled += 1
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                wait = retry_after if retry_after is not None else state.backoff
+                if wait <= MAX_BACKOFF:
+                    delay = wait
+                state.backoff = min(MAX_BACKOFF, state.backoff * 2)
+                state.rate = max(MIN_RATE, state.rate / 2)
+                state.blocked_until = max(state.blocked_until, time.monotonic() + min(wait, MAX_BACKOFF))
+            elif response is not None:
+                state.backoff = BACKOFF
+                state.rate = min(state.max_rate, state.rate + state.max_rate / 10)
+        state.semaphore.release()
+        return delay
+
+    def run(self, url: str, send: Callable[[], requests.Response]) -> requests.Response:
+        """Send a request within the limits of its host. Throttled requests are retried,
+           unless the server asks to wait longer than MAX_BACKOFF seconds, then the 429 response is returned.
+
+        Args:
+            url (str): Requested url
+            send (Callable[[], requests.Response]): Function sending the request
+
+        Returns:
+            requests.Response: Response to the request
+        """
+        state = self.get_host(url)
+        for attempt in range(THROTTLE_RETRIES + 1):
+            self.acquire(state)
+            start = time.monotonic()
+            response = None
+            try:
+                response = send()
+            finally:
+                delay = self.release(state, time.monotonic() - start, response)
+            if delay is None or attempt == THROTTLE_RETRIES:
+                break
+            if response.raw is not None:  # type:ignore
+                response.close()  # type:ignore
+        return response  # type:ignore
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get queue depth, latency and throttling stats per host
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Stats per host
+        """
+        with self._lock:
+            hosts = dict(self._hosts)
+        stats = {}
+        for host, state in hosts.items():
+            with state.lock:
+                stats[host] = {
+                    "queue_depth": state.waiting,
+                    "in_flight": state.in_flight,
+                    "requests": state.requests,
+                    "throttled": state.throttled,
+                    "mean_latency": state.total_latency / state.requests if state.requests > 0 else 0.0,
+                    "max_latency": state.max_latency,
+                    "rate": state.rate,
+                }
+        return stats
+
+
+request_scheduler = RequestScheduler()
@@ -0,0 +1,165 @@
+"""Record/replay transport for all requests sent through the shared http sessions"""
+
+from typing import Any, Dict, Mapping, Optional
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+from omnibenchmark.utils.http_scheduler import RequestScheduler
+import threading
+import requests
+import hashlib
+import base64
+import json
+import os
+
+TRANSPORT_MODES = ("live", "record", "replay")
+
+
+def rewrite_url(url: str, base_urls: Mapping[str, str]) -> str:
+    """Redirect an url to another base url, e.g. to a local stand-in server
+
+    Args:
+        url (str): Requested url
+        base_urls (Mapping[str, str]): Base urls to redirect and their replacement
+
+    Returns:
+        str: Redirected url or the original one, if no base url matches
+    """
+    for base_url, new_base in base_urls.items():
+        if url.startswith(base_url):
+            return new_base + url[len(base_url):]
+    return url
+
+
+def get_fixture_key(request: requests.PreparedRequest) -> str:
+    """Get the key a request is recorded by: method, url and a hash of its body
+
+    Args:
+        request (requests.PreparedRequest): Request to record or replay
+
+    Returns:
+        str: Fixture key
+    """
+    body = request.body or b""
+    if isinstance(body, str):
+        body = body.encode("utf-8")
+    body_hash = hashlib.sha256(body).hexdigest() if body else ""  # type:ignore
+    return " ".join([str(request.method), str(request.url), body_hash])
+
+
+class RecordReplayAdapter(HTTPAdapter):
+    """Transport adapter that records responses into a fixture store or replays them from it"""
+
+    def __init__(
+        self,
+        mode: str = "live",
+        fixture_dir: Optional[str] = None,
+        base_urls: Optional[Mapping[str, str]] = None,
+        scheduler: Optional[RequestScheduler] = None,
+        **kwargs,
+    ):
+        """Transport adapter to record and replay responses.
+
+        Args:
+            mode (str, optional): "live" to send requests, "record" to send and store them,
+                                  "replay" to only serve stored responses. Defaults to "live".
+            fixture_dir (Optional[str], optional): Directory of the fixture store. Required to record or replay.
+            base_urls (Optional[Mapping[str, str]], optional): Base urls to redirect and their replacement. Defaults to None.
+            scheduler (Optional[RequestScheduler], optional): Scheduler to send requests through. Defaults to None.
+        """
+        if mode not in TRANSPORT_MODES:
+            raise ValueError(f"Unknown transport mode {mode}. Choose one of {TRANSPORT_MODES}.")
+        if mode != "live" and fixture_dir is None:
+            raise ValueError(f"A fixture directory is required to {mode} responses.")
+        super().__init__(**kwargs)
+        self.mode = mode
+        self.fixture_dir = fixture_dir
+        self.base_urls = dict(base_urls) if base_urls is not None else {}
+        self.scheduler = scheduler
+        self._lock = threading.Lock()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.fixture_dir, hashlib.sha256(key.encode()).hexdigest() + ".json")  # type:ignore
+
+    def load(self, key: str) -> Optional[Dict[str, Any]]:
+        """Load a recorded response
+
+        Args:
+            key (str): Fixture key
+
+        Returns:
+            Optional[Dict[str, Any]]: Recorded response, if it exists
+        """
+        try:
+            with open(self._path(key)) as f:
+                fixture = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return fixture if fixture.get("key") == key else None
+
+    def store(self, key: str, response: requests.Response):
+        """Record a response in the fixture store
+
+        Args:
+            key (str): Fixture key
+            response (requests.Response): Response to record
+        """
+        fixture = {
+            "key": key,
+            "status_code": response.status_code,
+            "reason": response.reason,
+            "headers": dict(response.headers),
+            "content": base64.b64encode(response.content).decode("ascii"),
+        }
+        os.makedirs(self.fixture_dir, exist_ok=True)  # type:ignore
+        path = self._path(key)
+        tmp_path = path + "." + str(threading.get_ident()) + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(fixture, f)
+        with self._lock:
+            os.replace(tmp_path, path)
+
+    def replay(self, request: requests.PreparedRequest, fixture: Mapping[str, Any]) -> requests.Response:
+        """Build a response object from a recorded response
+
+        Args:
+            request (requests.PreparedRequest): Request that is answered
+            fixture (Mapping[str, Any]): Recorded response
+
+        Returns:
+            requests.Response: Response with the recorded status, headers and content
+        """
+        response = requests.Response()
+        response.status_code = fixture["status_code"]
+        response.reason = fixture["reason"]
+        response.headers = CaseInsensitiveDict(fixture["headers"])
+        response.encoding = get_encoding_from_headers(response.headers)
+        response._content = base64.b64decode(fixture["content"])
+        response.url = request.url  # type:ignore
+        response.request = request
+        response.connection = self
+        return response
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:  # type:ignore
+        key = get_fixture_key(request)
+        if self.mode == "replay":
+            fixture = self.load(key)
+            if fixture is None:
+                raise requests.ConnectionError(
+                    f"No recorded response for {request.method} {request.url} in {self.fixture_dir}",
+                    request=request,
+                )
+            return self.replay(request, fixture)
+        original_url = request.url
+        request.url = rewrite_url(request.url, self.base_urls)  # type:ignore
+        if self.scheduler is not None:
+            response = self.scheduler.run(
+                original_url, lambda: super(RecordReplayAdapter, self).send(request, **kwargs)  # type:ignore
+            )
+        else:
+            response = super().send(request, **kwargs)
+        request.url = original_url
+        response.url = original_url  # type:ignore
+        if self.mode == "record":
+            self.store(key, response)
+        return response
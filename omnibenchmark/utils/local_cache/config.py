@@ -1,4 +1,5 @@
 import os
+from typing import Dict
 
 _home = os.path.expanduser('~')
 
@@ -9,6 +10,30 @@ xdg_data_home = os.environ.get('XDG_DATA_HOME') or \
 
 data_dir = os.path.join(xdg_data_home, app_name)
 local_bench_cat_data = os.path.join(data_dir, "benchmark_categories.json")
+response_cache_dir = os.path.join(data_dir, "responses")
+orchestrator_cache_dir = os.path.join(data_dir, "orchestrators")
+
+# Response cache: time to live in seconds per knowledge graph endpoint and size limit in bytes
+response_cache_ttls = {
+    "entities": 10 * 60,
+    "datasets": 60 * 60,
+    "projects": 60 * 60,
+    "lineage": 60 * 60,
+}
+response_cache_max_size = 100 * 1024 * 1024
+
+# Http transport: "live", "record" or "replay", the fixture store and base urls to redirect (e.g., to a local stand-in server)
+http_transport_mode = os.environ.get('OMNIBENCHMARK_HTTP_MODE') or "live"
+http_fixture_dir = os.environ.get('OMNIBENCHMARK_HTTP_FIXTURES') or \
+            os.path.join(data_dir, "http_fixtures")
+# Entries without "=" are ignored
+http_base_urls: Dict[str, str] = {
+    base_url: target
+    for base_url, target in (
+        pair.split("=", 1) for pair in (os.environ.get('OMNIBENCHMARK_HTTP_BASE_URLS') or "").split(";") if "=" in pair
+    )
+}
+
 
 def init_dirs():
     os.makedirs(data_dir, exist_ok=True)
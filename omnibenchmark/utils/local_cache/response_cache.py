@@ -0,0 +1,313 @@
+"""Persistent cache for knowledge graph responses with per endpoint ttl, revalidation and lru eviction"""
+
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional
+from urllib.parse import urlparse
+from omnibenchmark.utils.local_cache.config import (
+    response_cache_dir,
+    response_cache_ttls,
+    response_cache_max_size,
+)
+import threading
+import hashlib
+import requests
+import json
+import time
+import os
+
+# Response headers that are kept with the cached response (e.g., pagination hints)
+KEEP_HEADERS = ["Content-Type", "ETag", "Last-Modified", "Total", "Total-Pages", "Link"]
+
+
+def get_endpoint(url: str) -> Optional[str]:
+    """Get the knowledge graph endpoint an url belongs to
+
+    Args:
+        url (str): Requested url
+
+    Returns:
+        Optional[str]: One of "lineage", "entities", "datasets", "projects" or None for any other url.
+    """
+    path = urlparse(url).path
+    if "/knowledge-graph/" not in path:
+        return None
+    if path.endswith("/lineage"):
+        return "lineage"
+    for endpoint in ["entities", "datasets", "projects"]:
+        if "/knowledge-graph/" + endpoint in path:
+            return endpoint
+    return None
+
+
+def get_cache_key(url: str, params: Optional[Mapping[str, Any]] = None) -> str:
+    """Get the cache key of a request, the full url including sorted query parameter
+
+    Args:
+        url (str): Requested url
+        params (Optional[Mapping[str, Any]], optional): Query parameter. Defaults to None.
+
+    Returns:
+        str: Cache key
+    """
+    sorted_params = sorted(params.items()) if params is not None else None
+    return str(requests.Request("GET", url, params=sorted_params).prepare().url)
+
+
+def to_response(entry: Mapping[str, Any]) -> requests.Response:
+    """Rebuild a response object from a cache entry
+
+    Args:
+        entry (Mapping[str, Any]): Cache entry
+
+    Returns:
+        requests.Response: Response with the cached status, headers and content
+    """
+    response = requests.Response()
+    response.status_code = entry["status_code"]
+    response.url = entry["key"]
+    response.headers.update(entry["headers"])
+    response._content = entry["content"].encode("utf-8")
+    response.encoding = "utf-8"
+    return response
+
+
+def offline_response(key: str) -> requests.Response:
+    """Build the response to a request that is not cached while working offline
+
+    Args:
+        key (str): Cache key of the request
+
+    Returns:
+        requests.Response: Empty response with status 504 (only-if-cached)
+    """
+    return to_response({"status_code": 504, "key": key, "headers": {}, "content": "{}"})
+
+
+class ResponseCache:
+    """On-disk cache of knowledge graph responses keyed by url"""
+
+    def __init__(
+        self,
+        cache_dir: str = response_cache_dir,
+        ttls: Mapping[str, int] = response_cache_ttls,
+        max_size: int = response_cache_max_size,
+    ):
+        """Cache of knowledge graph responses
+
+        Args:
+            cache_dir (str, optional): Directory to store responses in. Defaults to the XDG data dir.
+            ttls (Mapping[str, int], optional): Time to live in seconds per endpoint. Defaults to config.response_cache_ttls.
+            max_size (int, optional): Maximal cache size in bytes. Least recently used responses are evicted first.
+        """
+        self.cache_dir = cache_dir
+        self.ttls = dict(ttls)
+        self.max_size = max_size
+        self.enabled = True
+        self.refresh = False
+        self.offline = False
+        self.misses: List[str] = []
+        self._size: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, hashlib.sha256(key.encode()).hexdigest() + ".json")
+
+    def load(self, key: str) -> Optional[Dict[str, Any]]:
+        """Load a cache entry and mark it as recently used
+
+        Args:
+            key (str): Cache key
+
+        Returns:
+            Optional[Dict[str, Any]]: Cache entry, if it exists
+        """
+        path = self._path(key)
+        try:
+            with open(path) as f:
+                entry = json.load(f)
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        return entry if entry.get("key") == key else None
+
+    def store(self, key: str, endpoint: str, response: requests.Response) -> Dict[str, Any]:
+        """Store a response in the cache
+
+        Args:
+            key (str): Cache key
+            endpoint (str): Knowledge graph endpoint of the request
+            response (requests.Response): Response to store
+
+        Returns:
+            Dict[str, Any]: The stored cache entry
+        """
+        entry = {
+            "key": key,
+            "endpoint": endpoint,
+            "stored_at": time.time(),
+            "status_code": response.status_code,
+            "headers": {
+                head: response.headers[head]
+                for head in KEEP_HEADERS
+                if head in response.headers
+            },
+            "content": response.content.decode("utf-8"),
+        }
+        self._write(key, entry)
+        return entry
+
+    def _write(self, key: str, entry: Mapping[str, Any]):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._path(key)
+        tmp_path = path + "." + str(threading.get_ident()) + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(entry, f)
+        with self._lock:
+            old_size = os.path.getsize(path) if os.path.exists(path) else 0
+            os.replace(tmp_path, path)
+            if self._size is not None:
+                self._size += os.path.getsize(path) - old_size
+        self.evict()
+
+    def is_fresh(self, entry: Mapping[str, Any]) -> bool:
+        """Check if a cache entry is within its endpoints time to live
+
+        Args:
+            entry (Mapping[str, Any]): Cache entry
+
+        Returns:
+            bool: True if the entry can be used without revalidation
+        """
+        if self.refresh:
+            return False
+        ttl = self.ttls.get(entry["endpoint"], 0)
+        return time.time() - entry["stored_at"] < ttl
+
+    def fetch(
+        self,
+        url: str,
+        params: Optional[Mapping[str, Any]],
+        send: Callable[[Mapping[str, str]], requests.Response],
+    ) -> requests.Response:
+        """Get a response from the cache or send the request.
+           Stale entries are revalidated by their ETag or Last-Modified header.
+
+        Args:
+            url (str): Requested url
+            params (Optional[Mapping[str, Any]]): Query parameter
+            send (Callable[[Mapping[str, str]], requests.Response]): Function sending the request with additional headers
+
+        Returns:
+            requests.Response: Cached or new response
+        """
+        endpoint = get_endpoint(url)
+        if self.offline:
+            key = get_cache_key(url, params)
+            entry = self.load(key) if self.enabled and endpoint is not None else None
+            if entry is not None:
+                return to_response(entry)
+            self.record_miss(key)
+            return offline_response(key)
+        if not self.enabled or endpoint is None:
+            return send({})
+        key = get_cache_key(url, params)
+        entry = self.load(key)
+        if entry is not None and self.is_fresh(entry):
+            return to_response(entry)
+        headers: Dict[str, str] = {}
+        if entry is not None:
+            if "ETag" in entry["headers"]:
+                headers["If-None-Match"] = entry["headers"]["ETag"]
+            if "Last-Modified" in entry["headers"]:
+                headers["If-Modified-Since"] = entry["headers"]["Last-Modified"]
+        response = send(headers)
+        if entry is not None and response.status_code == 304:
+            entry["stored_at"] = time.time()
+            self._write(key, entry)
+            return to_response(entry)
+        if response.status_code == 200:
+            self.store(key, endpoint, response)
+        return response
+
+    def record_miss(self, key: str):
+        """Record a request that could not be answered while working offline
+
+        Args:
+            key (str): Cache key (or description) of the request
+        """
+        with self._lock:
+            if key not in self.misses:
+                self.misses.append(key)
+
+    def entries(self) -> Iterator[os.DirEntry]:
+        """Iterate over all cache files"""
+        if not os.path.isdir(self.cache_dir):
+            return iter([])
+        return (fi for fi in os.scandir(self.cache_dir) if fi.name.endswith(".json"))
+
+    def evict(self):
+        """Remove least recently used entries until the cache is within its size limit"""
+        with self._lock:
+            if self._size is None:
+                self._size = sum(fi.stat().st_size for fi in self.entries())
+            if self._size <= self.max_size:
+                return
+            by_usage = sorted(self.entries(), key=lambda fi: fi.stat().st_mtime)
+            for fi in by_usage:
+                if self._size <= self.max_size:
+                    break
+                self._size -= fi.stat().st_size
+                os.remove(fi.path)
+
+    def prune(self):
+        """Remove all entries that are past their time to live"""
+        for fi in self.entries():
+            try:
+                with open(fi.path) as f:
+                    entry = json.load(f)
+            except (OSError, ValueError):
+                entry = None
+            if entry is None or time.time() - entry["stored_at"] >= self.ttls.get(entry["endpoint"], 0):
+                os.remove(fi.path)
+        self._size = None
+
+    def clear(self):
+        """Remove all entries"""
+        for fi in self.entries():
+            os.remove(fi.path)
+        self._size = None
+
+    @contextmanager
+    def refreshing(self, refresh: bool = True):
+        """Revalidate all cached responses used within the context
+
+        Args:
+            refresh (bool, optional): If False, the cache is used as usual. Defaults to True.
+        """
+        previous = self.refresh
+        self.refresh = previous or refresh
+        try:
+            yield self
+        finally:
+            self.refresh = previous
+
+    @contextmanager
+    def offline_mode(self, offline: bool = True):
+        """Answer all requests within the context from the cache only, regardless of their age.
+           Requests that are not cached are not sent, but get an empty 504 response and are recorded in misses.
+
+        Args:
+            offline (bool, optional): If False, the cache is used as usual. Defaults to True.
+        """
+        previous = self.offline
+        self.offline = previous or offline
+        if self.offline and not previous:
+            with self._lock:
+                self.misses = []
+        try:
+            yield self
+        finally:
+            self.offline = previous
+
+
+response_cache = ResponseCache()
@@ -1,15 +1,15 @@
 import json
 import os
 
-import requests
-
 from omnibenchmark.utils.local_cache.config import local_bench_cat_data, init_dirs
+from omnibenchmark.utils.local_cache.response_cache import response_cache
 from omnibenchmark.utils.default_global_vars import BENCH_URL
+from omnibenchmark.utils import http_client
 
 
 def download_orchestrator_data(force: bool = False, bench_url: str = BENCH_URL):
     if force or not os.path.isfile(local_bench_cat_data):
-        r = requests.get(bench_url)
+        r = http_client.get(bench_url)
         data = r.json()
         with open(local_bench_cat_data, 'w') as f:
             json.dump(data, f)
@@ -20,4 +20,4 @@ def init_local_cache(bench_url: str = BENCH_URL):
 
 def update_local_cache(bench_url: str = BENCH_URL):
     download_orchestrator_data(force=True, bench_url = bench_url)
-    # do we want to include other sources into local cache?
\ No newline at end of file
+    response_cache.prune()
\ No newline at end of file